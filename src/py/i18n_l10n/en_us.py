@@ -6,6 +6,26 @@ class LocalizationDictionaryEnUS:
             'D0002': 'Unit factor may not be zero.',
             'W0001': 'Vehicle has trailer but no articulation point was provided.'
                      'Articulation point assumed to be at back tip of vehicle.',
+            'W0002': 'Lookup table for distribution %%0 could not meet its tolerance. '
+                     'The distribution will be evaluated exactly.',
+            'W0003': 'Scenario cache in %%0 could not be written: %%1',
             'E0001': 'Vehicle model %%0 requested but not found in VehicleModelsCollection.',
-            'E0002': 'XML File validation failed. File is not usable: %%0'
+            'E0002': 'XML File validation failed. File is not usable: %%0',
+            'E0003': 'Vehicle state store capacity must be at least one. Requested capacity: %%0',
+            'E0004': 'Vehicle %%0 requested but not found in the vehicle state store.',
+            'E0005': 'Time of day could not be read: %%0',
+            'E0006': 'Distribution parameters must be in the range [0, 1].',
+            'E0007': 'Empirical distribution data point parameter must be in range [0, 1]. Attempted value was %%0',
+            'E0008': 'Total shares in distribution %%0 must be greater than zero.',
+            'E0009': 'Binned distribution %%0 must have at least one observation.',
+            'E0010': 'Distribution %%0 does not contain a recognized distribution type.',
+            'E0011': 'Duration could not be read: %%0',
+            'E0012': 'Driving behavior %%0 refers to model %%1, which is not defined.',
+            'E0013': 'Vehicle group %%0 refers to vehicle type %%1, which is not defined.',
+            'E0014': 'Road behavior %%0 refers to driving behavior %%1, which is not defined.',
+            'E0015': 'Road behavior %%0 makes an exception for vehicle group %%1, which is not defined.',
+            'E0016': 'Lane usage policy %%0 makes an exception for vehicle group %%1, which is not defined.',
+            'E0017': 'Lane usage policy %%0 is used in the network but is not defined.',
+            'E0018': 'Connection from road %%0 refers to road %%1, which is not defined.',
+            'E0019': 'Vehicle %%0 is already held in the vehicle state store.',
         }
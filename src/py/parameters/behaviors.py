@@ -0,0 +1,331 @@
+from lxml import etree
+import numpy as np
+from typing import Dict, List, NamedTuple, Tuple
+from parameters.vehicle_types import VehicleTypes
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+# part of the key of cached files; increase it whenever the way files are read changes
+LOADER_VERSION: int = 1
+
+
+class BehaviorConstants:
+    ROOT_TAG = 'behaviors'
+    VERSION_ATTR = 'version'
+    NAME_ATTR = 'name'
+    UUID_ATTR = 'uuid'
+    CAR_FOLLOWING_TAG = 'car-following'
+    FRITZSCHE_TAG = 'fritzsche'
+    FRITZSCHE_SSD_ATTR = 'ssd'
+    FRITZSCHE_T_DESIRED_ATTR = 't-desired'
+    FRITZSCHE_T_SAFE_ATTR = 't-safe'
+    FRITZSCHE_T_RISKY_ATTR = 't-risky'
+    FRITZSCHE_F_X_ATTR = 'f-x'
+    FRITZSCHE_K_PTP_ATTR = 'k-ptp'
+    FRITZSCHE_K_PTN_ATTR = 'k-ptn'
+    FRITZSCHE_B_NULL_ATTR = 'b-null'
+    LANE_CHANGE_TAG = 'lane-change'
+    HIDAS_TAG = 'hidas'
+    HIDAS_G_MIN_ATTR = 'g_min'
+    HIDAS_DT_ATTR = 'Dt'
+    HIDAS_C_F_ATTR = 'c_f'
+    HIDAS_C_L_ATTR = 'c_l'
+    HIDAS_T_FM_ATTR = 't_fm'
+    HIDAS_F_BRAKING_ATTR = 'f_braking'
+    DRIVING_BEHAVIORS_TAG = 'driving-behaviors'
+    DRIVING_BEHAVIOR_TAG = 'driving-behavior'
+    DRIVING_BEHAVIOR_FOLLOWING_ATTR = 'following'
+    DRIVING_BEHAVIOR_LANE_CHANGE_ATTR = 'lane-change'
+    DRIVING_BEHAVIOR_SPEED_ATTR = 'speed-selection'
+    ROAD_BEHAVIORS_TAG = 'road-behaviors'
+    ROAD_BEHAVIOR_TAG = 'road-behavior'
+    ROAD_BEHAVIOR_DEFAULT_ATTR = 'default-behavior'
+    ROAD_BEHAVIOR_EXCEPT_TAG = 'except'
+    ROAD_BEHAVIOR_EXCEPT_BEHAVIOR_ATTR = 'behavior'
+    ROAD_BEHAVIOR_GROUP_TAG = 'group'
+    ROAD_BEHAVIOR_GROUP_ID_ATTR = 'id'
+
+
+class FritzscheDefaults:
+    SSD = 0.5
+    T_DESIRED = 1.8
+    T_SAFE = 1.0
+    T_RISKY = 0.5
+    F_X = 0.5
+    K_PTP = 0.001
+    K_PTN = 0.002
+    B_NULL = 0.2
+
+
+class HidasDefaults:
+    G_MIN = 2.0
+    DT = 5.0
+    C_F = 0.9
+    C_L = 0.9
+    T_FM = 10.0
+    F_BRAKING = 0.15
+
+
+def _parameter_column(elements: List[etree.ElementBase], attribute: str, default: float) -> np.ndarray:
+    return np.array([float(element.attrib.get(attribute, default)) for element in elements], dtype=np.float64)
+
+
+class FritzscheParameters(NamedTuple):
+    """
+    Parameters of every Fritzsche car following model, one element per model in file order.
+    """
+    uuids: List[str]
+    names: List[str]
+    standstill_distance: np.ndarray
+    '''Standstill distance, in meters.'''
+    desired_time_gap: np.ndarray
+    '''Desired time gap, in seconds.'''
+    safe_time_gap: np.ndarray
+    '''Safe time gap, in seconds.'''
+    risky_time_gap: np.ndarray
+    '''Risky time gap, in seconds.'''
+    f_x: np.ndarray
+    '''Smallest perceptible speed difference, in meters per second.'''
+    k_ptp: np.ndarray
+    '''Growth of the threshold for perceiving positive speed differences with distance.'''
+    k_ptn: np.ndarray
+    '''Growth of the threshold for perceiving negative speed differences with distance.'''
+    b_null: np.ndarray
+    '''Acceleration while unable to hold a constant speed, in meters per second squared.'''
+
+    @classmethod
+    def from_xml(cls, car_following_element: etree.ElementBase):
+        elements: List[etree.ElementBase] = list(car_following_element.iterchildren(BehaviorConstants.FRITZSCHE_TAG))
+
+        def column(attribute: str, default: float) -> np.ndarray:
+            return _parameter_column(elements, attribute, default)
+
+        return cls(
+            uuids=[element.attrib[BehaviorConstants.UUID_ATTR] for element in elements],
+            names=[element.attrib.get(BehaviorConstants.NAME_ATTR, '') for element in elements],
+            standstill_distance=column(BehaviorConstants.FRITZSCHE_SSD_ATTR, FritzscheDefaults.SSD),
+            desired_time_gap=column(BehaviorConstants.FRITZSCHE_T_DESIRED_ATTR, FritzscheDefaults.T_DESIRED),
+            safe_time_gap=column(BehaviorConstants.FRITZSCHE_T_SAFE_ATTR, FritzscheDefaults.T_SAFE),
+            risky_time_gap=column(BehaviorConstants.FRITZSCHE_T_RISKY_ATTR, FritzscheDefaults.T_RISKY),
+            f_x=column(BehaviorConstants.FRITZSCHE_F_X_ATTR, FritzscheDefaults.F_X),
+            k_ptp=column(BehaviorConstants.FRITZSCHE_K_PTP_ATTR, FritzscheDefaults.K_PTP),
+            k_ptn=column(BehaviorConstants.FRITZSCHE_K_PTN_ATTR, FritzscheDefaults.K_PTN),
+            b_null=column(BehaviorConstants.FRITZSCHE_B_NULL_ATTR, FritzscheDefaults.B_NULL),
+        )
+
+
+class HidasParameters(NamedTuple):
+    """
+    Parameters of every Hidas lane change model, one element per model in file order.
+    """
+    uuids: List[str]
+    names: List[str]
+    minimum_gap: np.ndarray
+    '''Standstill gap, in meters.'''
+    lane_change_time: np.ndarray
+    '''Duration of a lane change, in seconds.'''
+    c_f: np.ndarray
+    '''Calibration constant for the gap to the follower.'''
+    c_l: np.ndarray
+    '''Calibration constant for the gap to the leader.'''
+    forced_window: np.ndarray
+    '''Time before the last chance to change lanes at which forced lane changing begins, in seconds.'''
+    braking_fraction: np.ndarray
+    '''Fraction of its maximum deceleration a follower uses when braking to let a vehicle in.'''
+
+    @classmethod
+    def from_xml(cls, lane_change_element: etree.ElementBase):
+        elements: List[etree.ElementBase] = list(lane_change_element.iterchildren(BehaviorConstants.HIDAS_TAG))
+
+        def column(attribute: str, default: float) -> np.ndarray:
+            return _parameter_column(elements, attribute, default)
+
+        return cls(
+            uuids=[element.attrib[BehaviorConstants.UUID_ATTR] for element in elements],
+            names=[element.attrib.get(BehaviorConstants.NAME_ATTR, '') for element in elements],
+            minimum_gap=column(BehaviorConstants.HIDAS_G_MIN_ATTR, HidasDefaults.G_MIN),
+            lane_change_time=column(BehaviorConstants.HIDAS_DT_ATTR, HidasDefaults.DT),
+            c_f=column(BehaviorConstants.HIDAS_C_F_ATTR, HidasDefaults.C_F),
+            c_l=column(BehaviorConstants.HIDAS_C_L_ATTR, HidasDefaults.C_L),
+            forced_window=column(BehaviorConstants.HIDAS_T_FM_ATTR, HidasDefaults.T_FM),
+            braking_fraction=column(BehaviorConstants.HIDAS_F_BRAKING_ATTR, HidasDefaults.F_BRAKING),
+        )
+
+
+class Behaviors:
+    """
+    The contents of a behavior file, held as parameter tables. Driving behaviors are identified by their index in
+    file order, and refer to the models they use by the models' indices in their own tables. Road behaviors are
+    likewise identified by their index in file order.
+    """
+    def __init__(self, car_following: FritzscheParameters, lane_change: HidasParameters,
+                 driving_behavior_uuids: List[str], following_model: np.ndarray, lane_change_model: np.ndarray,
+                 road_behavior_uuids: List[str], default_driving_behavior: np.ndarray,
+                 road_behavior_exceptions: List[Tuple[int, int, List[str]]]):
+        """
+        Creates behaviors from their tables.
+        Args:
+            car_following: The car following models.
+            lane_change: The lane change models.
+            driving_behavior_uuids: The uuid of each driving behavior.
+            following_model: Index of each driving behavior's car following model.
+            lane_change_model: Index of each driving behavior's lane change model.
+            road_behavior_uuids: The uuid of each road behavior.
+            default_driving_behavior: Index of each road behavior's default driving behavior.
+            road_behavior_exceptions: (road behavior, driving behavior, group uuids) of each exception of the road
+                behaviors, in file order.
+        """
+        self._car_following: FritzscheParameters = car_following
+        self._lane_change: HidasParameters = lane_change
+        self._driving_behavior_uuids: List[str] = driving_behavior_uuids
+        self._driving_behavior_index_of: Dict[str, int] = {
+            behavior_uuid: index for index, behavior_uuid in enumerate(driving_behavior_uuids)}
+        self._following_model: np.ndarray = following_model
+        self._lane_change_model: np.ndarray = lane_change_model
+        self._road_behavior_uuids: List[str] = road_behavior_uuids
+        self._road_behavior_index_of: Dict[str, int] = {
+            behavior_uuid: index for index, behavior_uuid in enumerate(road_behavior_uuids)}
+        self._default_driving_behavior: np.ndarray = default_driving_behavior
+        self._road_behavior_exceptions: List[Tuple[int, int, List[str]]] = road_behavior_exceptions
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase):
+        car_following: FritzscheParameters = FritzscheParameters.from_xml(
+            from_element.find(BehaviorConstants.CAR_FOLLOWING_TAG))
+        following_index_of: Dict[str, int] = {
+            model_uuid: index for index, model_uuid in enumerate(car_following.uuids)}
+        lane_change: HidasParameters = HidasParameters.from_xml(from_element.find(BehaviorConstants.LANE_CHANGE_TAG))
+        lane_change_index_of: Dict[str, int] = {
+            model_uuid: index for index, model_uuid in enumerate(lane_change.uuids)}
+
+        driving_elements: List[etree.ElementBase] = list(
+            from_element.find(BehaviorConstants.DRIVING_BEHAVIORS_TAG).iterchildren(
+                BehaviorConstants.DRIVING_BEHAVIOR_TAG))
+        driving_behavior_uuids: List[str] = [
+            element.attrib[BehaviorConstants.UUID_ATTR] for element in driving_elements]
+        driving_behavior_index_of: Dict[str, int] = {
+            behavior_uuid: index for index, behavior_uuid in enumerate(driving_behavior_uuids)}
+        following_model: np.ndarray = np.array(
+            [_model_index(following_index_of, element, BehaviorConstants.DRIVING_BEHAVIOR_FOLLOWING_ATTR)
+             for element in driving_elements], dtype=np.int32)
+        lane_change_model: np.ndarray = np.array(
+            [_model_index(lane_change_index_of, element, BehaviorConstants.DRIVING_BEHAVIOR_LANE_CHANGE_ATTR)
+             for element in driving_elements], dtype=np.int32)
+
+        def driving_behavior_of(road_element: etree.ElementBase, behavior_uuid: str) -> int:
+            if behavior_uuid not in driving_behavior_index_of:
+                raise KeyError(Localization.get_message(
+                    'E0014', road_element.attrib[BehaviorConstants.UUID_ATTR], behavior_uuid))
+            return driving_behavior_index_of[behavior_uuid]
+
+        road_elements: List[etree.ElementBase] = list(
+            from_element.find(BehaviorConstants.ROAD_BEHAVIORS_TAG).iterchildren(BehaviorConstants.ROAD_BEHAVIOR_TAG))
+        default_driving_behavior: np.ndarray = np.array(
+            [driving_behavior_of(element, element.attrib[BehaviorConstants.ROAD_BEHAVIOR_DEFAULT_ATTR])
+             for element in road_elements], dtype=np.int32)
+        road_behavior_exceptions: List[Tuple[int, int, List[str]]] = [
+            (road_index, driving_behavior_of(
+                road_element, except_element.attrib[BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_BEHAVIOR_ATTR]),
+             [group_element.attrib[BehaviorConstants.ROAD_BEHAVIOR_GROUP_ID_ATTR]
+              for group_element in except_element.iterchildren(BehaviorConstants.ROAD_BEHAVIOR_GROUP_TAG)])
+            for road_index, road_element in enumerate(road_elements)
+            for except_element in road_element.iterchildren(BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_TAG)]
+
+        return cls(car_following, lane_change, driving_behavior_uuids, following_model, lane_change_model,
+                   [element.attrib[BehaviorConstants.UUID_ATTR] for element in road_elements],
+                   default_driving_behavior, road_behavior_exceptions)
+
+    @property
+    def car_following(self) -> FritzscheParameters:
+        return self._car_following
+
+    @property
+    def lane_change(self) -> HidasParameters:
+        return self._lane_change
+
+    @property
+    def driving_behavior_uuids(self) -> List[str]:
+        return self._driving_behavior_uuids
+
+    @property
+    def driving_behavior_index_of(self) -> Dict[str, int]:
+        return self._driving_behavior_index_of
+
+    @property
+    def following_model(self) -> np.ndarray:
+        """
+        Returns the index of each driving behavior's car following model in the car_following table.
+        """
+        return self._following_model
+
+    @property
+    def lane_change_model(self) -> np.ndarray:
+        """
+        Returns the index of each driving behavior's lane change model in the lane_change table.
+        """
+        return self._lane_change_model
+
+    @property
+    def road_behavior_uuids(self) -> List[str]:
+        return self._road_behavior_uuids
+
+    @property
+    def road_behavior_index_of(self) -> Dict[str, int]:
+        return self._road_behavior_index_of
+
+    @property
+    def default_driving_behavior(self) -> np.ndarray:
+        """
+        Returns the index of each road behavior's default driving behavior.
+        """
+        return self._default_driving_behavior
+
+    @property
+    def road_behavior_exceptions(self) -> List[Tuple[int, int, List[str]]]:
+        """
+        Returns (road behavior, driving behavior, group uuids) of each exception of the road behaviors, in file
+        order.
+        """
+        return self._road_behavior_exceptions
+
+    def driving_behavior_table(self, vehicle_types: VehicleTypes) -> np.ndarray:
+        """
+        Resolves the road behaviors' group exceptions into a dense table of driving behaviors, so that the driving
+        behavior of every vehicle is found with one gather: table[road_behaviors, vehicle_types]. Where a vehicle
+        type belongs to groups in several exceptions of a road behavior, the first exception in file order applies.
+        Args:
+            vehicle_types: The vehicle types and groups the exceptions refer to.
+
+        Returns:
+            The index of the driving behavior of each vehicle type on each road behavior, with one row per road
+            behavior and one column per vehicle type.
+        """
+        table: np.ndarray = np.repeat(self._default_driving_behavior[:, np.newaxis], vehicle_types.count, axis=1)
+        # later exceptions are written first so that earlier ones overwrite them
+        for road_index, driving_index, group_uuids in reversed(self._road_behavior_exceptions):
+            for group_uuid in group_uuids:
+                if group_uuid not in vehicle_types.group_members:
+                    raise KeyError(Localization.get_message(
+                        'E0015', self._road_behavior_uuids[road_index], group_uuid))
+                table[road_index, vehicle_types.group_members[group_uuid]] = driving_index
+
+        return table
+
+
+def _model_index(index_of: Dict[str, int], driving_element: etree.ElementBase, attribute: str) -> int:
+    model_uuid: str = driving_element.attrib[attribute]
+    if model_uuid not in index_of:
+        raise KeyError(Localization.get_message(
+            'E0012', driving_element.attrib[BehaviorConstants.UUID_ATTR], model_uuid))
+
+    return index_of[model_uuid]
+
+
+def process_file(filename) -> Behaviors:
+    tree: etree.ElementTree = etree.parse(filename)
+    if not XmlValidation.get_schema(XmlValidation.BEHAVIOR_XSD).validate(tree):
+        # validation failed
+        raise RuntimeError(Localization.get_message('E0002', str(filename)))
+
+    return Behaviors.from_xml(tree.getroot())
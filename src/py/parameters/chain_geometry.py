@@ -0,0 +1,129 @@
+import numpy as np
+from enum import IntEnum
+from typing import NamedTuple
+
+TWO_PI: float = 2.0 * np.pi
+
+
+class CurveDirection(IntEnum):
+    """
+    The direction in which a segment turns, when travelling the chain from beginning to end.
+    """
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+
+
+def parse_chain_points(text: str) -> np.ndarray:
+    """
+    Parses the points attribute of a chain, a whitespace separated list of x,y pairs.
+    Args:
+        text: The attribute text.
+
+    Returns:
+        The points as an (n, 2) array of x, y.
+    """
+    return np.array(text.replace(',', ' ').split(), dtype=np.float64).reshape(-1, 2)
+
+
+def normalize_angles(angles: np.ndarray, minimum: float) -> np.ndarray:
+    """
+    Converts angles, in radians, to their equivalents in [minimum, minimum + 2π).
+    """
+    return minimum + np.mod(np.asarray(angles) - minimum, TWO_PI)
+
+
+class ChainGeometry(NamedTuple):
+    """
+    Geometry of the segments joining consecutive chain points of all roads, one element per segment. Road i has one
+    segment fewer than chain points, and its segments are [segment_offsets[i], segment_offsets[i + 1]).
+
+    Stations are distances along a road from its first chain point. Headings are measured anticlockwise from east.
+    Deflections are the changes of heading at a segment's ends, in [-π, π), positive to the left, and zero at the
+    ends of a road. A segment approximates an arc when it is neither the first nor the last of its road and the
+    chain deflects the same way at both of its ends; the arc's radius is then that of the circle tangent to the
+    angular bisectors at both ends, and is negative for curves to the right.
+    """
+    segment_offsets: np.ndarray
+    start_stations: np.ndarray
+    '''Station of the start of each segment, in the units of the points.'''
+    end_stations: np.ndarray
+    '''Station of the end of each segment, in the units of the points.'''
+    headings: np.ndarray
+    '''Direction of each segment, in radians in [0, 2π).'''
+    start_deflections: np.ndarray
+    '''Deflection from the previous segment to each segment, in radians.'''
+    end_deflections: np.ndarray
+    '''Deflection from each segment to the next segment, in radians.'''
+    curve_directions: np.ndarray
+    '''CurveDirection value of each segment.'''
+    radii: np.ndarray
+    '''Radius of the arc approximated by each segment, NaN for segments not in a curve.'''
+    road_lengths: np.ndarray
+    '''Length of each road along its chain, in the units of the points.'''
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.end_stations - self.start_stations
+
+    @classmethod
+    def from_chains(cls, chain_offsets: np.ndarray, chain_points: np.ndarray):
+        """
+        Computes the geometry of all chains at once.
+        Args:
+            chain_offsets: Offsets of each chain's points in chain_points, as in Roads.
+            chain_points: Points of all chains, as an (n, 2) array of x, y.
+
+        Returns:
+            The geometry.
+        """
+        chain_offsets = np.asarray(chain_offsets, dtype=np.int64)
+        road_count: int = len(chain_offsets) - 1
+        segment_offsets: np.ndarray = chain_offsets - np.arange(road_count + 1)
+
+        # consecutive points of the flat array form a segment unless the second point starts the next chain
+        is_chain_start: np.ndarray = np.zeros(len(chain_points), dtype=np.bool_)
+        is_chain_start[chain_offsets[:-1][np.diff(chain_offsets) > 0]] = True
+        segment_ends: np.ndarray = np.flatnonzero(~is_chain_start)
+        vectors: np.ndarray = chain_points[segment_ends] - chain_points[segment_ends - 1]
+        lengths: np.ndarray = np.hypot(vectors[:, 0], vectors[:, 1])
+        raw_headings: np.ndarray = np.arctan2(vectors[:, 1], vectors[:, 0])
+
+        segment_roads: np.ndarray = np.repeat(np.arange(road_count), np.diff(segment_offsets))
+        road_starts: np.ndarray = segment_offsets[segment_roads]
+        cumulative: np.ndarray = np.cumsum(lengths)
+        # subtract the total of all earlier roads so each road's stations start at zero
+        road_totals: np.ndarray = np.concatenate([[0.0], cumulative])[segment_offsets]
+        end_stations: np.ndarray = cumulative - road_totals[segment_roads]
+        start_stations: np.ndarray = end_stations - lengths
+
+        first_in_road: np.ndarray = np.arange(len(lengths)) == road_starts
+        last_in_road: np.ndarray = np.arange(len(lengths)) == segment_offsets[segment_roads + 1] - 1
+        start_deflections: np.ndarray = np.zeros(len(lengths), dtype=np.float64)
+        start_deflections[1:] = normalize_angles(raw_headings[1:] - raw_headings[:-1], -np.pi)
+        start_deflections[first_in_road] = 0.0
+        end_deflections: np.ndarray = np.zeros(len(lengths), dtype=np.float64)
+        end_deflections[:-1] = start_deflections[1:]
+        end_deflections[last_in_road] = 0.0
+
+        curve_directions: np.ndarray = np.select(
+            [first_in_road | last_in_road | (start_deflections * end_deflections <= 0.0), start_deflections > 0.0],
+            [CurveDirection.NONE, CurveDirection.LEFT], CurveDirection.RIGHT).astype(np.int8)
+        # the bisectors at both ends differ in direction by the mean deflection at the ends
+        with np.errstate(divide='ignore', invalid='ignore'):
+            radii: np.ndarray = np.where(
+                curve_directions != CurveDirection.NONE,
+                0.5 * lengths / np.sin(0.5 * normalize_angles(0.5 * (start_deflections + end_deflections), -np.pi)),
+                np.nan)
+
+        return cls(
+            segment_offsets=segment_offsets,
+            start_stations=start_stations,
+            end_stations=end_stations,
+            headings=normalize_angles(raw_headings, 0.0),
+            start_deflections=start_deflections,
+            end_deflections=end_deflections,
+            curve_directions=curve_directions,
+            radii=radii,
+            road_lengths=np.diff(road_totals),
+        )
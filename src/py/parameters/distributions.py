@@ -0,0 +1,835 @@
+from lxml import etree
+import abc
+import math
+import numpy as np
+from enum import Enum, unique
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from parameters.units import Unit, AccelerationUnits, DistanceUnits, SpeedUnits
+from i18n_l10n.temporary_i18n_bridge import Localization
+from simulator.SimulatorLoggerWrapper import SimulatorLoggerWrapper
+
+
+class DistributionConstants:
+    NAME_ATTR = 'name'
+    UUID_ATTR = 'uuid'
+    UNITS_ATTR = 'units'
+    SPEED_UNIT_ATTR = 'speed-unit'
+    ACCELERATION_UNIT_ATTR = 'acceleration-unit'
+    NORMAL_TAG = 'normal-distribution'
+    NORMAL_MEAN_ATTR = 'mean'
+    NORMAL_STANDARD_DEVIATION_ATTR = 'standard-deviation'
+    NORMAL_REVERSE_ATTR = 'reverse'
+    NORMAL_MIN_VALUE_ATTR = 'min-value'
+    NORMAL_MAX_VALUE_ATTR = 'max-value'
+    EMPIRICAL_TAG = 'empirical-distribution'
+    EMPIRICAL_PROB_ATTR = 'prob'
+    EMPIRICAL_VALUE_ATTR = 'val'
+    RAW_EMPIRICAL_TAG = 'raw-empirical-distribution'
+    RAW_EMPIRICAL_VALUE_ATTR = 'value'
+    DATAPOINT_TAG = 'dp'
+    DATAPOINT_VELOCITY_ATTR = 'velocity'
+    AGGRESSION_ATTR = 'aggression'
+    BINNED_TAG = 'binned-distribution'
+    BIN_TAG = 'bin'
+    BIN_MIN_VALUE_ATTR = 'min-value'
+    BIN_MAX_VALUE_ATTR = 'max-value'
+    BIN_COUNT_ATTR = 'count'
+    SHARE_TAG = 'share'
+    SHARE_OCCURRENCE_ATTR = 'occurrence'
+    SHARE_VALUE_ATTR = 'value'
+    POISSON_TAG = 'poisson-distribution'
+    ZERO_TRUNCATED_POISSON_TAG = 'positive-poisson-distribution'
+    POISSON_LAMBDA_ATTR = 'lambda'
+
+
+@unique
+class AggressionTrend(Enum):
+    """
+    Relationship between driver aggression and the values of a distribution.
+    """
+    POSITIVE = 'positive'
+    '''Higher aggression causes higher values.'''
+    NEGATIVE = 'negative'
+    '''Higher aggression causes lower values.'''
+    NONE = 'none'
+    '''No relationship between value and aggression.'''
+
+
+_UNITS_BY_NAME: Dict[str, Unit] = {**DistanceUnits.DICTIONARY, **SpeedUnits.DICTIONARY, **AccelerationUnits.DICTIONARY}
+
+
+def _to_base_units(text: str, units: Optional[Unit]) -> float:
+    """
+    Reads a value of a distribution file and converts it to base units. Values without units, such as fractions,
+    are returned as they are.
+    """
+    value: float = float(text)
+
+    return value if units is None else units.convert_to_base_units(value)
+
+
+class Distribution(abc.ABC):
+    """
+    A distribution that provides values over the domain of parameters [0, 1].
+
+    Distributions are evaluated on whole arrays of parameters at once, so that the attributes of many vehicles
+    can be drawn with a handful of array operations.
+    """
+    def __init__(self, name: str, uuid: str):
+        self._name: str = name
+        self._uuid: str = uuid
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def uuid(self) -> str:
+        return self._uuid
+
+    @abc.abstractmethod
+    def values(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the distribution at an array of parameters.
+        Args:
+            t: Parameters in the range [0, 1].
+
+        Returns:
+            An array of the same shape as t holding the value of the distribution at each parameter.
+        """
+        pass
+
+    def value(self, t: float):
+        """
+        Evaluates the distribution at a single parameter.
+        Args:
+            t: A parameter in the range [0, 1].
+
+        Returns:
+            The value of the distribution at t.
+        """
+        return self.values(np.array([t], dtype=np.float64))[0]
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draws values from the distribution.
+        Args:
+            n: The number of values to draw.
+            rng: The random number generator supplying the parameters.
+
+        Returns:
+            An array of n values.
+        """
+        return self.values(rng.random(n))
+
+    @staticmethod
+    def _check_parameters(t: np.ndarray) -> np.ndarray:
+        t = np.asarray(t, dtype=np.float64)
+        if np.any((t < 0.0) | (t > 1.0)):
+            raise ValueError(Localization.get_message('E0006'))
+
+        return t
+
+
+class InverseCdfTable:
+    """
+    A dense, uniformly spaced table of the values of a distribution, so that evaluating the distribution costs an
+    index calculation and one linear interpolation.
+
+    The table is built from an exact evaluation function. Its resolution starts at the requested number of cells
+    and is doubled until the interpolation error at the check parameters is within tolerance, or the maximum
+    resolution is reached. For piecewise linear distributions, the largest error always occurs at a breakpoint,
+    so checking the breakpoints (and either side of them, to catch jumps) bounds the error everywhere.
+    """
+    DEFAULT_RESOLUTION: int = 1024
+    MAXIMUM_RESOLUTION: int = 65536
+    DEFAULT_TOLERANCE: float = 1e-4
+
+    def __init__(self, exact_values: Callable[[np.ndarray], np.ndarray], breakpoints: np.ndarray,
+                 resolution: int = DEFAULT_RESOLUTION, tolerance: float = DEFAULT_TOLERANCE):
+        """
+        Builds a table.
+        Args:
+            exact_values: Evaluates the distribution exactly at an array of parameters.
+            breakpoints: Parameters at which the distribution is not smooth.
+            resolution: The initial number of cells in the table.
+            tolerance: The largest acceptable interpolation error, relative to the range of values of the
+                distribution.
+        """
+        breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        check_parameters: np.ndarray = np.clip(np.concatenate([
+            breakpoints, np.nextafter(breakpoints, -np.inf), np.nextafter(breakpoints, np.inf)]), 0.0, 1.0)
+        exact_at_check_parameters: np.ndarray = exact_values(check_parameters)
+
+        self._resolution: int = max(1, resolution)
+        while True:
+            self._table: np.ndarray = exact_values(np.linspace(0.0, 1.0, self._resolution + 1))
+            value_range: float = float(np.ptp(self._table))
+            self._max_error: float = float(np.max(
+                np.abs(self.values(check_parameters) - exact_at_check_parameters), initial=0.0))
+            if self._max_error <= tolerance * value_range or self._resolution >= InverseCdfTable.MAXIMUM_RESOLUTION:
+                break
+            self._resolution *= 2
+
+        self._within_tolerance: bool = self._max_error <= tolerance * value_range
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the table at an array of parameters, which must be in the range [0, 1].
+        """
+        location: np.ndarray = t * self._resolution
+        cell: np.ndarray = np.minimum(location.astype(np.int64), self._resolution - 1)
+        low_value: np.ndarray = self._table[cell]
+
+        return low_value + (location - cell) * (self._table[cell + 1] - low_value)
+
+    @property
+    def resolution(self) -> int:
+        return self._resolution
+
+    @property
+    def max_error(self) -> float:
+        """
+        Returns the largest interpolation error found when the table was built.
+        """
+        return self._max_error
+
+    @property
+    def within_tolerance(self) -> bool:
+        return self._within_tolerance
+
+
+class _TabulatedDistribution(Distribution):
+    """
+    A distribution that is evaluated through an InverseCdfTable whenever the table meets its tolerance, and
+    through its exact method otherwise. The exact method stays available for validation.
+    """
+    def _build_table(self, breakpoints: np.ndarray, resolution: Optional[int], tolerance: float) -> None:
+        self._table: Optional[InverseCdfTable] = None
+        if resolution is None:
+            return
+
+        table: InverseCdfTable = InverseCdfTable(self._exact_values, breakpoints, resolution, tolerance)
+        if table.within_tolerance:
+            self._table = table
+        else:
+            SimulatorLoggerWrapper.logger().warning(Localization.get_message('W0002', self.uuid))
+
+    @abc.abstractmethod
+    def _exact_values(self, t: np.ndarray) -> np.ndarray:
+        pass
+
+    def exact_values(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the distribution at an array of parameters without using the lookup table.
+        """
+        return self._exact_values(self._check_parameters(t))
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        t = self._check_parameters(t)
+        if self._table is None:
+            return self._exact_values(t)
+
+        return self._table.values(t)
+
+    @property
+    def table(self) -> Optional[InverseCdfTable]:
+        """
+        Returns the lookup table, or None if the distribution is evaluated exactly.
+        """
+        return self._table
+
+
+def _standard_normal_quantile(p: np.ndarray) -> np.ndarray:
+    """
+    Inverse of the standard normal cumulative distribution function, using Acklam's rational approximation
+    (relative error below 1.2e-9). p = 0 and p = 1 map to negative and positive infinity.
+    """
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    p_low: float = 0.02425
+
+    p = np.asarray(p, dtype=np.float64)
+    result: np.ndarray = np.empty_like(p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tail_p: np.ndarray = np.minimum(p, 1.0 - p)
+        q: np.ndarray = np.sqrt(-2.0 * np.log(tail_p))
+        tail: np.ndarray = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+            ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0)
+
+        r: np.ndarray = (p - 0.5) * (p - 0.5)
+        central: np.ndarray = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * (p - 0.5) / \
+            (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0)
+
+    is_central: np.ndarray = np.abs(p - 0.5) <= 0.5 - p_low
+    result[is_central] = central[is_central]
+    result[~is_central] = np.where(p < 0.5, tail, -tail)[~is_central]
+    result[p == 0.0] = -np.inf
+    result[p == 1.0] = np.inf
+
+    return result
+
+
+def _standard_normal_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+class NormalDistributionTruncatable(Distribution):
+    """
+    An optionally-truncatable normal distribution.
+
+    Truncation to [min_value, max_value] is done by inverse transform: the cumulative probabilities of the bounds
+    are computed once, each parameter is mapped linearly between them, and the normal quantile function is applied.
+    No value is ever resampled, so the cost of a draw does not depend on how much of the distribution the bounds
+    cut off. If reverse is set, parameters are mirrored so that low parameters give high values.
+    """
+    def __init__(self, name: str, uuid: str, mean: float, standard_deviation: float, *, reverse: bool = False,
+                 min_value: float = -np.inf, max_value: float = np.inf):
+        super().__init__(name, uuid)
+
+        self._mean: float = mean
+        self._standard_deviation: float = standard_deviation
+        self._reverse: bool = reverse
+        self._min_value: float = min_value
+        self._max_value: float = max_value
+
+        # bounds in standard units; bounds above the mean are handled in the mirrored lower tail, where the
+        # cumulative probabilities keep their precision
+        lower_bound: float = -np.inf if standard_deviation == 0.0 else (min_value - mean) / standard_deviation
+        upper_bound: float = np.inf if standard_deviation == 0.0 else (max_value - mean) / standard_deviation
+        self._mirrored: bool = lower_bound > 0.0
+        if self._mirrored:
+            lower_bound, upper_bound = -upper_bound, -lower_bound
+        self._lower_probability: float = _standard_normal_cdf(lower_bound)
+        self._probability_range: float = _standard_normal_cdf(upper_bound) - self._lower_probability
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '', units: Optional[Unit] = None):
+        attrib = from_element.attrib
+        return cls(name, uuid,
+                   _to_base_units(attrib[DistributionConstants.NORMAL_MEAN_ATTR], units),
+                   _to_base_units(attrib[DistributionConstants.NORMAL_STANDARD_DEVIATION_ATTR], units),
+                   reverse=attrib.get(DistributionConstants.NORMAL_REVERSE_ATTR, 'false') in ('true', '1'),
+                   min_value=_to_base_units(attrib.get(DistributionConstants.NORMAL_MIN_VALUE_ATTR, '-inf'), units),
+                   max_value=_to_base_units(attrib.get(DistributionConstants.NORMAL_MAX_VALUE_ATTR, 'inf'), units))
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        t = self._check_parameters(t)
+        if self._reverse != self._mirrored:
+            t = 1.0 - t
+
+        if self._standard_deviation == 0.0:
+            tentative_values: np.ndarray = np.full(t.shape, self._mean)
+        else:
+            standard_values: np.ndarray = _standard_normal_quantile(
+                self._lower_probability + t * self._probability_range)
+            if self._mirrored:
+                standard_values = -standard_values
+            tentative_values = self._mean + self._standard_deviation * standard_values
+
+        # guards against rounding in the quantile function at the bounds
+        return np.clip(tentative_values, self._min_value, self._max_value)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def standard_deviation(self) -> float:
+        return self._standard_deviation
+
+    @property
+    def min_value(self) -> float:
+        return self._min_value
+
+    @property
+    def max_value(self) -> float:
+        return self._max_value
+
+
+class EmpiricalDistribution(_TabulatedDistribution):
+    """
+    A distribution defined by (parameter, value) data points, interpolated linearly between data points. Data
+    points are added at parameters 0 and 1 if they are not provided, repeating the nearest value.
+
+    The distribution is compiled into an InverseCdfTable when it is created, unless table_resolution is None. The
+    table is not used if it cannot meet the tolerance, which happens when the data points describe a jump.
+    """
+    def __init__(self, name: str, uuid: str, data_points: Sequence[Tuple[float, float]], *,
+                 table_resolution: Optional[int] = InverseCdfTable.DEFAULT_RESOLUTION,
+                 table_tolerance: float = InverseCdfTable.DEFAULT_TOLERANCE):
+        super().__init__(name, uuid)
+
+        for parameter, _ in data_points:
+            if parameter < 0.0 or parameter > 1.0:
+                raise ValueError(Localization.get_message('E0007', str(parameter)))
+
+        sorted_points: List[Tuple[float, float]] = sorted(data_points, key=lambda point: point[0])
+        if sorted_points[0][0] > 0.0:
+            sorted_points.insert(0, (0.0, sorted_points[0][1]))
+        if sorted_points[-1][0] < 1.0:
+            sorted_points.append((1.0, sorted_points[-1][1]))
+
+        self._parameters: np.ndarray = np.array([point[0] for point in sorted_points], dtype=np.float64)
+        self._values: np.ndarray = np.array([point[1] for point in sorted_points], dtype=np.float64)
+        self._build_table(self._parameters, table_resolution, table_tolerance)
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '', units: Optional[Unit] = None):
+        return cls(name, uuid, [
+            (float(dp.attrib[DistributionConstants.EMPIRICAL_PROB_ATTR]),
+             _to_base_units(dp.attrib[DistributionConstants.EMPIRICAL_VALUE_ATTR], units))
+            for dp in from_element.iterchildren(DistributionConstants.DATAPOINT_TAG)
+        ])
+
+    def _exact_values(self, t: np.ndarray) -> np.ndarray:
+        # binary search for the interval, then interpolate
+        interval: np.ndarray = np.clip(
+            np.searchsorted(self._parameters, t, side='right') - 1, 0, len(self._parameters) - 2)
+        # a parameter that falls exactly on a vertical line belongs to that line
+        on_vertical_line: np.ndarray = (interval > 0) & (self._parameters[interval - 1] == t) & \
+            (self._parameters[interval] == t)
+        interval -= on_vertical_line
+        low_parameter: np.ndarray = self._parameters[interval]
+        high_parameter: np.ndarray = self._parameters[interval + 1]
+        low_value: np.ndarray = self._values[interval]
+        high_value: np.ndarray = self._values[interval + 1]
+
+        # a vertical line in the distribution gives the midpoint of the line
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction_of_interval: np.ndarray = np.where(
+                low_parameter == high_parameter, 0.5, (t - low_parameter) / (high_parameter - low_parameter))
+
+        return low_value + fraction_of_interval * (high_value - low_value)
+
+
+class RawEmpiricalDistribution(_TabulatedDistribution):
+    """
+    A distribution defined by raw observations. Each observation is taken to sit at the center of an equal-width
+    bin of the parameter range, and values are interpolated linearly between bin centers.
+
+    The distribution is compiled into an InverseCdfTable when it is created, unless table_resolution is None.
+    """
+    def __init__(self, name: str, uuid: str, observations: Sequence[float],
+                 aggression: AggressionTrend = AggressionTrend.POSITIVE, *,
+                 table_resolution: Optional[int] = InverseCdfTable.DEFAULT_RESOLUTION,
+                 table_tolerance: float = InverseCdfTable.DEFAULT_TOLERANCE):
+        super().__init__(name, uuid)
+
+        self._sorted_observations: np.ndarray = np.sort(np.asarray(observations, dtype=np.float64))
+        self._reverse: bool = aggression == AggressionTrend.NEGATIVE
+
+        # with a multiple of twice the observation count as resolution, every bin center falls on a table node and
+        # the table is exact
+        bin_count: int = len(self._sorted_observations)
+        bin_centers: np.ndarray = (np.arange(bin_count) + 0.5) / bin_count
+        if table_resolution is not None:
+            table_resolution = 2 * bin_count * max(1, math.ceil(table_resolution / (2 * bin_count)))
+        self._build_table(bin_centers, table_resolution, table_tolerance)
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '', units: Optional[Unit] = None):
+        return cls(name, uuid,
+                   [_to_base_units(dp.attrib[DistributionConstants.RAW_EMPIRICAL_VALUE_ATTR], units)
+                    for dp in from_element.iterchildren(DistributionConstants.DATAPOINT_TAG)],
+                   AggressionTrend(from_element.attrib[DistributionConstants.AGGRESSION_ATTR]))
+
+    def _exact_values(self, t: np.ndarray) -> np.ndarray:
+        if self._reverse:
+            t = 1.0 - t
+
+        bin_count: int = len(self._sorted_observations)
+        bin_location: np.ndarray = t * bin_count
+
+        # np.interp holds the end values outside the first and last bin centers
+        return np.interp(bin_location - 0.5, np.arange(bin_count), self._sorted_observations)
+
+
+class BinnedDistribution(Distribution):
+    """
+    A distribution that conceptually resembles a histogram.
+
+    In order to work properly, the bins should butt up against each other. To ensure that this happens,
+    overlapping or gapped bins are handled with assumptions:
+     - When processing the bins, the bins are first sorted according to minimum value.
+     - If there are gaps between bins, bins with zero observations are added to fill the gaps.
+     - If a pair of bins partially overlaps, the bin on the right is truncated but its count remains the same.
+     - If a pair of bins completely overlap, the bin on the inside is ignored.
+    The values are provided by an empirical distribution built from the cumulative counts of the bins.
+    """
+    def __init__(self, name: str, uuid: str, bins: Sequence[Tuple[float, float, int]],
+                 aggression: AggressionTrend = AggressionTrend.POSITIVE, *,
+                 table_resolution: Optional[int] = InverseCdfTable.DEFAULT_RESOLUTION,
+                 table_tolerance: float = InverseCdfTable.DEFAULT_TOLERANCE):
+        """
+        Creates a binned distribution.
+        Args:
+            name: The name of the distribution.
+            uuid: The uuid of the distribution.
+            bins: (minimum value, maximum value, count) of each bin.
+            aggression: The relationship between aggression and values.
+            table_resolution: Initial resolution of the lookup table of the backing empirical distribution, or
+                None to always evaluate it exactly.
+            table_tolerance: Tolerance of the lookup table, relative to the range of values.
+        """
+        super().__init__(name, uuid)
+
+        usable_bins: List[List[float]] = BinnedDistribution._remove_overlaps(sorted(bins, key=lambda b: b[0]))
+        usable_bins = sorted(usable_bins + BinnedDistribution._create_necessary_empty_bins(usable_bins),
+                             key=lambda b: b[0])
+
+        total_observations: int = sum(b[2] for b in usable_bins)
+        if total_observations == 0:
+            raise ValueError(Localization.get_message('E0009', uuid))
+
+        negative: bool = aggression == AggressionTrend.NEGATIVE
+        data_points: List[Tuple[float, float]] = [(1.0 if negative else 0.0, usable_bins[0][0])]
+        running_total: int = 0
+        for _, max_value, count in usable_bins:
+            running_total += count
+            parameter: float = running_total / total_observations
+            data_points.append((1.0 - parameter if negative else parameter, max_value))
+
+        self._backing_distribution: EmpiricalDistribution = EmpiricalDistribution(
+            name, uuid, data_points, table_resolution=table_resolution, table_tolerance=table_tolerance)
+
+    @staticmethod
+    def _remove_overlaps(sorted_bins: Sequence[Tuple[float, float, int]]) -> List[List[float]]:
+        ret: List[List[float]] = []
+        for min_value, max_value, count in sorted_bins:
+            if ret and ret[-1][0] <= min_value < ret[-1][1]:
+                if max_value < ret[-1][1]:
+                    # complete overlap
+                    continue
+                # partial overlap
+                min_value = ret[-1][1]
+            ret.append([min_value, max_value, count])
+
+        return ret
+
+    @staticmethod
+    def _create_necessary_empty_bins(sorted_bins: Sequence[Sequence[float]]) -> List[List[float]]:
+        return [[current[1], following[0], 0]
+                for current, following in zip(sorted_bins[:-1], sorted_bins[1:])
+                if current[1] < following[0]]
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '', units: Optional[Unit] = None):
+        return cls(name, uuid,
+                   [(_to_base_units(bin_element.attrib[DistributionConstants.BIN_MIN_VALUE_ATTR], units),
+                     _to_base_units(bin_element.attrib[DistributionConstants.BIN_MAX_VALUE_ATTR], units),
+                     int(bin_element.attrib[DistributionConstants.BIN_COUNT_ATTR]))
+                    for bin_element in from_element.iterchildren(DistributionConstants.BIN_TAG)],
+                   AggressionTrend(from_element.attrib[DistributionConstants.AGGRESSION_ATTR]))
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        return self._backing_distribution.values(t)
+
+    def exact_values(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the distribution at an array of parameters without using the lookup table.
+        """
+        return self._backing_distribution.exact_values(t)
+
+
+class ThingDistribution(Distribution):
+    """
+    A distribution over a set of things (vehicle models, colors, link selection behaviors), each with a relative
+    share of occurrence. Shares are ordered by thing so that a given parameter always selects the same thing
+    regardless of the order of the input.
+
+    Parameters are mapped to things through a Walker/Vose alias table built when the distribution is created: the
+    parameter selects a column of the table and its fractional position within the column decides between the
+    column's own thing and its alias. Each evaluation is O(1) regardless of the number of shares. The cumulative
+    share mapping, with a binary search per evaluation, remains available through exact_indices().
+    """
+    def __init__(self, name: str, uuid: str, shares: Sequence[Tuple[float, object]],
+                 sort_key: Optional[Callable[[object], object]] = None):
+        """
+        Creates a thing distribution.
+        Args:
+            name: The name of the distribution.
+            uuid: The uuid of the distribution.
+            shares: (occurrence, thing) of each share. Shares with zero occurrence are never selected.
+            sort_key: Key function that orders the things. If None, the things themselves are compared.
+        """
+        super().__init__(name, uuid)
+
+        key: Callable[[object], object] = (lambda thing: thing) if sort_key is None else sort_key
+        usable_shares: List[Tuple[float, object]] = sorted(
+            [share for share in shares if share[0] > 0.0], key=lambda share: key(share[1]))
+        total: float = sum(share[0] for share in usable_shares)
+        if total <= 0.0:
+            raise ValueError(Localization.get_message('E0008', uuid))
+
+        self._things: np.ndarray = np.empty(len(usable_shares), dtype=object)
+        self._things[:] = [share[1] for share in usable_shares]
+        self._end_parameters: np.ndarray = np.cumsum([share[0] for share in usable_shares]) / total
+        # account for fp arithmetic making last share end parameter < 1
+        self._end_parameters[-1] = 1.0
+        self._acceptance, self._aliases = ThingDistribution._build_alias_table(
+            np.array([share[0] for share in usable_shares], dtype=np.float64) / total)
+
+    @staticmethod
+    def _build_alias_table(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Vose's method: pair each under-full column with an over-full one, which donates its excess as the alias
+        count: int = len(probabilities)
+        scaled: np.ndarray = probabilities * count
+        acceptance: np.ndarray = np.ones(count, dtype=np.float64)
+        aliases: np.ndarray = np.arange(count, dtype=np.int64)
+        small: List[int] = [index for index in range(count) if scaled[index] < 1.0]
+        large: List[int] = [index for index in range(count) if scaled[index] >= 1.0]
+        while small and large:
+            small_index: int = small.pop()
+            large_index: int = large.pop()
+            acceptance[small_index] = scaled[small_index]
+            aliases[small_index] = large_index
+            scaled[large_index] -= 1.0 - scaled[small_index]
+            if scaled[large_index] < 1.0:
+                small.append(large_index)
+            else:
+                large.append(large_index)
+        # whatever is left over is full to within rounding error, and keeps acceptance 1
+
+        return acceptance, aliases
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, convert: Callable[[str], object] = str,
+                 sort_key: Optional[Callable[[object], object]] = None):
+        """
+        Creates a thing distribution from a distribution element holding share elements.
+        Args:
+            from_element: The distribution element.
+            convert: Converts the text of each share value into the thing it represents.
+            sort_key: Key function that orders the things. If None, the things themselves are compared.
+
+        Returns:
+            The distribution.
+        """
+        return cls(from_element.attrib.get(DistributionConstants.NAME_ATTR, ''),
+                   from_element.attrib[DistributionConstants.UUID_ATTR],
+                   [(float(share.attrib[DistributionConstants.SHARE_OCCURRENCE_ATTR]),
+                     convert(share.attrib[DistributionConstants.SHARE_VALUE_ATTR]))
+                    for share in from_element.iterchildren(DistributionConstants.SHARE_TAG)],
+                   sort_key)
+
+    def indices(self, t: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the distribution at an array of parameters, giving indices into things rather than the things.
+        """
+        t = self._check_parameters(t)
+
+        location: np.ndarray = t * len(self._acceptance)
+        column: np.ndarray = np.minimum(location.astype(np.int64), len(self._acceptance) - 1)
+
+        return np.where(location - column < self._acceptance[column], column, self._aliases[column])
+
+    def exact_indices(self, t: np.ndarray) -> np.ndarray:
+        """
+        Maps an array of parameters to indices into things through the cumulative shares, in share order.
+        """
+        t = self._check_parameters(t)
+
+        return np.searchsorted(self._end_parameters, t, side='left')
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        return self._things[self.indices(t)]
+
+    @property
+    def things(self) -> np.ndarray:
+        """
+        Returns the things that can be selected, in share order.
+        """
+        return self._things
+
+
+class PoissonDistribution(Distribution):
+    """
+    A Poisson distribution over the non-negative integers.
+
+    The cumulative probabilities are tabulated once per lambda, out to where the remaining probability is
+    negligible, and shared by all distributions with that lambda. A batch of parameters is then evaluated with a
+    single searchsorted into the table.
+    """
+    _SMALLEST_VALUE: int = 0
+    _TAIL_STANDARD_DEVIATIONS: float = 12.0
+    _cumulative_tables: Dict[Tuple[int, float], np.ndarray] = dict()
+
+    def __init__(self, name: str, uuid: str, lambda_: float):
+        super().__init__(name, uuid)
+
+        self._lambda: float = lambda_
+        self._cumulative_probabilities: np.ndarray = self._cumulative_table(lambda_)
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '', units: Optional[Unit] = None):
+        # values are counts, which have no units
+        return cls(name, uuid, float(from_element.attrib[DistributionConstants.POISSON_LAMBDA_ATTR]))
+
+    @classmethod
+    def _cumulative_table(cls, lambda_: float) -> np.ndarray:
+        key: Tuple[int, float] = (cls._SMALLEST_VALUE, lambda_)
+        if key not in cls._cumulative_tables:
+            largest_value: int = int(math.ceil(lambda_ + cls._TAIL_STANDARD_DEVIATIONS * math.sqrt(lambda_))) + 10
+            k: np.ndarray = np.arange(cls._SMALLEST_VALUE, largest_value + 1, dtype=np.float64)
+            # log(k!) by accumulating log(1) ... log(k); log(0!) = 0
+            log_factorials: np.ndarray = np.concatenate(
+                [[0.0], np.cumsum(np.log(np.arange(1, largest_value + 1, dtype=np.float64)))])[cls._SMALLEST_VALUE:]
+            cumulative: np.ndarray = np.cumsum(np.exp(
+                k * math.log(lambda_) - lambda_ - log_factorials - cls._log_normalization(lambda_)))
+            cumulative[-1] = 1.0
+            cls._cumulative_tables[key] = cumulative
+
+        return cls._cumulative_tables[key]
+
+    @staticmethod
+    def _log_normalization(lambda_: float) -> float:
+        return 0.0
+
+    def values(self, t: np.ndarray) -> np.ndarray:
+        t = self._check_parameters(t)
+
+        return self._SMALLEST_VALUE + np.searchsorted(self._cumulative_probabilities, t, side='left')
+
+    @property
+    def lambda_(self) -> float:
+        return self._lambda
+
+
+class ZeroTruncatedPoissonDistribution(PoissonDistribution):
+    """
+    A Poisson distribution conditioned on the value being at least one, as used for vehicle occupancy and transit
+    passengers.
+    """
+    _SMALLEST_VALUE: int = 1
+    _cumulative_tables: Dict[Tuple[int, float], np.ndarray] = dict()
+
+    @staticmethod
+    def _log_normalization(lambda_: float) -> float:
+        # probability of a value of at least one
+        return math.log(-math.expm1(-lambda_))
+
+
+class SpeedDependentNormalDistribution:
+    """
+    A normal distribution whose mean and standard deviation depend on speed, as used for vehicle acceleration.
+    Means and standard deviations are given at a set of speeds and interpolated linearly between them, holding the
+    values at the slowest and fastest speeds beyond them.
+
+    A vehicle keeps its parameter while its speed changes, so the distribution is evaluated on a batch of
+    parameters together with the speed that goes with each of them.
+    """
+    def __init__(self, name: str, uuid: str, data_points: Sequence[Tuple[float, float, float]]):
+        """
+        Creates a speed dependent distribution.
+        Args:
+            name: The name of the distribution.
+            uuid: The uuid of the distribution.
+            data_points: (speed, mean, standard deviation) at each of at least one speed.
+        """
+        self._name: str = name
+        self._uuid: str = uuid
+
+        sorted_points: List[Tuple[float, float, float]] = sorted(data_points, key=lambda point: point[0])
+        self._speeds: np.ndarray = np.array([point[0] for point in sorted_points], dtype=np.float64)
+        self._means: np.ndarray = np.array([point[1] for point in sorted_points], dtype=np.float64)
+        self._standard_deviations: np.ndarray = np.array([point[2] for point in sorted_points], dtype=np.float64)
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase, name: str = '', uuid: str = '',
+                 speed_units: Optional[Unit] = None, units: Optional[Unit] = None):
+        """
+        Creates a speed dependent distribution from the data points of a distribution element.
+        Args:
+            from_element: The distribution element.
+            name: The name of the distribution.
+            uuid: The uuid of the distribution.
+            speed_units: The units of the speeds of the data points.
+            units: The units of the means and standard deviations of the data points.
+
+        Returns:
+            The distribution.
+        """
+        return cls(name, uuid, [
+            (_to_base_units(dp.attrib[DistributionConstants.DATAPOINT_VELOCITY_ATTR], speed_units),
+             _to_base_units(dp.attrib[DistributionConstants.NORMAL_MEAN_ATTR], units),
+             _to_base_units(dp.attrib[DistributionConstants.NORMAL_STANDARD_DEVIATION_ATTR], units))
+            for dp in from_element.iterchildren(DistributionConstants.DATAPOINT_TAG)
+        ])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def uuid(self) -> str:
+        return self._uuid
+
+    def values(self, t: np.ndarray, speeds: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the distribution at an array of parameters.
+        Args:
+            t: Parameters in the range [0, 1].
+            speeds: The speed that goes with each parameter, in meters per second.
+
+        Returns:
+            An array of the broadcast shape of t and speeds holding the value of the distribution at each parameter
+            and speed.
+        """
+        t = Distribution._check_parameters(t)
+        speeds = np.asarray(speeds, dtype=np.float64)
+        means: np.ndarray = np.interp(speeds, self._speeds, self._means)
+        standard_deviations: np.ndarray = np.interp(speeds, self._speeds, self._standard_deviations)
+
+        return means + standard_deviations * _standard_normal_quantile(t)
+
+    def value(self, t: float, speed: float) -> float:
+        """
+        Evaluates the distribution at a single parameter and speed.
+        """
+        return self.values(np.array([t], dtype=np.float64), np.array([speed], dtype=np.float64))[0]
+
+
+_REAL_NUMBER_DISTRIBUTION_TYPES = {
+    DistributionConstants.NORMAL_TAG: NormalDistributionTruncatable,
+    DistributionConstants.EMPIRICAL_TAG: EmpiricalDistribution,
+    DistributionConstants.RAW_EMPIRICAL_TAG: RawEmpiricalDistribution,
+    DistributionConstants.BINNED_TAG: BinnedDistribution,
+    DistributionConstants.POISSON_TAG: PoissonDistribution,
+    DistributionConstants.ZERO_TRUNCATED_POISSON_TAG: ZeroTruncatedPoissonDistribution,
+}
+
+
+def distribution_from_xml(distribution_element: etree.ElementBase) \
+        -> Union[Distribution, SpeedDependentNormalDistribution]:
+    """
+    Creates a numeric distribution from a distribution element of the distributions file. The name and uuid are
+    read from the distribution element and the distribution itself from its first recognized child element, with
+    its values converted from the units attribute to base units. Acceleration distributions, whose data points
+    sit directly in the distribution element, give a SpeedDependentNormalDistribution.
+    Args:
+        distribution_element: The distribution element.
+
+    Returns:
+        The distribution.
+    """
+    attrib = distribution_element.attrib
+    name: str = attrib.get(DistributionConstants.NAME_ATTR, '')
+    uuid: str = attrib[DistributionConstants.UUID_ATTR]
+    if DistributionConstants.ACCELERATION_UNIT_ATTR in attrib:
+        return SpeedDependentNormalDistribution.from_xml(
+            distribution_element, name, uuid, SpeedUnits.DICTIONARY[attrib[DistributionConstants.SPEED_UNIT_ATTR]],
+            AccelerationUnits.DICTIONARY[attrib[DistributionConstants.ACCELERATION_UNIT_ATTR]])
+
+    units: Optional[Unit] = None
+    if DistributionConstants.UNITS_ATTR in attrib:
+        units = _UNITS_BY_NAME[attrib[DistributionConstants.UNITS_ATTR]]
+    for child in distribution_element.iterchildren(*_REAL_NUMBER_DISTRIBUTION_TYPES.keys()):
+        return _REAL_NUMBER_DISTRIBUTION_TYPES[child.tag].from_xml(child, name, uuid, units)
+
+    raise ValueError(Localization.get_message('E0010', uuid))
@@ -0,0 +1,115 @@
+from lxml import etree
+import numpy as np
+from typing import Dict, List
+from parameters.vehicle_types import VehicleTypes
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+# part of the key of cached files; increase it whenever the way files are read changes
+LOADER_VERSION: int = 1
+
+
+class LaneUsageConstants:
+    ROOT_TAG = 'lane-usage'
+    VERSION_ATTR = 'version'
+    NAME_ATTR = 'name'
+    UUID_ATTR = 'uuid'
+    POLICIES_TAG = 'lane-policies'
+    POLICY_TAG = 'policy'
+    POLICY_START_FROM_ATTR = 'start-from'
+    POLICY_ALL_ALLOWED = 'all-allowed'
+    POLICY_NONE_ALLOWED = 'none-allowed'
+    POLICY_EXCEPT_TAG = 'except'
+    POLICY_EXCEPT_GROUP_ATTR = 'group'
+
+
+class LaneUsage:
+    """
+    The lane usage policies of a lane usage file. Policies are identified by their index in file order. Each policy
+    starts from all or no vehicle types being allowed, and its exceptions reverse that for the members of groups.
+    """
+    def __init__(self, uuids: List[str], names: List[str], starts_all_allowed: np.ndarray,
+                 exception_groups: List[List[str]]):
+        """
+        Creates lane usage policies from their tables.
+        Args:
+            uuids: The uuid of each policy.
+            names: The name of each policy.
+            starts_all_allowed: Whether each policy starts from all vehicle types being allowed, rather than none.
+            exception_groups: The uuids of the groups each policy makes exceptions for.
+        """
+        self._uuids: List[str] = uuids
+        self._names: List[str] = names
+        self._index_of: Dict[str, int] = {policy_uuid: index for index, policy_uuid in enumerate(uuids)}
+        self._starts_all_allowed: np.ndarray = starts_all_allowed
+        self._exception_groups: List[List[str]] = exception_groups
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase):
+        policy_elements: List[etree.ElementBase] = list(
+            from_element.find(LaneUsageConstants.POLICIES_TAG).iterchildren(LaneUsageConstants.POLICY_TAG))
+
+        return cls(
+            [element.attrib[LaneUsageConstants.UUID_ATTR] for element in policy_elements],
+            [element.attrib.get(LaneUsageConstants.NAME_ATTR, '') for element in policy_elements],
+            np.array([element.attrib[LaneUsageConstants.POLICY_START_FROM_ATTR] == LaneUsageConstants.POLICY_ALL_ALLOWED
+                      for element in policy_elements], dtype=np.bool_),
+            [[except_element.attrib[LaneUsageConstants.POLICY_EXCEPT_GROUP_ATTR]
+              for except_element in element.iterchildren(LaneUsageConstants.POLICY_EXCEPT_TAG)]
+             for element in policy_elements])
+
+    @property
+    def uuids(self) -> List[str]:
+        return self._uuids
+
+    @property
+    def names(self) -> List[str]:
+        return self._names
+
+    @property
+    def index_of(self) -> Dict[str, int]:
+        return self._index_of
+
+    @property
+    def starts_all_allowed(self) -> np.ndarray:
+        """
+        Returns whether each policy starts from all vehicle types being allowed, rather than none.
+        """
+        return self._starts_all_allowed
+
+    @property
+    def exception_groups(self) -> List[List[str]]:
+        """
+        Returns the uuids of the groups each policy makes exceptions for.
+        """
+        return self._exception_groups
+
+    def allowed_types(self, vehicle_types: VehicleTypes) -> np.ndarray:
+        """
+        Resolves the policies' group exceptions against the vehicle types.
+        Args:
+            vehicle_types: The vehicle types and groups the exceptions refer to.
+
+        Returns:
+            Whether each vehicle type is allowed by each policy, with one row per policy and one column per
+            vehicle type.
+        """
+        allowed: np.ndarray = np.repeat(self._starts_all_allowed[:, np.newaxis], vehicle_types.count, axis=1)
+        for policy_index, group_uuids in enumerate(self._exception_groups):
+            for group_uuid in group_uuids:
+                if group_uuid not in vehicle_types.group_members:
+                    raise KeyError(Localization.get_message('E0016', self._uuids[policy_index], group_uuid))
+                allowed[policy_index, vehicle_types.group_members[group_uuid]] = \
+                    not self._starts_all_allowed[policy_index]
+
+        return allowed
+
+
+def process_file(filename) -> LaneUsage:
+    tree: etree.ElementTree = etree.parse(filename)
+    if not XmlValidation.get_schema(XmlValidation.LANE_USAGE_XSD).validate(tree):
+        # validation failed
+        raise RuntimeError(Localization.get_message('E0002', str(filename)))
+
+    return LaneUsage.from_xml(tree.getroot())
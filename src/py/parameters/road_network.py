@@ -0,0 +1,505 @@
+from lxml import etree
+import numpy as np
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from parameters.chain_geometry import ChainGeometry, parse_chain_points
+from parameters.units import Unit, LengthUnits, SpeedUnits
+from parameters.xml_times import time_of_day_to_seconds
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+# part of the key of cached files; increase it whenever the way files are read changes
+LOADER_VERSION: int = 1
+
+
+class NetworkConstants:
+    ROOT_TAG = 'network'
+    LAYOUT_UNITS_ATTR = 'layout-units'
+    SPEED_UNITS_ATTR = 'speed-limit-units'
+    VERSION_ATTR = 'version'
+
+
+class RoadConstants:
+    COLLECTION_TAG = 'roads'
+    TAG = 'road'
+    NAME_ATTR = 'name'
+    UUID_ATTR = 'uuid'
+    BEHAVIOR_ATTR = 'behavior'
+    SPEED_LIMIT_ATTR = 'speed-limit'
+    CHAIN_TAG = 'chain'
+    CHAIN_POINTS_ATTR = 'points'
+    LANES_COLLECTION_TAG = 'lanes'
+    LANE_TAG = 'lane'
+    LANE_ORDINAL_ATTR = 'ordinal'
+    LANE_WIDTH_ATTR = 'width'
+    LANE_MAY_MOVE_LEFT_ATTR = 'may-move-left'
+    LANE_MAY_MOVE_RIGHT_ATTR = 'may-move-right'
+    LANE_POLICY_TAG = 'policy'
+    LANE_POLICY_ID_ATTR = 'id'
+    LANE_POLICY_EXCEPT_TAG = 'except'
+    LANE_POLICY_EXCEPT_POLICY_ATTR = 'policy'
+    LANE_POLICY_EXCEPT_START_ATTR = 'start-time'
+    LANE_POLICY_EXCEPT_END_ATTR = 'end-time'
+    POCKETS_COLLECTION_TAG = 'pockets'
+    POCKET_TAG = 'pocket'
+    POCKET_SIDE_ATTR = 'side'
+    POCKET_START_ORD_ATTR = 'start-ord'
+    POCKET_END_ORD_ATTR = 'end-ord'
+    POCKET_START_TAPER_ATTR = 'start-taper'
+    POCKET_END_TAPER_ATTR = 'end-taper'
+    POCKET_LANE_COUNT_ATTR = 'lane-count'
+    ORDINATE_START_OF_ROAD = 'a'
+    ORDINATE_END_OF_ROAD = 'b'
+    NO_TAPER = 'none'
+
+
+class VehicleEntryConstants:
+    ENTRY_TAG = 'vehicle-entry'
+    INTERVAL_TAG = 'interval'
+    INTERVAL_START_ATTR = 'start'
+    INTERVAL_END_ATTR = 'end'
+    VEHICLE_TAG = 'vehicle'
+    VEHICLE_TYPE_ATTR = 'type'
+    VEHICLE_COUNT_ATTR = 'count'
+    VEHICLE_BYPASS_ATTR = 'congestion-bypassing-fraction'
+    DEFAULT_BYPASS_FRACTION = 0.25
+
+
+class PocketSide(IntEnum):
+    LEFT = 0
+    RIGHT = 1
+
+
+class Roads(NamedTuple):
+    """
+    Road records, one element per road in file order. Chain points of road i are
+    chain_points[chain_offsets[i]:chain_offsets[i + 1]].
+    """
+    uuids: List[str]
+    names: List[str]
+    behaviors: np.ndarray
+    '''Index into RoadNetwork.behavior_uuids of each road's behavior.'''
+    speed_limits: np.ndarray
+    '''Speed limit of each road, in meters per second.'''
+    chain_offsets: np.ndarray
+    chain_points: np.ndarray
+    '''Chain points of all roads, as an (n, 2) array of x, y in meters.'''
+
+
+class Lanes(NamedTuple):
+    """
+    Lane records, one element per lane, grouped by road. Lanes of road i are [road_offsets[i], road_offsets[i + 1]),
+    and the policy exceptions of lane j are [exception_offsets[j], exception_offsets[j + 1]).
+    """
+    road_offsets: np.ndarray
+    ordinals: np.ndarray
+    widths: np.ndarray
+    '''Width of each lane, in meters.'''
+    may_move_left: np.ndarray
+    may_move_right: np.ndarray
+    policies: np.ndarray
+    '''Index into RoadNetwork.policy_uuids of each lane's default policy.'''
+    exception_offsets: np.ndarray
+    exception_policies: np.ndarray
+    exception_starts: np.ndarray
+    '''Start of each policy exception, in seconds after midnight.'''
+    exception_ends: np.ndarray
+
+
+class Pockets(NamedTuple):
+    """
+    Pocket records, one element per pocket, grouped by road. Pockets of road i are
+    [road_offsets[i], road_offsets[i + 1]). Ordinates are in meters; an ordinate at end 'a' of the road is 0 and one
+    at end 'b' is infinity, since the road length is only known once its geometry has been computed. Missing tapers
+    are NaN.
+    """
+    road_offsets: np.ndarray
+    sides: np.ndarray
+    '''PocketSide value of each pocket.'''
+    start_ordinates: np.ndarray
+    end_ordinates: np.ndarray
+    start_tapers: np.ndarray
+    end_tapers: np.ndarray
+    lane_counts: np.ndarray
+
+
+class VehicleEntries(NamedTuple):
+    """
+    Vehicle entry records, one element per vehicle element of a vehicle-entry interval.
+    """
+    roads: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    vehicle_types: np.ndarray
+    '''Index into RoadNetwork.vehicle_type_uuids of each record's vehicle type.'''
+    counts: np.ndarray
+    congestion_bypassing_fractions: np.ndarray
+
+
+class EntryInterval(NamedTuple):
+    """
+    The vehicles of one type entering on one road during one interval.
+    """
+    road: int
+    '''Index of the road the vehicles enter on.'''
+    start: float
+    '''Start of the interval, in seconds after midnight.'''
+    end: float
+    '''End of the interval, in seconds after midnight.'''
+    vehicle_type: int
+    '''Index of the vehicle type.'''
+    count: int
+    '''Number of vehicles entering during the interval.'''
+    congestion_bypassing_fraction: float = VehicleEntryConstants.DEFAULT_BYPASS_FRACTION
+    '''Fraction of the vehicles that bypass congestion at the entry point.'''
+
+
+class RoadNetwork:
+    """
+    The contents of a network file, held as flat arrays rather than as objects per road. Uuids that are referred to
+    many times (behaviors, lane policies, vehicle types) are stored once, and the records hold indices into them.
+
+    Lanes are numbered by ordinal from the rightmost lane of a road, ordinal 0, to the left.
+    """
+    NO_LANE: int = -1
+
+    def __init__(self, roads: Roads, lanes: Lanes, pockets: Pockets, entries: VehicleEntries,
+                 behavior_uuids: List[str], policy_uuids: List[str], vehicle_type_uuids: List[str]):
+        self._roads: Roads = roads
+        self._lanes: Lanes = lanes
+        self._pockets: Pockets = pockets
+        self._entries: VehicleEntries = entries
+        self._behavior_uuids: List[str] = behavior_uuids
+        self._policy_uuids: List[str] = policy_uuids
+        self._vehicle_type_uuids: List[str] = vehicle_type_uuids
+        self._road_index_of: Dict[str, int] = {road_uuid: index for index, road_uuid in enumerate(roads.uuids)}
+        self._chain_geometry: Optional[ChainGeometry] = None
+
+    @property
+    def roads(self) -> Roads:
+        return self._roads
+
+    @property
+    def lanes(self) -> Lanes:
+        return self._lanes
+
+    @property
+    def pockets(self) -> Pockets:
+        return self._pockets
+
+    @property
+    def entries(self) -> VehicleEntries:
+        return self._entries
+
+    @property
+    def behavior_uuids(self) -> List[str]:
+        return self._behavior_uuids
+
+    @property
+    def policy_uuids(self) -> List[str]:
+        return self._policy_uuids
+
+    @property
+    def vehicle_type_uuids(self) -> List[str]:
+        return self._vehicle_type_uuids
+
+    @property
+    def road_index_of(self) -> Dict[str, int]:
+        """
+        Returns the road index for each road uuid.
+        """
+        return self._road_index_of
+
+    @property
+    def road_count(self) -> int:
+        return len(self._roads.uuids)
+
+    @property
+    def chain_geometry(self) -> ChainGeometry:
+        """
+        Returns the stations, headings and curvature of the segments of all road chains, computed on first use.
+        """
+        if self._chain_geometry is None:
+            self._chain_geometry = ChainGeometry.from_chains(self._roads.chain_offsets, self._roads.chain_points)
+
+        return self._chain_geometry
+
+    def adjacent_lanes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the global index of the lane to the left and of the lane to the right of each lane, holding NO_LANE
+        where a lane has no neighbor on that side.
+        """
+        lanes: Lanes = self._lanes
+        lane_count: int = len(lanes.ordinals)
+        roads: np.ndarray = np.repeat(np.arange(self.road_count), np.diff(lanes.road_offsets))
+        by_ordinal: np.ndarray = np.lexsort((lanes.ordinals, roads))
+        # neighbors in ordinal order are adjacent when they are on the same road and their ordinals are consecutive
+        adjacent: np.ndarray = (roads[by_ordinal[1:]] == roads[by_ordinal[:-1]]) & \
+            (lanes.ordinals[by_ordinal[1:]] == lanes.ordinals[by_ordinal[:-1]] + 1)
+        left: np.ndarray = np.full(lane_count, RoadNetwork.NO_LANE, dtype=np.int64)
+        right: np.ndarray = np.full(lane_count, RoadNetwork.NO_LANE, dtype=np.int64)
+        left[by_ordinal[:-1][adjacent]] = by_ordinal[1:][adjacent]
+        right[by_ordinal[1:][adjacent]] = by_ordinal[:-1][adjacent]
+
+        return left, right
+
+    def entry_intervals(self, vehicle_type_index_of: Dict[str, int]) -> List[EntryInterval]:
+        """
+        Returns the vehicle entry records as entry intervals, for use with VehicleEntrySchedule.from_intervals.
+        Args:
+            vehicle_type_index_of: Vehicle type index for each vehicle type uuid.
+
+        Returns:
+            The entry intervals.
+        """
+        type_indices: List[int] = [vehicle_type_index_of[vehicle_type] for vehicle_type in self._vehicle_type_uuids]
+        entries: VehicleEntries = self._entries
+
+        return [EntryInterval(road, start, end, type_indices[vehicle_type], count, fraction)
+                for road, start, end, vehicle_type, count, fraction in zip(
+                    entries.roads.tolist(), entries.starts.tolist(), entries.ends.tolist(),
+                    entries.vehicle_types.tolist(), entries.counts.tolist(),
+                    entries.congestion_bypassing_fractions.tolist())]
+
+
+class _NetworkReader:
+    """
+    Accumulates the records of one road at a time. Only scalars and per-road point arrays are kept, so that the
+    elements of each road can be discarded as soon as the road has been read.
+    """
+    def __init__(self, layout_units: Unit, speed_units: Unit):
+        self._layout_units: Unit = layout_units
+        self._speed_units: Unit = speed_units
+        self._behavior_index_of: Dict[str, int] = dict()
+        self._policy_index_of: Dict[str, int] = dict()
+        self._vehicle_type_index_of: Dict[str, int] = dict()
+
+        self._road_uuids: List[str] = []
+        self._road_names: List[str] = []
+        self._road_behaviors: List[int] = []
+        self._speed_limits: List[float] = []
+        self._chains: List[np.ndarray] = []
+
+        self._lanes_per_road: List[int] = []
+        self._lane_ordinals: List[int] = []
+        self._lane_widths: List[float] = []
+        self._may_move_left: List[bool] = []
+        self._may_move_right: List[bool] = []
+        self._lane_policies: List[int] = []
+        self._exceptions_per_lane: List[int] = []
+        self._exception_policies: List[int] = []
+        self._exception_starts: List[float] = []
+        self._exception_ends: List[float] = []
+
+        self._pockets_per_road: List[int] = []
+        self._pocket_sides: List[int] = []
+        self._pocket_start_ordinates: List[float] = []
+        self._pocket_end_ordinates: List[float] = []
+        self._pocket_start_tapers: List[float] = []
+        self._pocket_end_tapers: List[float] = []
+        self._pocket_lane_counts: List[int] = []
+
+        self._entry_roads: List[int] = []
+        self._entry_starts: List[float] = []
+        self._entry_ends: List[float] = []
+        self._entry_vehicle_types: List[int] = []
+        self._entry_counts: List[int] = []
+        self._entry_fractions: List[float] = []
+
+    def read_road(self, road_element: etree.ElementBase) -> None:
+        road_index: int = len(self._road_uuids)
+        attributes = road_element.attrib
+        self._road_uuids.append(attributes[RoadConstants.UUID_ATTR])
+        self._road_names.append(attributes.get(RoadConstants.NAME_ATTR, ''))
+        self._road_behaviors.append(_index_of(self._behavior_index_of, attributes[RoadConstants.BEHAVIOR_ATTR]))
+        self._speed_limits.append(
+            self._speed_units.convert_to_base_units(float(attributes[RoadConstants.SPEED_LIMIT_ATTR])))
+
+        points_text: str = road_element.find(RoadConstants.CHAIN_TAG).attrib[RoadConstants.CHAIN_POINTS_ATTR]
+        self._chains.append(self._layout_units.convert_to_base_units(parse_chain_points(points_text)))
+
+        lane_count: int = 0
+        for lane_element in road_element.find(RoadConstants.LANES_COLLECTION_TAG).iterchildren(RoadConstants.LANE_TAG):
+            self._read_lane(lane_element)
+            lane_count += 1
+        self._lanes_per_road.append(lane_count)
+
+        pocket_count: int = 0
+        for pocket_element in road_element.find(RoadConstants.POCKETS_COLLECTION_TAG).iterchildren(
+                RoadConstants.POCKET_TAG):
+            self._read_pocket(pocket_element)
+            pocket_count += 1
+        self._pockets_per_road.append(pocket_count)
+
+        entry_element: Optional[etree.ElementBase] = road_element.find(VehicleEntryConstants.ENTRY_TAG)
+        if entry_element is not None:
+            self._read_entries(entry_element, road_index)
+
+    def _read_lane(self, lane_element: etree.ElementBase) -> None:
+        attributes = lane_element.attrib
+        self._lane_ordinals.append(int(attributes[RoadConstants.LANE_ORDINAL_ATTR]))
+        self._lane_widths.append(
+            self._layout_units.convert_to_base_units(float(attributes[RoadConstants.LANE_WIDTH_ATTR])))
+        self._may_move_left.append(_xml_boolean(attributes.get(RoadConstants.LANE_MAY_MOVE_LEFT_ATTR, 'true')))
+        self._may_move_right.append(_xml_boolean(attributes.get(RoadConstants.LANE_MAY_MOVE_RIGHT_ATTR, 'true')))
+
+        policy_element: etree.ElementBase = lane_element.find(RoadConstants.LANE_POLICY_TAG)
+        self._lane_policies.append(
+            _index_of(self._policy_index_of, policy_element.attrib[RoadConstants.LANE_POLICY_ID_ATTR]))
+        exception_count: int = 0
+        for exception_element in policy_element.iterchildren(RoadConstants.LANE_POLICY_EXCEPT_TAG):
+            exception_attributes = exception_element.attrib
+            self._exception_policies.append(
+                _index_of(self._policy_index_of, exception_attributes[RoadConstants.LANE_POLICY_EXCEPT_POLICY_ATTR]))
+            self._exception_starts.append(
+                time_of_day_to_seconds(exception_attributes[RoadConstants.LANE_POLICY_EXCEPT_START_ATTR]))
+            self._exception_ends.append(
+                time_of_day_to_seconds(exception_attributes[RoadConstants.LANE_POLICY_EXCEPT_END_ATTR]))
+            exception_count += 1
+        self._exceptions_per_lane.append(exception_count)
+
+    def _read_pocket(self, pocket_element: etree.ElementBase) -> None:
+        attributes = pocket_element.attrib
+        self._pocket_sides.append(PocketSide[attributes[RoadConstants.POCKET_SIDE_ATTR].upper()].value)
+        self._pocket_start_ordinates.append(self._ordinate(attributes[RoadConstants.POCKET_START_ORD_ATTR]))
+        self._pocket_end_ordinates.append(self._ordinate(attributes[RoadConstants.POCKET_END_ORD_ATTR]))
+        self._pocket_start_tapers.append(
+            self._taper(attributes.get(RoadConstants.POCKET_START_TAPER_ATTR, RoadConstants.NO_TAPER)))
+        self._pocket_end_tapers.append(
+            self._taper(attributes.get(RoadConstants.POCKET_END_TAPER_ATTR, RoadConstants.NO_TAPER)))
+        self._pocket_lane_counts.append(int(attributes.get(RoadConstants.POCKET_LANE_COUNT_ATTR, '1')))
+
+    def _read_entries(self, entry_element: etree.ElementBase, road_index: int) -> None:
+        for interval_element in entry_element.iterchildren(VehicleEntryConstants.INTERVAL_TAG):
+            start: float = time_of_day_to_seconds(interval_element.attrib[VehicleEntryConstants.INTERVAL_START_ATTR])
+            end: float = time_of_day_to_seconds(interval_element.attrib[VehicleEntryConstants.INTERVAL_END_ATTR])
+            for vehicle_element in interval_element.iterchildren(VehicleEntryConstants.VEHICLE_TAG):
+                attributes = vehicle_element.attrib
+                self._entry_roads.append(road_index)
+                self._entry_starts.append(start)
+                self._entry_ends.append(end)
+                self._entry_vehicle_types.append(
+                    _index_of(self._vehicle_type_index_of, attributes[VehicleEntryConstants.VEHICLE_TYPE_ATTR]))
+                self._entry_counts.append(int(attributes[VehicleEntryConstants.VEHICLE_COUNT_ATTR]))
+                self._entry_fractions.append(float(attributes.get(
+                    VehicleEntryConstants.VEHICLE_BYPASS_ATTR, VehicleEntryConstants.DEFAULT_BYPASS_FRACTION)))
+
+    def _ordinate(self, text: str) -> float:
+        if text == RoadConstants.ORDINATE_START_OF_ROAD:
+            return 0.0
+        if text == RoadConstants.ORDINATE_END_OF_ROAD:
+            return np.inf
+
+        return self._layout_units.convert_to_base_units(float(text))
+
+    def _taper(self, text: str) -> float:
+        if text == RoadConstants.NO_TAPER:
+            return np.nan
+
+        return self._layout_units.convert_to_base_units(float(text))
+
+    def finish(self) -> RoadNetwork:
+        chain_lengths: List[int] = [len(chain) for chain in self._chains]
+        roads: Roads = Roads(
+            uuids=self._road_uuids,
+            names=self._road_names,
+            behaviors=np.array(self._road_behaviors, dtype=np.int32),
+            speed_limits=np.array(self._speed_limits, dtype=np.float64),
+            chain_offsets=_offsets(chain_lengths),
+            chain_points=np.concatenate(self._chains) if self._chains else np.zeros((0, 2), dtype=np.float64),
+        )
+        lanes: Lanes = Lanes(
+            road_offsets=_offsets(self._lanes_per_road),
+            ordinals=np.array(self._lane_ordinals, dtype=np.int32),
+            widths=np.array(self._lane_widths, dtype=np.float64),
+            may_move_left=np.array(self._may_move_left, dtype=np.bool_),
+            may_move_right=np.array(self._may_move_right, dtype=np.bool_),
+            policies=np.array(self._lane_policies, dtype=np.int32),
+            exception_offsets=_offsets(self._exceptions_per_lane),
+            exception_policies=np.array(self._exception_policies, dtype=np.int32),
+            exception_starts=np.array(self._exception_starts, dtype=np.float64),
+            exception_ends=np.array(self._exception_ends, dtype=np.float64),
+        )
+        pockets: Pockets = Pockets(
+            road_offsets=_offsets(self._pockets_per_road),
+            sides=np.array(self._pocket_sides, dtype=np.int8),
+            start_ordinates=np.array(self._pocket_start_ordinates, dtype=np.float64),
+            end_ordinates=np.array(self._pocket_end_ordinates, dtype=np.float64),
+            start_tapers=np.array(self._pocket_start_tapers, dtype=np.float64),
+            end_tapers=np.array(self._pocket_end_tapers, dtype=np.float64),
+            lane_counts=np.array(self._pocket_lane_counts, dtype=np.int32),
+        )
+        entries: VehicleEntries = VehicleEntries(
+            roads=np.array(self._entry_roads, dtype=np.int32),
+            starts=np.array(self._entry_starts, dtype=np.float64),
+            ends=np.array(self._entry_ends, dtype=np.float64),
+            vehicle_types=np.array(self._entry_vehicle_types, dtype=np.int32),
+            counts=np.array(self._entry_counts, dtype=np.int64),
+            congestion_bypassing_fractions=np.array(self._entry_fractions, dtype=np.float64),
+        )
+
+        return RoadNetwork(roads, lanes, pockets, entries, list(self._behavior_index_of),
+                           list(self._policy_index_of), list(self._vehicle_type_index_of))
+
+
+def _index_of(index_of: Dict[str, int], key: str) -> int:
+    return index_of.setdefault(key, len(index_of))
+
+
+def _xml_boolean(text: str) -> bool:
+    return text.strip() in ('true', '1')
+
+
+def _offsets(counts: List[int]) -> np.ndarray:
+    offsets: np.ndarray = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    return offsets
+
+
+def process_file(filename) -> RoadNetwork:
+    """
+    Reads a network file. The file is parsed as a stream and validated while it is parsed; each road is converted
+    to records and its elements are discarded as soon as its end tag is reached, so memory use does not grow with
+    the size of the document.
+    Args:
+        filename: The network file.
+
+    Returns:
+        The network.
+    Raises:
+        RuntimeError if the file does not validate against the network schema.
+    """
+    schema: etree.XMLSchema = XmlValidation.get_schema(XmlValidation.NETWORK_XSD)
+    reader: Optional[_NetworkReader] = None
+    # an error met while reading may come from content that the schema only rejects later in the parse, so it is
+    # held until the whole file has been validated
+    read_error: Optional[Exception] = None
+    try:
+        with open(filename, 'rb') as source:
+            for event, element in etree.iterparse(source, events=('start', 'end'),
+                                                  tag=(NetworkConstants.ROOT_TAG, RoadConstants.TAG), schema=schema):
+                if read_error is None:
+                    try:
+                        if element.tag == NetworkConstants.ROOT_TAG:
+                            if event == 'start':
+                                reader = _NetworkReader(
+                                    LengthUnits.DICTIONARY[element.attrib[NetworkConstants.LAYOUT_UNITS_ATTR]],
+                                    SpeedUnits.DICTIONARY[element.attrib[NetworkConstants.SPEED_UNITS_ATTR]])
+                        elif event == 'end':
+                            reader.read_road(element)
+                    except (KeyError, ValueError) as error:
+                        read_error = error
+                if element.tag == RoadConstants.TAG and event == 'end':
+                    # drop the road and any already-read siblings still held by the roads element
+                    element.clear(keep_tail=False)
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+    except etree.XMLSyntaxError:
+        # validation failed
+        raise RuntimeError(Localization.get_message('E0002', str(filename)))
+    if read_error is not None:
+        raise read_error
+
+    return reader.finish()
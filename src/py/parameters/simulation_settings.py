@@ -0,0 +1,145 @@
+from lxml import etree
+from typing import Dict, List, Optional
+from parameters.xml_times import time_of_day_to_seconds, duration_to_seconds
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+class SimulationSettingsConstants:
+    ROOT_TAG = 'simulation-settings'
+    VERSION_ATTR = 'version'
+    RUN_COUNT_ATTR = 'run-count'
+    FILES_TAG = 'files'
+    ARCHIVE_TAG = 'archive'
+    ARCHIVE_PATH_ATTR = 'path'
+    ARCHIVE_TYPE_ATTR = 'type'
+    SIM_TIMES_TAG = 'simulation-times'
+    SIM_START_ATTR = 'simulation-start-time'
+    SIM_TIMEZONE_ATTR = 'utc-offset'
+    SIM_EVALUATION_LENGTH_ATTR = 'evaluation-length'
+    SIM_SEED_LENGTH_ATTR = 'seed-length'
+    SIM_TIME_STEPS_ATTR = 'time-steps-per-second'
+    SEEDING_TAG = 'seeding'
+    SEEDING_FIRST_SEED_ATTR = 'random-seed-first-run'
+    SEEDING_SEED_INCREMENT_ATTR = 'random-seed-increment'
+    DEFAULT_RUN_COUNT = 1
+    DEFAULT_UTC_OFFSET = 0.0
+    DEFAULT_TIME_STEPS_PER_SECOND = 10
+    DEFAULT_FIRST_SEED = 73110
+    DEFAULT_SEED_INCREMENT = 10
+
+
+class SimulationSettings:
+    """
+    The contents of a simulation settings file. Times are in seconds.
+    """
+    def __init__(self, from_element: etree.ElementBase):
+        attributes = from_element.attrib
+        self._run_count: int = int(attributes.get(SimulationSettingsConstants.RUN_COUNT_ATTR,
+                                                  SimulationSettingsConstants.DEFAULT_RUN_COUNT))
+
+        # input files, either listed individually or packed in an archive
+        files_element: Optional[etree.ElementBase] = from_element.find(SimulationSettingsConstants.FILES_TAG)
+        self._files: Dict[str, str] = dict(files_element.attrib) if files_element is not None else dict()
+        archive_element: Optional[etree.ElementBase] = from_element.find(SimulationSettingsConstants.ARCHIVE_TAG)
+        self._archive_path: Optional[str] = archive_element.attrib[SimulationSettingsConstants.ARCHIVE_PATH_ATTR] \
+            if archive_element is not None \
+            else None
+        self._archive_type: Optional[str] = archive_element.attrib[SimulationSettingsConstants.ARCHIVE_TYPE_ATTR] \
+            if archive_element is not None \
+            else None
+
+        times_attributes = from_element.find(SimulationSettingsConstants.SIM_TIMES_TAG).attrib
+        self._start_time: float = time_of_day_to_seconds(times_attributes[SimulationSettingsConstants.SIM_START_ATTR])
+        self._utc_offset: float = float(times_attributes.get(SimulationSettingsConstants.SIM_TIMEZONE_ATTR,
+                                                             SimulationSettingsConstants.DEFAULT_UTC_OFFSET))
+        self._evaluation_length: float = duration_to_seconds(
+            times_attributes[SimulationSettingsConstants.SIM_EVALUATION_LENGTH_ATTR])
+        self._seed_length: float = duration_to_seconds(
+            times_attributes[SimulationSettingsConstants.SIM_SEED_LENGTH_ATTR])
+        self._time_steps_per_second: int = int(times_attributes.get(
+            SimulationSettingsConstants.SIM_TIME_STEPS_ATTR, SimulationSettingsConstants.DEFAULT_TIME_STEPS_PER_SECOND))
+
+        seeding_attributes = from_element.find(SimulationSettingsConstants.SEEDING_TAG).attrib
+        self._first_seed: int = int(seeding_attributes.get(SimulationSettingsConstants.SEEDING_FIRST_SEED_ATTR,
+                                                           SimulationSettingsConstants.DEFAULT_FIRST_SEED))
+        self._seed_increment: int = int(seeding_attributes.get(SimulationSettingsConstants.SEEDING_SEED_INCREMENT_ATTR,
+                                                               SimulationSettingsConstants.DEFAULT_SEED_INCREMENT))
+
+    @property
+    def run_count(self) -> int:
+        return self._run_count
+
+    @property
+    def files(self) -> Dict[str, str]:
+        """
+        Returns the input file paths by file type, such as 'vehicle-types'. File types that were not specified use
+        the system default and are absent.
+        """
+        return self._files
+
+    @property
+    def archive_path(self) -> Optional[str]:
+        return self._archive_path
+
+    @property
+    def archive_type(self) -> Optional[str]:
+        return self._archive_type
+
+    @property
+    def start_time(self) -> float:
+        """
+        Returns the simulation start time, in seconds after midnight.
+        """
+        return self._start_time
+
+    @property
+    def utc_offset(self) -> float:
+        return self._utc_offset
+
+    @property
+    def evaluation_length(self) -> float:
+        return self._evaluation_length
+
+    @property
+    def seed_length(self) -> float:
+        return self._seed_length
+
+    @property
+    def time_steps_per_second(self) -> int:
+        return self._time_steps_per_second
+
+    @property
+    def first_seed(self) -> int:
+        return self._first_seed
+
+    @property
+    def seed_increment(self) -> int:
+        return self._seed_increment
+
+    def seed_for_run(self, run_index: int) -> int:
+        """
+        Returns the random seed of a run.
+        Args:
+            run_index: The zero-based index of the run.
+
+        Returns:
+            The seed.
+        """
+        return self._first_seed + run_index * self._seed_increment
+
+    @property
+    def seeds(self) -> List[int]:
+        """
+        Returns the random seed of every run, in run order.
+        """
+        return [self.seed_for_run(run_index) for run_index in range(self._run_count)]
+
+
+def process_file(filename) -> SimulationSettings:
+    tree: etree.ElementTree = etree.parse(filename)
+    if not XmlValidation.get_schema(XmlValidation.SIMULATION_SETTINGS_XSD).validate(tree):
+        # validation failed
+        raise RuntimeError(Localization.get_message('E0002', str(filename)))
+
+    return SimulationSettings(tree.getroot())
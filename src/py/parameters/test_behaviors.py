@@ -0,0 +1,95 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.behaviors import BehaviorConstants, Behaviors, FritzscheDefaults, HidasDefaults, process_file
+from parameters.vehicle_types import VehicleTypes
+from test_support.xml_fixtures import create_behaviors_document, create_vehicle_types_document
+
+
+class TestsForBehaviors(unittest.TestCase):
+    def setUp(self) -> None:
+        self._root: etree.ElementBase = create_behaviors_document()
+
+    def test_car_following_table(self):
+        behaviors: Behaviors = Behaviors.from_xml(self._root)
+        table = behaviors.car_following
+        self.assertEqual(table.names, ['', 'cautious'])
+        np.testing.assert_array_equal(table.standstill_distance, [1.5, FritzscheDefaults.SSD])
+        np.testing.assert_array_equal(table.desired_time_gap, [2.2, FritzscheDefaults.T_DESIRED])
+        np.testing.assert_array_equal(table.b_null, [FritzscheDefaults.B_NULL, 0.3])
+
+    def test_lane_change_table(self):
+        self._root.find(BehaviorConstants.LANE_CHANGE_TAG)[0].attrib[BehaviorConstants.HIDAS_DT_ATTR] = '4'
+        table = Behaviors.from_xml(self._root).lane_change
+        np.testing.assert_array_equal(table.lane_change_time, [4.0])
+        np.testing.assert_array_equal(table.minimum_gap, [HidasDefaults.G_MIN])
+        np.testing.assert_array_equal(table.braking_fraction, [HidasDefaults.F_BRAKING])
+
+    def test_driving_behaviors_refer_to_models_by_index(self):
+        behaviors: Behaviors = Behaviors.from_xml(self._root)
+        np.testing.assert_array_equal(behaviors.following_model, [1])
+        np.testing.assert_array_equal(behaviors.lane_change_model, [0])
+        self.assertEqual(behaviors.driving_behavior_index_of[behaviors.driving_behavior_uuids[0]], 0)
+
+    def test_unknown_model_is_rejected(self):
+        self._root.find(BehaviorConstants.DRIVING_BEHAVIORS_TAG)[0].attrib[
+            BehaviorConstants.DRIVING_BEHAVIOR_FOLLOWING_ATTR] = str(uuid())
+        self.assertRaises(KeyError, lambda: Behaviors.from_xml(self._root))
+
+    def _add_exception(self, road_behavior: etree.ElementBase, group_uuids) -> str:
+        driving_behaviors: etree.ElementBase = self._root.find(BehaviorConstants.DRIVING_BEHAVIORS_TAG)
+        driving_uuid: str = str(uuid())
+        driving_behaviors.append(etree.Element(BehaviorConstants.DRIVING_BEHAVIOR_TAG, dict(
+            driving_behaviors[0].attrib, **{BehaviorConstants.UUID_ATTR: driving_uuid})))
+        except_node: etree.ElementBase = etree.SubElement(road_behavior, BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_TAG, {
+            BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_BEHAVIOR_ATTR: driving_uuid,
+        })
+        for group_uuid in group_uuids:
+            etree.SubElement(except_node, BehaviorConstants.ROAD_BEHAVIOR_GROUP_TAG, {
+                BehaviorConstants.ROAD_BEHAVIOR_GROUP_ID_ATTR: group_uuid,
+            })
+        return driving_uuid
+
+    def test_driving_behavior_table(self):
+        trucks, buses = str(uuid()), str(uuid())
+        vehicle_types: VehicleTypes = VehicleTypes.from_xml(
+            create_vehicle_types_document(4, {trucks: [1, 2], buses: [2, 3]}))
+        road_behaviors: etree.ElementBase = self._root.find(BehaviorConstants.ROAD_BEHAVIORS_TAG)
+        road_behaviors.append(etree.Element(BehaviorConstants.ROAD_BEHAVIOR_TAG, dict(
+            road_behaviors[0].attrib, **{BehaviorConstants.UUID_ATTR: str(uuid())})))
+        # type 2 is in both groups; the first exception applies
+        self._add_exception(road_behaviors[1], [trucks])
+        self._add_exception(road_behaviors[1], [buses])
+
+        behaviors: Behaviors = Behaviors.from_xml(self._root)
+        self.assertEqual(behaviors.road_behavior_index_of[behaviors.road_behavior_uuids[1]], 1)
+        np.testing.assert_array_equal(behaviors.default_driving_behavior, [0, 0])
+        table: np.ndarray = behaviors.driving_behavior_table(vehicle_types)
+        np.testing.assert_array_equal(table, [[0, 0, 0, 0], [0, 1, 1, 2]])
+        np.testing.assert_array_equal(table[np.array([1, 0, 1]), np.array([3, 3, 0])], [2, 0, 0])
+
+    def test_unknown_driving_behavior_is_rejected(self):
+        self._root.find(BehaviorConstants.ROAD_BEHAVIORS_TAG)[0].attrib[
+            BehaviorConstants.ROAD_BEHAVIOR_DEFAULT_ATTR] = str(uuid())
+        self.assertRaises(KeyError, lambda: Behaviors.from_xml(self._root))
+
+    def test_unknown_group_is_rejected(self):
+        self._add_exception(self._root.find(BehaviorConstants.ROAD_BEHAVIORS_TAG)[0], [str(uuid())])
+        behaviors: Behaviors = Behaviors.from_xml(self._root)
+        self.assertRaises(KeyError, lambda: behaviors.driving_behavior_table(
+            VehicleTypes.from_xml(create_vehicle_types_document(1, {}))))
+
+    def test_process_file(self):
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(self._root))
+        try:
+            self.assertEqual(len(process_file(file.name).driving_behavior_uuids), 1)
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
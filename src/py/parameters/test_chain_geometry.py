@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from parameters.chain_geometry import ChainGeometry, CurveDirection, normalize_angles, parse_chain_points
+
+# US-71B going up the hill into downtown Fayetteville, Arkansas, as relative moves from the origin; the expected
+# values are those of the reference curvature calculator
+TEST_ROAD_SVG_PATH_D_ATTR = \
+    '8.98024,416.0852 11.97367,80.82229 44.9013,86.80913 59.86835,65.855223 86.80916,44.9012801' \
+    ' 89.80255,17.96051 368.1905,-14.96709 65.85521,17.9605099 80.822304,47.8947 56.874954,68.848627' \
+    ' 41.907861,89.80256 35.921024,92.79598 62.861797,74.83547 83.81572,41.90786 556.77588,200.55906' \
+    ' 89.80254,35.92102 83.81574,68.84863 59.86836,92.79597 38.91439,107.76307 11.9737,122.73018' \
+    ' 2.9935,194.5722'
+N, L, R = CurveDirection.NONE, CurveDirection.LEFT, CurveDirection.RIGHT
+
+
+class TestsForChainGeometry(unittest.TestCase):
+    def setUp(self) -> None:
+        traced: np.ndarray = np.concatenate([[[0.0, 0.0]], np.cumsum(parse_chain_points(TEST_ROAD_SVG_PATH_D_ATTR),
+                                                                     axis=0)])
+        # the traced road, followed by a short road of two segments
+        self._geometry: ChainGeometry = ChainGeometry.from_chains(
+            np.array([0, 22, 25]), np.concatenate([traced, [[0.0, 0.0], [3.0, 4.0], [3.0, 10.0]]]))
+
+    def test_normalize_angles(self):
+        np.testing.assert_allclose(normalize_angles(np.array([1.0, 2.5 * np.pi, -2.75 * np.pi]), -np.pi),
+                                   [1.0, 0.5 * np.pi, -0.75 * np.pi])
+
+    def test_stations(self):
+        np.testing.assert_array_equal(self._geometry.segment_offsets, [0, 21, 23])
+        np.testing.assert_allclose(self._geometry.start_stations[:21], [
+            0, 416.182097608123, 497.886512018319, 595.620599178567, 684.621327985146, 782.355432649405,
+            873.936423613483, 1242.43100711956, 1310.69145393917, 1404.63903034196, 1493.94129141237,
+            1593.0410825128, 1692.54693093071, 1790.28102473727, 1883.98984848882, 2475.78653409787,
+            2572.50683118329, 2680.97439372908, 2791.40678289698, 2905.98081575302, 3029.29369656651])
+        np.testing.assert_allclose(self._geometry.start_stations[21:], [0.0, 5.0])
+        np.testing.assert_allclose(self._geometry.end_stations[21:], [5.0, 11.0])
+        np.testing.assert_allclose(self._geometry.road_lengths, [3223.88892275433, 11.0])
+
+    def test_headings(self):
+        np.testing.assert_allclose(self._geometry.headings[:21], [
+            1.54921698194064, 1.42371800279527, 1.09345070938403, 0.832981553880689, 0.477345295535278,
+            0.197395559849881, 6.24255727897746, 0.266252022040169, 0.534955085995623, 0.880349858854901,
+            1.1341691700294, 1.20146267395843, 0.872136484837374, 0.463647609000806, 0.345745958245118,
+            0.380506415510787, 0.687671159355454, 0.997830242815741, 1.22425788878, 1.47354293562357,
+            1.55541250604815], atol=1e-9)
+
+    def test_curves(self):
+        np.testing.assert_array_equal(self._geometry.curve_directions, [
+            N, R, R, R, R, R, N, L, L, L, L, N, R, R, N, L, L, L, L, L, N, N, N])
+        np.testing.assert_allclose(self._geometry.radii, [
+            np.nan, -359.313437054307, -332.094850665902, -290.059505692255, -308.83810199612,
+            -354.602967677873, np.nan, 238.007621070108, 307.174660888635, 299.18236823135,
+            617.890719026329, np.nan, -266.436700853822, -357.072707004857, np.nan,
+            566.429074630607, 352.811079353781, 412.847694649707, 482.831626782096, 745.596471946969,
+            np.nan, np.nan, np.nan])
+
+    def test_deflections_stop_at_road_ends(self):
+        self.assertEqual(self._geometry.start_deflections[21], 0.0)
+        self.assertEqual(self._geometry.end_deflections[20], 0.0)
+        self.assertAlmostEqual(self._geometry.end_deflections[21], np.arctan2(3.0, 4.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
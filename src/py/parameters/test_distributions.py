@@ -0,0 +1,258 @@
+import unittest
+import logging
+from simulator.SimulatorLoggerWrapper import SimulatorLoggerWrapper
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from statistics import NormalDist
+from parameters.distributions import DistributionConstants, AggressionTrend, NormalDistributionTruncatable, \
+    InverseCdfTable, EmpiricalDistribution, RawEmpiricalDistribution, BinnedDistribution, ThingDistribution, \
+    PoissonDistribution, ZeroTruncatedPoissonDistribution, SpeedDependentNormalDistribution, distribution_from_xml
+from parameters.units import AccelerationUnits, SpeedUnits
+
+
+class TestsForNormalDistribution(unittest.TestCase):
+    def test_values_match_inverse_cdf(self):
+        distribution = NormalDistributionTruncatable('', str(uuid()), 10.0, 2.0)
+        t: np.ndarray = np.linspace(0.001, 0.999, 101)
+        self.assertEqual(distribution.value(0.0), -np.inf)
+        expected = [NormalDist(10.0, 2.0).inv_cdf(p) for p in t]
+        np.testing.assert_allclose(distribution.values(t), expected, rtol=1e-8)
+        self.assertAlmostEqual(distribution.value(0.5), 10.0)
+
+    def test_reverse_and_limits(self):
+        distribution = NormalDistributionTruncatable('', str(uuid()), 10.0, 2.0, reverse=True,
+                                                     min_value=9.0, max_value=12.0)
+        self.assertGreater(distribution.value(0.3), 10.0)
+        self.assertAlmostEqual(distribution.value(0.0), 12.0)
+        self.assertAlmostEqual(distribution.value(1.0), 9.0)
+
+    def test_truncation_is_not_clamping(self):
+        distribution = NormalDistributionTruncatable('', str(uuid()), 0.5, 1.0, min_value=0.0, max_value=1.0)
+        draws: np.ndarray = distribution.sample(100000, np.random.default_rng(11))
+        self.assertTrue(np.all((draws >= 0.0) & (draws <= 1.0)))
+        # nearly uniform, since the bounds cut off all but the flat top of the curve
+        self.assertLess(np.mean(draws < 0.01), 0.02)
+        self.assertAlmostEqual(draws.mean(), 0.5, places=2)
+
+    def test_truncation_far_in_the_tail(self):
+        distribution = NormalDistributionTruncatable('', str(uuid()), 0.0, 1.0, min_value=8.0, max_value=9.0)
+        draws: np.ndarray = distribution.values(np.linspace(0.0, 1.0, 1001))
+        self.assertTrue(np.all(np.diff(draws) >= 0.0))
+        self.assertAlmostEqual(draws[0], 8.0)
+        self.assertAlmostEqual(draws[-1], 9.0)
+        self.assertLess(np.median(draws), 8.2)
+
+    def test_parameter_range(self):
+        distribution = NormalDistributionTruncatable('', str(uuid()), 10.0, 2.0)
+        self.assertRaises(ValueError, lambda: distribution.values(np.array([0.5, 1.5])))
+
+
+class TestsForEmpiricalDistributions(unittest.TestCase):
+    def test_empirical_interpolation(self):
+        distribution = EmpiricalDistribution('', str(uuid()), [(0.75, 30.0), (0.25, 10.0), (0.5, 10.0)])
+        np.testing.assert_allclose(distribution.values(np.array([0.0, 0.3, 0.5, 0.625, 0.9, 1.0])),
+                                   [10.0, 10.0, 10.0, 20.0, 30.0, 30.0])
+
+    def test_empirical_vertical_line(self):
+        distribution = EmpiricalDistribution('', str(uuid()), [(0.0, 0.0), (0.5, 1.0), (0.5, 3.0), (1.0, 4.0)])
+        self.assertAlmostEqual(distribution.value(0.25), 0.5)
+        self.assertAlmostEqual(distribution.value(0.75), 3.5)
+        self.assertAlmostEqual(distribution.value(0.5), 2.0)
+
+    def test_empirical_bad_data_point(self):
+        self.assertRaises(ValueError, lambda: EmpiricalDistribution('', str(uuid()), [(1.5, 0.0)]))
+
+    def test_raw_empirical(self):
+        distribution = RawEmpiricalDistribution('', str(uuid()), [4.0, 1.0, 3.0, 2.0])
+        np.testing.assert_allclose(distribution.values(np.array([0.0, 0.125, 0.25, 0.5, 0.875, 1.0])),
+                                   [1.0, 1.0, 1.5, 2.5, 4.0, 4.0])
+        reversed_distribution = RawEmpiricalDistribution('', str(uuid()), [4.0, 1.0, 3.0, 2.0],
+                                                         AggressionTrend.NEGATIVE)
+        self.assertAlmostEqual(reversed_distribution.value(0.0), 4.0)
+        self.assertAlmostEqual(RawEmpiricalDistribution('', str(uuid()), [7.0]).value(0.5), 7.0)
+
+    def test_binned(self):
+        distribution = BinnedDistribution('', str(uuid()), [(10.0, 20.0, 1), (0.0, 10.0, 1), (25.0, 30.0, 2)],
+                                          table_resolution=None)
+        np.testing.assert_allclose(distribution.values(np.array([0.0, 0.25, 0.5, 0.75, 1.0])),
+                                   [0.0, 10.0, 22.5, 27.5, 30.0])
+        self.assertRaises(ValueError, lambda: BinnedDistribution('', str(uuid()), [(0.0, 1.0, 0)]))
+
+
+class TestsForInverseCdfTables(unittest.TestCase):
+    def test_table_matches_exact_values(self):
+        rng: np.random.Generator = np.random.default_rng(3)
+        distribution = EmpiricalDistribution('', str(uuid()), list(zip(np.sort(rng.random(25)),
+                                                                        np.sort(rng.random(25) * 100.0))))
+        self.assertIsNotNone(distribution.table)
+        t: np.ndarray = np.concatenate([rng.random(10000), [0.0, 1.0]])
+        np.testing.assert_allclose(distribution.values(t), distribution.exact_values(t),
+                                   atol=InverseCdfTable.DEFAULT_TOLERANCE * 100.0)
+
+    def test_raw_empirical_table(self):
+        rng: np.random.Generator = np.random.default_rng(3)
+        distribution = RawEmpiricalDistribution('', str(uuid()), rng.normal(30.0, 5.0, 500), AggressionTrend.NEGATIVE)
+        value_range: float = float(np.ptp(distribution.exact_values(np.array([0.0, 1.0]))))
+        self.assertLessEqual(distribution.table.max_error, InverseCdfTable.DEFAULT_TOLERANCE * value_range)
+        t: np.ndarray = rng.random(10000)
+        np.testing.assert_allclose(distribution.values(t), distribution.exact_values(t),
+                                   atol=InverseCdfTable.DEFAULT_TOLERANCE * value_range)
+
+    def test_resolution_is_configurable(self):
+        distribution = EmpiricalDistribution('', str(uuid()), [(0.0, 0.0), (0.3, 1.0), (1.0, 2.0)],
+                                             table_resolution=10)
+        self.assertEqual(distribution.table.resolution, 10)
+        self.assertIsNone(EmpiricalDistribution('', str(uuid()), [(0.0, 0.0)], table_resolution=None).table)
+
+    def test_jump_falls_back_to_exact_values(self):
+        with self.assertLogs(SimulatorLoggerWrapper.logger(), logging.WARNING):
+            distribution = EmpiricalDistribution('', str(uuid()), [(0.0, 0.0), (0.3, 1.0), (0.3, 5.0), (1.0, 6.0)])
+        self.assertIsNone(distribution.table)
+        self.assertAlmostEqual(distribution.value(0.3), 3.0)
+
+
+class TestsForThingDistribution(unittest.TestCase):
+    def test_shares(self):
+        distribution = ThingDistribution('', str(uuid()), [(3.0, 'c'), (1.0, 'a'), (0.0, 'z'), (4.0, 'b')])
+        self.assertListEqual(list(distribution.things), ['a', 'b', 'c'])
+        self.assertListEqual(list(distribution.things[distribution.exact_indices(
+            np.array([0.0, 0.125, 0.2, 0.625, 0.7, 1.0]))]), ['a', 'a', 'b', 'b', 'c', 'c'])
+
+    def test_alias_table_frequencies(self):
+        occurrences: np.ndarray = np.random.default_rng(5).random(300) ** 3
+        distribution = ThingDistribution('', str(uuid()), list(zip(occurrences, range(300))))
+        parameters: np.ndarray = np.linspace(0.0, 1.0, 3000001)
+        frequencies: np.ndarray = np.bincount(distribution.indices(parameters), minlength=300) / len(parameters)
+        np.testing.assert_allclose(frequencies, occurrences / occurrences.sum(), atol=1e-5)
+
+        draws: np.ndarray = distribution.sample(1000, np.random.default_rng(5))
+        self.assertTrue(set(draws).issubset(set(range(300))))
+
+    def test_zero_total(self):
+        self.assertRaises(ValueError, lambda: ThingDistribution('', str(uuid()), [(0.0, 'a')]))
+
+
+class TestsForPoissonDistributions(unittest.TestCase):
+    def test_poisson_frequencies(self):
+        distribution = PoissonDistribution('', str(uuid()), 2.0)
+        draws: np.ndarray = distribution.sample(200000, np.random.default_rng(7))
+        self.assertAlmostEqual(np.mean(draws == 0), np.exp(-2.0), places=2)
+        self.assertAlmostEqual(draws.mean(), 2.0, places=1)
+
+    def test_zero_truncated_poisson(self):
+        distribution = ZeroTruncatedPoissonDistribution('', str(uuid()), 0.5)
+        draws: np.ndarray = distribution.sample(200000, np.random.default_rng(7))
+        self.assertEqual(draws.min(), 1)
+        self.assertAlmostEqual(draws.mean(), 0.5 / (1.0 - np.exp(-0.5)), places=2)
+        self.assertEqual(distribution.value(0.0), 1)
+        self.assertEqual(distribution.value(1.0), distribution.values(np.array([1.0]))[0])
+
+    def test_tables_are_shared_per_lambda(self):
+        first = ZeroTruncatedPoissonDistribution('', str(uuid()), 1.3)
+        second = ZeroTruncatedPoissonDistribution('', str(uuid()), 1.3)
+        self.assertIs(first._cumulative_probabilities, second._cumulative_probabilities)
+        self.assertIsNot(first._cumulative_probabilities,
+                         PoissonDistribution('', str(uuid()), 1.3)._cumulative_probabilities)
+
+    def test_large_lambda(self):
+        distribution = PoissonDistribution('', str(uuid()), 1000.0)
+        draws: np.ndarray = distribution.sample(100000, np.random.default_rng(7))
+        self.assertAlmostEqual(draws.mean() / 1000.0, 1.0, places=2)
+        self.assertAlmostEqual(draws.std() / np.sqrt(1000.0), 1.0, places=1)
+
+
+class TestsForSpeedDependentDistribution(unittest.TestCase):
+    def test_interpolation_between_speeds(self):
+        distribution = SpeedDependentNormalDistribution('', str(uuid()), [(30.0, 0.5, 0.1), (0.0, 2.5, 0.5)])
+        t: np.ndarray = np.array([0.5, 0.5, 0.5, 0.5, NormalDist().cdf(1.0)])
+        speeds: np.ndarray = np.array([-1.0, 0.0, 15.0, 40.0, 15.0])
+        np.testing.assert_allclose(distribution.values(t, speeds), [2.5, 2.5, 1.5, 0.5, 1.8], rtol=1e-8)
+        self.assertAlmostEqual(distribution.value(NormalDist().cdf(-2.0), 30.0), 0.3)
+        self.assertRaises(ValueError, lambda: distribution.values(np.array([1.5]), np.array([0.0])))
+
+
+class TestsForXml(unittest.TestCase):
+    def test_distribution_from_xml(self):
+        distribution_element: etree.ElementBase = etree.Element('distribution', {
+            DistributionConstants.UUID_ATTR: str(uuid()),
+            DistributionConstants.NAME_ATTR: 'speeds',
+        })
+        empirical_element: etree.ElementBase = etree.SubElement(distribution_element,
+                                                               DistributionConstants.EMPIRICAL_TAG)
+        for prob, val in (('0.0', '50'), ('1.0', '70')):
+            etree.SubElement(empirical_element, DistributionConstants.DATAPOINT_TAG, {
+                DistributionConstants.EMPIRICAL_PROB_ATTR: prob,
+                DistributionConstants.EMPIRICAL_VALUE_ATTR: val,
+            })
+
+        distribution = distribution_from_xml(distribution_element)
+        self.assertIsInstance(distribution, EmpiricalDistribution)
+        self.assertEqual(distribution.name, 'speeds')
+        self.assertAlmostEqual(distribution.value(0.5), 60.0)
+
+    def test_units_are_converted(self):
+        distribution_element: etree.ElementBase = etree.Element('distribution', {
+            DistributionConstants.UUID_ATTR: str(uuid()),
+            DistributionConstants.UNITS_ATTR: 'feet-per-second-squared',
+        })
+        empirical_element: etree.ElementBase = etree.SubElement(distribution_element,
+                                                               DistributionConstants.EMPIRICAL_TAG)
+        for prob, val in (('0', '20'), ('1.0', '22.5')):
+            etree.SubElement(empirical_element, DistributionConstants.DATAPOINT_TAG, {
+                DistributionConstants.EMPIRICAL_PROB_ATTR: prob,
+                DistributionConstants.EMPIRICAL_VALUE_ATTR: val,
+            })
+        self.assertAlmostEqual(distribution_from_xml(distribution_element).value(0.0),
+                               AccelerationUnits.FEET_PER_SECOND_SQUARED.convert_to_base_units(20.0))
+
+        distribution_element = etree.Element('distribution', {
+            DistributionConstants.UUID_ATTR: str(uuid()),
+            DistributionConstants.UNITS_ATTR: 'miles-per-hour',
+        })
+        etree.SubElement(distribution_element, DistributionConstants.NORMAL_TAG, {
+            DistributionConstants.NORMAL_MEAN_ATTR: '0',
+            DistributionConstants.NORMAL_STANDARD_DEVIATION_ATTR: '5',
+            DistributionConstants.NORMAL_MAX_VALUE_ATTR: '5',
+        })
+        distribution = distribution_from_xml(distribution_element)
+        self.assertAlmostEqual(distribution.standard_deviation, SpeedUnits.MILES_PER_HOUR.convert_to_base_units(5.0))
+        self.assertAlmostEqual(distribution.value(1.0), SpeedUnits.MILES_PER_HOUR.convert_to_base_units(5.0))
+
+    def test_acceleration_distribution_from_xml(self):
+        distribution_element: etree.ElementBase = etree.Element('distribution', {
+            DistributionConstants.UUID_ATTR: str(uuid()),
+            DistributionConstants.SPEED_UNIT_ATTR: 'kilometers-per-hour',
+            DistributionConstants.ACCELERATION_UNIT_ATTR: 'feet-per-second-squared',
+        })
+        for velocity, mean in (('0', '10'), ('36', '2')):
+            etree.SubElement(distribution_element, DistributionConstants.DATAPOINT_TAG, {
+                DistributionConstants.DATAPOINT_VELOCITY_ATTR: velocity,
+                DistributionConstants.NORMAL_MEAN_ATTR: mean,
+                DistributionConstants.NORMAL_STANDARD_DEVIATION_ATTR: '1',
+            })
+
+        distribution = distribution_from_xml(distribution_element)
+        self.assertIsInstance(distribution, SpeedDependentNormalDistribution)
+        # 36 km/h is 10 m/s, so 5 m/s is halfway between the data points
+        self.assertAlmostEqual(distribution.value(0.5, 5.0),
+                               AccelerationUnits.FEET_PER_SECOND_SQUARED.convert_to_base_units(6.0))
+
+    def test_thing_distribution_from_xml(self):
+        distribution_element: etree.ElementBase = etree.Element('distribution', {
+            DistributionConstants.UUID_ATTR: str(uuid()),
+        })
+        for occurrence, color in (('1', '#ff0000'), ('1', '#00ff00')):
+            etree.SubElement(distribution_element, DistributionConstants.SHARE_TAG, {
+                DistributionConstants.SHARE_OCCURRENCE_ATTR: occurrence,
+                DistributionConstants.SHARE_VALUE_ATTR: color,
+            })
+
+        distribution = ThingDistribution.from_xml(distribution_element, lambda text: int(text[1:], 16))
+        self.assertListEqual(list(distribution.things), [0x00ff00, 0xff0000])
+        self.assertEqual(distribution.value(0.25), 0x00ff00)
+        self.assertEqual(distribution.value(0.75), 0xff0000)
+
+
+if __name__ == '__main__':
+    unittest.main()
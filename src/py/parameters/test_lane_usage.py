@@ -0,0 +1,47 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.lane_usage import LaneUsageConstants, LaneUsage, process_file
+from parameters.vehicle_types import VehicleTypes
+from test_support.xml_fixtures import create_lane_usage_document, create_vehicle_types_document
+
+
+class TestsForLaneUsage(unittest.TestCase):
+    def setUp(self) -> None:
+        self._trucks: str = str(uuid())
+        self._vehicle_types: VehicleTypes = VehicleTypes.from_xml(
+            create_vehicle_types_document(3, {self._trucks: [1, 2]}))
+        self._root: etree.ElementBase = create_lane_usage_document([
+            (str(uuid()), LaneUsageConstants.POLICY_ALL_ALLOWED, [self._trucks]),
+            (str(uuid()), LaneUsageConstants.POLICY_NONE_ALLOWED, [self._trucks]),
+            (str(uuid()), LaneUsageConstants.POLICY_NONE_ALLOWED, []),
+        ])
+
+    def test_allowed_types(self):
+        lane_usage: LaneUsage = LaneUsage.from_xml(self._root)
+        np.testing.assert_array_equal(lane_usage.starts_all_allowed, [True, False, False])
+        np.testing.assert_array_equal(lane_usage.allowed_types(self._vehicle_types), [
+            [True, False, False],
+            [False, True, True],
+            [False, False, False],
+        ])
+
+    def test_unknown_group_is_rejected(self):
+        lane_usage: LaneUsage = LaneUsage.from_xml(create_lane_usage_document([
+            (str(uuid()), LaneUsageConstants.POLICY_ALL_ALLOWED, [str(uuid())])]))
+        self.assertRaises(KeyError, lambda: lane_usage.allowed_types(self._vehicle_types))
+
+    def test_process_file(self):
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(self._root))
+        try:
+            self.assertEqual(len(process_file(file.name).uuids), 3)
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+from lxml import etree
+import numpy as np
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+import os
+from unittest import mock
+from parameters.road_network import NetworkConstants, RoadConstants, VehicleEntryConstants, PocketSide, RoadNetwork, \
+    _NetworkReader, process_file
+from parameters.units import LengthUnits, SpeedUnits
+from test_support.xml_fixtures import create_road_node
+from simulatedobjects.vehicle_entry_schedule import VehicleEntrySchedule
+
+
+class TestsForRoadNetwork(unittest.TestCase):
+    def setUp(self) -> None:
+        self._policy_id: str = str(uuid())
+        self._root: etree.ElementBase = etree.Element(NetworkConstants.ROOT_TAG, {
+            NetworkConstants.VERSION_ATTR: '1',
+            NetworkConstants.LAYOUT_UNITS_ATTR: 'feet',
+            NetworkConstants.SPEED_UNITS_ATTR: 'miles-per-hour',
+        })
+        roads_node: etree.ElementBase = etree.SubElement(self._root, RoadConstants.COLLECTION_TAG)
+        self._first_road: etree.ElementBase = create_road_node(2, self._policy_id)
+        self._second_road: etree.ElementBase = create_road_node(1, self._policy_id)
+        roads_node.append(self._first_road)
+        roads_node.append(self._second_road)
+
+    def _process(self) -> RoadNetwork:
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(self._root))
+        try:
+            return process_file(file.name)
+        finally:
+            os.remove(file.name)
+
+    def test_road_records(self):
+        network: RoadNetwork = self._process()
+        self.assertEqual(network.road_count, 2)
+        self.assertEqual(network.roads.uuids[1], self._second_road.attrib[RoadConstants.UUID_ATTR])
+        self.assertEqual(network.road_index_of[self._second_road.attrib[RoadConstants.UUID_ATTR]], 1)
+        self.assertEqual(network.roads.names, ['', ''])
+        self.assertEqual(len(network.behavior_uuids), 2)
+        self.assertAlmostEqual(network.roads.speed_limits[0], SpeedUnits.MILES_PER_HOUR.convert_to_base_units(35))
+
+    def test_chains_are_packed_in_meters(self):
+        network: RoadNetwork = self._process()
+        np.testing.assert_array_equal(network.roads.chain_offsets, [0, 4, 8])
+        np.testing.assert_allclose(network.chain_geometry.road_lengths, network.chain_geometry.road_lengths[0])
+        self.assertEqual(network.roads.chain_points.shape, (8, 2))
+        self.assertAlmostEqual(network.roads.chain_points[5, 1], LengthUnits.FEET.convert_to_base_units(49.5))
+
+    def test_lane_records(self):
+        lane_element: etree.ElementBase = self._first_road.find(RoadConstants.LANES_COLLECTION_TAG)[1]
+        lane_element.attrib[RoadConstants.LANE_MAY_MOVE_LEFT_ATTR] = 'false'
+        exception_policy: str = str(uuid())
+        etree.SubElement(lane_element.find(RoadConstants.LANE_POLICY_TAG), RoadConstants.LANE_POLICY_EXCEPT_TAG, {
+            RoadConstants.LANE_POLICY_EXCEPT_POLICY_ATTR: exception_policy,
+            RoadConstants.LANE_POLICY_EXCEPT_START_ATTR: '07:00:00',
+            RoadConstants.LANE_POLICY_EXCEPT_END_ATTR: '09:30:00',
+        })
+
+        network: RoadNetwork = self._process()
+        np.testing.assert_array_equal(network.lanes.road_offsets, [0, 2, 3])
+        np.testing.assert_array_equal(network.lanes.ordinals, [0, 1, 0])
+        np.testing.assert_array_equal(network.lanes.may_move_left, [True, False, True])
+        self.assertTrue(network.lanes.may_move_right.all())
+        self.assertAlmostEqual(network.lanes.widths[2], LengthUnits.FEET.convert_to_base_units(12))
+        self.assertEqual(network.policy_uuids, [self._policy_id, exception_policy])
+        np.testing.assert_array_equal(network.lanes.policies, [0, 0, 0])
+        np.testing.assert_array_equal(network.lanes.exception_offsets, [0, 0, 1, 1])
+        np.testing.assert_array_equal(network.lanes.exception_policies, [1])
+        self.assertEqual(network.lanes.exception_starts[0], 7 * 3600)
+        self.assertEqual(network.lanes.exception_ends[0], 9.5 * 3600)
+
+    def test_adjacent_lanes(self):
+        # lanes listed out of ordinal order still pair up by ordinal
+        self._first_road.find(RoadConstants.LANES_COLLECTION_TAG)[0].attrib[RoadConstants.LANE_ORDINAL_ATTR] = '2'
+        left, right = self._process().adjacent_lanes()
+        np.testing.assert_array_equal(left, [RoadNetwork.NO_LANE, 0, RoadNetwork.NO_LANE])
+        np.testing.assert_array_equal(right, [1, RoadNetwork.NO_LANE, RoadNetwork.NO_LANE])
+        self._first_road.find(RoadConstants.LANES_COLLECTION_TAG)[0].attrib[RoadConstants.LANE_ORDINAL_ATTR] = '0'
+        left, right = self._process().adjacent_lanes()
+        np.testing.assert_array_equal(left, [1, RoadNetwork.NO_LANE, RoadNetwork.NO_LANE])
+        np.testing.assert_array_equal(right, [RoadNetwork.NO_LANE, 0, RoadNetwork.NO_LANE])
+
+    def test_pocket_records(self):
+        pockets_node: etree.ElementBase = self._second_road.find(RoadConstants.POCKETS_COLLECTION_TAG)
+        etree.SubElement(pockets_node, RoadConstants.POCKET_TAG, {
+            RoadConstants.POCKET_SIDE_ATTR: 'right',
+            RoadConstants.POCKET_START_ORD_ATTR: '100',
+            RoadConstants.POCKET_END_ORD_ATTR: 'b',
+            RoadConstants.POCKET_START_TAPER_ATTR: '50',
+            RoadConstants.POCKET_LANE_COUNT_ATTR: '2',
+        })
+
+        network: RoadNetwork = self._process()
+        np.testing.assert_array_equal(network.pockets.road_offsets, [0, 0, 1])
+        self.assertEqual(network.pockets.sides[0], PocketSide.RIGHT)
+        self.assertAlmostEqual(network.pockets.start_ordinates[0], LengthUnits.FEET.convert_to_base_units(100))
+        self.assertEqual(network.pockets.end_ordinates[0], np.inf)
+        self.assertAlmostEqual(network.pockets.start_tapers[0], LengthUnits.FEET.convert_to_base_units(50))
+        self.assertTrue(np.isnan(network.pockets.end_tapers[0]))
+        self.assertEqual(network.pockets.lane_counts[0], 2)
+
+    def test_entry_intervals(self):
+        vehicle_type: str = str(uuid())
+        entry_node: etree.ElementBase = etree.SubElement(self._second_road, VehicleEntryConstants.ENTRY_TAG)
+        interval_node: etree.ElementBase = etree.SubElement(entry_node, VehicleEntryConstants.INTERVAL_TAG, {
+            VehicleEntryConstants.INTERVAL_START_ATTR: '13:00:00',
+            VehicleEntryConstants.INTERVAL_END_ATTR: '13:15:00',
+        })
+        etree.SubElement(interval_node, VehicleEntryConstants.VEHICLE_TAG, {
+            VehicleEntryConstants.VEHICLE_TYPE_ATTR: vehicle_type,
+            VehicleEntryConstants.VEHICLE_COUNT_ATTR: '340',
+        })
+
+        intervals = self._process().entry_intervals({vehicle_type: 4})
+        self.assertEqual(len(intervals), 1)
+        self.assertEqual(intervals[0].road, 1)
+        self.assertEqual(intervals[0].vehicle_type, 4)
+        self.assertEqual(intervals[0].count, 340)
+        self.assertEqual(intervals[0].end - intervals[0].start, 900)
+        self.assertEqual(intervals[0].congestion_bypassing_fraction, VehicleEntryConstants.DEFAULT_BYPASS_FRACTION)
+
+        schedule: VehicleEntrySchedule = VehicleEntrySchedule.from_intervals(intervals, np.random.default_rng(1))
+        self.assertEqual(len(schedule), 340)
+        self.assertTrue(np.all((schedule.times >= 46800.0) & (schedule.times <= 47700.0)))
+        self.assertTrue(np.all(schedule.roads == 1))
+
+    def test_invalid_file_is_rejected(self):
+        del self._second_road.attrib[RoadConstants.BEHAVIOR_ATTR]
+        with self.assertRaises(RuntimeError):
+            self._process()
+
+    def test_reader_errors_in_valid_files_are_not_validation_failures(self):
+        with mock.patch.object(_NetworkReader, 'read_road', side_effect=KeyError('road')):
+            with self.assertRaises(KeyError):
+                self._process()
+
+
+if __name__ == '__main__':
+    unittest.main()
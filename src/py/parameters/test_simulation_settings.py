@@ -0,0 +1,60 @@
+import unittest
+import os
+from lxml import etree
+from tempfile import NamedTemporaryFile
+from parameters.simulation_settings import SimulationSettings, SimulationSettingsConstants, process_file
+
+
+class TestsForSimulationSettings(unittest.TestCase):
+    def setUp(self) -> None:
+        self._root: etree.ElementBase = etree.Element(SimulationSettingsConstants.ROOT_TAG, {
+            SimulationSettingsConstants.VERSION_ATTR: '1',
+            SimulationSettingsConstants.RUN_COUNT_ATTR: '10',
+        })
+        etree.SubElement(self._root, SimulationSettingsConstants.FILES_TAG, {'vehicle-types': 'types.xml'})
+        self._times: etree.ElementBase = etree.SubElement(self._root, SimulationSettingsConstants.SIM_TIMES_TAG, {
+            SimulationSettingsConstants.SIM_START_ATTR: '17:30:21',
+            SimulationSettingsConstants.SIM_TIMEZONE_ATTR: '-5',
+            SimulationSettingsConstants.SIM_EVALUATION_LENGTH_ATTR: 'PT1H',
+            SimulationSettingsConstants.SIM_SEED_LENGTH_ATTR: 'PT15M',
+        })
+        self._seeding: etree.ElementBase = etree.SubElement(self._root, SimulationSettingsConstants.SEEDING_TAG, {
+            SimulationSettingsConstants.SEEDING_FIRST_SEED_ATTR: '66',
+            SimulationSettingsConstants.SEEDING_SEED_INCREMENT_ATTR: '100',
+        })
+
+    def test_values(self):
+        settings: SimulationSettings = SimulationSettings(self._root)
+        self.assertEqual(settings.run_count, 10)
+        self.assertEqual(settings.files, {'vehicle-types': 'types.xml'})
+        self.assertIsNone(settings.archive_path)
+        self.assertEqual(settings.start_time, 17 * 3600 + 30 * 60 + 21)
+        self.assertEqual(settings.utc_offset, -5)
+        self.assertEqual(settings.evaluation_length, 3600)
+        self.assertEqual(settings.seed_length, 900)
+        self.assertEqual(settings.time_steps_per_second, SimulationSettingsConstants.DEFAULT_TIME_STEPS_PER_SECOND)
+        self.assertEqual(settings.seeds[:3], [66, 166, 266])
+        self.assertEqual(len(settings.seeds), 10)
+
+    def test_seeding_defaults(self):
+        del self._root.attrib[SimulationSettingsConstants.RUN_COUNT_ATTR]
+        self._seeding.attrib.clear()
+        settings: SimulationSettings = SimulationSettings(self._root)
+        self.assertEqual(settings.seeds, [SimulationSettingsConstants.DEFAULT_FIRST_SEED])
+        self.assertEqual(settings.seed_for_run(2), 73130)
+
+    def test_process_file(self):
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(self._root))
+        try:
+            self.assertEqual(process_file(file.name).run_count, 10)
+            del self._times.attrib[SimulationSettingsConstants.SIM_START_ATTR]
+            with open(file.name, 'wb') as invalid_file:
+                invalid_file.write(etree.tostring(self._root))
+            self.assertRaises(RuntimeError, lambda: process_file(file.name))
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.vehicle_types import VehicleTypeConstants, VehicleTypes, process_file
+from test_support.xml_fixtures import create_vehicle_types_document
+
+
+class TestsForVehicleTypes(unittest.TestCase):
+    def setUp(self) -> None:
+        self._group: str = str(uuid())
+        self._root: etree.ElementBase = create_vehicle_types_document(3, {self._group: [2, 0]})
+
+    def test_types_and_groups(self):
+        self._root.find(VehicleTypeConstants.TYPES_TAG)[1].attrib[VehicleTypeConstants.TYPE_SHARING_ATTR] = 'hov'
+        vehicle_types: VehicleTypes = VehicleTypes.from_xml(self._root)
+        self.assertEqual(vehicle_types.count, 3)
+        self.assertEqual(vehicle_types.index_of[vehicle_types.uuids[2]], 2)
+        self.assertEqual(vehicle_types.sharing, ['none', 'hov', 'none'])
+        np.testing.assert_array_equal(vehicle_types.group_members[self._group], [2, 0])
+
+    def test_unknown_member_is_rejected(self):
+        etree.SubElement(self._root.find(VehicleTypeConstants.GROUPS_TAG)[0], VehicleTypeConstants.GROUP_VEHICLE_TAG,
+                         {VehicleTypeConstants.GROUP_VEHICLE_TYPE_ATTR: str(uuid())})
+        self.assertRaises(KeyError, lambda: VehicleTypes.from_xml(self._root))
+
+    def test_process_file(self):
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(self._root))
+        try:
+            self.assertEqual(process_file(file.name).count, 3)
+        finally:
+            os.remove(file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
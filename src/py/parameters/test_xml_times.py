@@ -0,0 +1,23 @@
+import unittest
+from parameters.xml_times import time_of_day_to_seconds, duration_to_seconds
+
+
+class TestsForXmlTimes(unittest.TestCase):
+    def test_time_of_day(self):
+        self.assertEqual(time_of_day_to_seconds('00:00:00'), 0)
+        self.assertEqual(time_of_day_to_seconds('13:15:00'), 47700)
+        self.assertAlmostEqual(time_of_day_to_seconds('07:30:15.5Z'), 27015.5)
+        self.assertEqual(time_of_day_to_seconds('07:30:15-05:00'), 27015)
+        self.assertRaises(ValueError, lambda: time_of_day_to_seconds('7:30'))
+
+    def test_duration(self):
+        self.assertEqual(duration_to_seconds('PT1H'), 3600)
+        self.assertEqual(duration_to_seconds('PT15M'), 900)
+        self.assertAlmostEqual(duration_to_seconds('PT1H30M2.5S'), 5402.5)
+        self.assertEqual(duration_to_seconds('P1DT2H'), 93600)
+        self.assertRaises(ValueError, lambda: duration_to_seconds('P1M'))
+        self.assertRaises(ValueError, lambda: duration_to_seconds('PT'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,8 +47,8 @@ class LengthUnits:
 
 
 class DistanceUnits(LengthUnits):
-    KILOMETERS = Unit('kilometers', 0.001)
-    MILES = Unit('miles', 1.0 / 1609.344)
+    KILOMETERS = Unit('kilometers', 1000.0)
+    MILES = Unit('miles', 1609.344)
 
     DICTIONARY = {
         LengthUnits.METRES.name: LengthUnits.METRES,
@@ -57,3 +57,29 @@ class DistanceUnits(LengthUnits):
         KILOMETERS.name: KILOMETERS,
         MILES.name: MILES
     }
+
+
+class SpeedUnits:
+    METERS_PER_SECOND = Unit('meters-per-second', 1.0)
+    KILOMETERS_PER_HOUR = Unit('kilometers-per-hour', 1.0 / 3.6)
+    FEET_PER_SECOND = Unit('feet-per-second', 0.3048)
+    MILES_PER_HOUR = Unit('miles-per-hour', 0.44704)
+
+    DICTIONARY = {
+        METERS_PER_SECOND.name: METERS_PER_SECOND,
+        KILOMETERS_PER_HOUR.name: KILOMETERS_PER_HOUR,
+        FEET_PER_SECOND.name: FEET_PER_SECOND,
+        MILES_PER_HOUR.name: MILES_PER_HOUR,
+    }
+
+
+class AccelerationUnits:
+    METERS_PER_SECOND_SQUARED = Unit('meters-per-second-squared', 1.0)
+    FEET_PER_SECOND_SQUARED = Unit('feet-per-second-squared', 0.3048)
+    G = Unit('g', 9.80665)
+
+    DICTIONARY = {
+        METERS_PER_SECOND_SQUARED.name: METERS_PER_SECOND_SQUARED,
+        FEET_PER_SECOND_SQUARED.name: FEET_PER_SECOND_SQUARED,
+        G.name: G,
+    }
@@ -154,7 +154,7 @@ class VehicleModelCollection:
 
 def process_file(filename) -> None:
     tree: etree.ElementTree = etree.parse(filename)
-    xsd_tree: etree.XMLSchema = etree.XMLSchema(etree.parse(XmlValidation.VEHICLE_MODELS_XSD))
+    xsd_tree: etree.XMLSchema = XmlValidation.get_schema(XmlValidation.VEHICLE_MODELS_XSD)
     if not xsd_tree.validate(tree):
         # validation failed
         raise RuntimeError(Localization.get_message('E0002', filename))
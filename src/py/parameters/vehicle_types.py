@@ -0,0 +1,115 @@
+from lxml import etree
+import numpy as np
+from typing import Dict, List
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+# part of the key of cached files; increase it whenever the way files are read changes
+LOADER_VERSION: int = 1
+
+
+class VehicleTypeConstants:
+    ROOT_TAG = 'vehicle-types-and-groups'
+    VERSION_ATTR = 'version'
+    NAME_ATTR = 'name'
+    UUID_ATTR = 'uuid'
+    TYPES_TAG = 'types'
+    TYPE_TAG = 'vehicle-type'
+    TYPE_MODELS_ATTR = 'models'
+    TYPE_COLORS_ATTR = 'colors'
+    TYPE_ACCELERATION_ATTR = 'acceleration'
+    TYPE_DECELERATION_ATTR = 'deceleration'
+    TYPE_OCCUPANCY_ATTR = 'occupancy'
+    TYPE_SHARING_ATTR = 'sharing'
+    DEFAULT_SHARING = 'none'
+    GROUPS_TAG = 'groups'
+    GROUP_TAG = 'group'
+    GROUP_VEHICLE_TAG = 'vehicle'
+    GROUP_VEHICLE_TYPE_ATTR = 'type'
+
+
+class VehicleTypes:
+    """
+    The contents of a vehicle types file. Vehicle types are identified by their index in file order, and each group
+    is held as the array of the indices of its member types.
+    """
+    def __init__(self, uuids: List[str], names: List[str], sharing: List[str], group_members: Dict[str, np.ndarray]):
+        """
+        Creates vehicle types from their tables.
+        Args:
+            uuids: The uuid of each vehicle type.
+            names: The name of each vehicle type.
+            sharing: The sharing of each vehicle type.
+            group_members: The indices of the member vehicle types of each group, by group uuid.
+        """
+        self._uuids: List[str] = uuids
+        self._names: List[str] = names
+        self._sharing: List[str] = sharing
+        self._index_of: Dict[str, int] = {type_uuid: index for index, type_uuid in enumerate(uuids)}
+        self._group_members: Dict[str, np.ndarray] = group_members
+
+    @classmethod
+    def from_xml(cls, from_element: etree.ElementBase):
+        type_elements: List[etree.ElementBase] = list(
+            from_element.find(VehicleTypeConstants.TYPES_TAG).iterchildren(VehicleTypeConstants.TYPE_TAG))
+        uuids: List[str] = [element.attrib[VehicleTypeConstants.UUID_ATTR] for element in type_elements]
+        index_of: Dict[str, int] = {type_uuid: index for index, type_uuid in enumerate(uuids)}
+
+        group_members: Dict[str, np.ndarray] = {}
+        for group_element in from_element.find(VehicleTypeConstants.GROUPS_TAG).iterchildren(
+                VehicleTypeConstants.GROUP_TAG):
+            group_uuid: str = group_element.attrib[VehicleTypeConstants.UUID_ATTR]
+            member_uuids: List[str] = [
+                vehicle_element.attrib[VehicleTypeConstants.GROUP_VEHICLE_TYPE_ATTR]
+                for vehicle_element in group_element.iterchildren(VehicleTypeConstants.GROUP_VEHICLE_TAG)]
+            for member_uuid in member_uuids:
+                if member_uuid not in index_of:
+                    raise KeyError(Localization.get_message('E0013', group_uuid, member_uuid))
+            group_members[group_uuid] = np.array([index_of[member_uuid] for member_uuid in member_uuids],
+                                                 dtype=np.int32)
+
+        return cls(uuids,
+                   [element.attrib.get(VehicleTypeConstants.NAME_ATTR, '') for element in type_elements],
+                   [element.attrib.get(VehicleTypeConstants.TYPE_SHARING_ATTR, VehicleTypeConstants.DEFAULT_SHARING)
+                    for element in type_elements],
+                   group_members)
+
+    @property
+    def uuids(self) -> List[str]:
+        return self._uuids
+
+    @property
+    def names(self) -> List[str]:
+        return self._names
+
+    @property
+    def sharing(self) -> List[str]:
+        """
+        Returns the sharing of each vehicle type: 'transit', 'hov' or 'none'.
+        """
+        return self._sharing
+
+    @property
+    def index_of(self) -> Dict[str, int]:
+        return self._index_of
+
+    @property
+    def count(self) -> int:
+        return len(self._uuids)
+
+    @property
+    def group_members(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the indices of the member vehicle types of each group, by group UUID.
+        """
+        return self._group_members
+
+
+def process_file(filename) -> VehicleTypes:
+    tree: etree.ElementTree = etree.parse(filename)
+    if not XmlValidation.get_schema(XmlValidation.VEHICLE_TYPES_XSD).validate(tree):
+        # validation failed
+        raise RuntimeError(Localization.get_message('E0002', str(filename)))
+
+    return VehicleTypes.from_xml(tree.getroot())
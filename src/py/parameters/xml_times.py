@@ -0,0 +1,46 @@
+import re
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+SECONDS_PER_DAY: int = 86400
+
+_TIME_PATTERN = re.compile(r'^(\d{2}):(\d{2}):(\d{2}(?:\.\d+)?)(Z|[+-]\d{2}:\d{2})?$')
+
+
+def time_of_day_to_seconds(text: str) -> float:
+    """
+    Converts an xs:time value to seconds after midnight. Any timezone designation is ignored, since simulation
+    times are all expressed in the timezone of the simulation start time.
+    Args:
+        text: The xs:time value, such as '13:15:00'.
+
+    Returns:
+        The number of seconds after midnight.
+    """
+    match: re.Match = _TIME_PATTERN.match(text.strip())
+    if match is None:
+        raise ValueError(Localization.get_message('E0005', text))
+
+    return int(match.group(1)) * 3600 + int(match.group(2)) * 60 + float(match.group(3))
+
+
+_DURATION_PATTERN = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?$')
+
+
+def duration_to_seconds(text: str) -> float:
+    """
+    Converts an xs:duration value to seconds. Only days, hours, minutes and seconds are accepted, since years and
+    months have no fixed length.
+    Args:
+        text: The xs:duration value, such as 'PT1H30M'.
+
+    Returns:
+        The number of seconds.
+    """
+    stripped: str = text.strip()
+    match: re.Match = _DURATION_PATTERN.match(stripped)
+    if match is None or stripped in ('P', 'PT') or stripped.endswith('T'):
+        raise ValueError(Localization.get_message('E0011', text))
+
+    days, hours, minutes, seconds = (float(group) if group is not None else 0.0 for group in match.groups())
+
+    return days * SECONDS_PER_DAY + hours * 3600 + minutes * 60 + seconds
@@ -1,4 +1,7 @@
-from typing import List
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional
+from parameters.road_network import RoadNetwork
+from i18n_l10n.temporary_i18n_bridge import Localization
 
 
 class NetworkTopologyLink:
@@ -29,14 +32,180 @@ class NetworkTopologyLink:
         def get_this_road_ordinate(self) -> float:
             return self._this_road_ordinate
 
+    def __init__(self, *, length: float, incoming_connections: Optional[List[_ConnectionPoint]] = None,
+                 outgoing_connections: Optional[List[_ConnectionPoint]] = None):
+        """
+        Creates a link.
+        Args:
+            length: Length of the link along its chain, as in RoadNetwork.chain_geometry.road_lengths of its road.
+            incoming_connections: Connections by which vehicles enter this link from other links.
+            outgoing_connections: Connections by which vehicles leave this link for other links.
+        """
+        self._length: float = length
+        self._incoming_connections: List[NetworkTopologyLink._ConnectionPoint] = list(incoming_connections or [])
+        self._outgoing_connections: List[NetworkTopologyLink._ConnectionPoint] = list(outgoing_connections or [])
+
+    @classmethod
+    def links_from_network(cls, network: RoadNetwork,
+                           incoming_connections: Optional[Dict[str, List[_ConnectionPoint]]] = None,
+                           outgoing_connections: Optional[Dict[str, List[_ConnectionPoint]]] = None) \
+            -> Dict[str, 'NetworkTopologyLink']:
+        """
+        Creates the link of every road of a network, with the length of the road's chain.
+        Args:
+            network: The network.
+            incoming_connections: Incoming connections of the links, by road uuid.
+            outgoing_connections: Outgoing connections of the links, by road uuid.
+
+        Returns:
+            The link of each road, by road uuid.
+        """
+        incoming_connections = incoming_connections or {}
+        outgoing_connections = outgoing_connections or {}
+        road_lengths: np.ndarray = network.chain_geometry.road_lengths
+
+        return {road_id: cls(length=float(road_lengths[index]),
+                             incoming_connections=incoming_connections.get(road_id),
+                             outgoing_connections=outgoing_connections.get(road_id))
+                for road_id, index in network.road_index_of.items()}
+
     def get_length(self) -> float:
-        # TODO calculate this from geometry
-        return 0
+        return self._length
 
     def get_incoming_connections(self) -> List[_ConnectionPoint]:
-        # TODO 
-        return []
+        return self._incoming_connections
 
     def get_outgoing_connections(self) -> List[_ConnectionPoint]:
-        # TODO
-        return []
+        return self._outgoing_connections
+
+
+class Connections(NamedTuple):
+    """
+    Connections between roads, one element per connection, ordered by the road they leave and then by the offset
+    at which they leave it.
+    """
+    from_roads: np.ndarray
+    to_roads: np.ndarray
+    from_offsets: np.ndarray
+    '''Offset along the road being left at which each connection starts.'''
+    to_offsets: np.ndarray
+    '''Offset along the road being entered at which each connection ends.'''
+    from_ordinates: np.ndarray
+    to_ordinates: np.ndarray
+
+
+class NetworkTopologyGraph:
+    """
+    The connections between all roads, compiled into compressed sparse row form. Roads are identified by their
+    index, as in RoadNetwork.
+
+    The connections leaving road i are those in [outgoing_offsets[i], outgoing_offsets[i + 1]). The connections
+    entering road i are incoming_connections[incoming_offsets[i]:incoming_offsets[i + 1]], indices into the
+    connections ordered by the offset at which they enter.
+    """
+    def __init__(self, road_count: int, connections: Connections):
+        """
+        Creates a graph.
+        Args:
+            road_count: The number of roads.
+            connections: The connections, ordered by the road they leave and then by offset.
+        """
+        self._road_count: int = road_count
+        self._connections: Connections = connections
+        self._outgoing_offsets: np.ndarray = np.searchsorted(
+            connections.from_roads, np.arange(road_count + 1), side='left')
+        self._incoming_connections: np.ndarray = np.lexsort((connections.to_offsets, connections.to_roads))
+        self._incoming_offsets: np.ndarray = np.searchsorted(
+            connections.to_roads[self._incoming_connections], np.arange(road_count + 1), side='left')
+
+    @classmethod
+    def from_links(cls, road_index_of: Dict[str, int], links: Dict[str, NetworkTopologyLink]):
+        """
+        Compiles the connection points of links into a graph. A connection may be given as an outgoing connection
+        of one link, as an incoming connection of the other, or both; it appears once in the graph.
+        Args:
+            road_index_of: The road index of each road uuid, such as RoadNetwork.road_index_of.
+            links: The link of each road, by road uuid. Roads without a link have no connections.
+
+        Returns:
+            The graph.
+        """
+        def road_index(from_road_id: str, road_id: str) -> int:
+            if road_id not in road_index_of:
+                raise KeyError(Localization.get_message('E0018', from_road_id, road_id))
+            return road_index_of[road_id]
+
+        # one row of (from road, to road, from offset, to offset, from ordinate, to ordinate) per connection point
+        rows: List[tuple] = []
+        for road_id, link in links.items():
+            this_road: int = road_index(road_id, road_id)
+            for point in link.get_outgoing_connections():
+                rows.append((this_road, road_index(road_id, point.get_connecting_road_id()),
+                             point.get_this_offset(), point.get_connecting_offset(),
+                             point.get_this_road_ordinate(), point.get_connecting_road_ordinate()))
+            for point in link.get_incoming_connections():
+                rows.append((road_index(road_id, point.get_connecting_road_id()), this_road,
+                             point.get_connecting_offset(), point.get_this_offset(),
+                             point.get_connecting_road_ordinate(), point.get_this_road_ordinate()))
+
+        table: np.ndarray = np.unique(np.array(rows, dtype=np.float64).reshape(-1, 6), axis=0)
+        # unique orders the rows by to road before offset; order them by from road and then offset instead
+        table = table[np.lexsort((table[:, 2], table[:, 0]))]
+        return cls(len(road_index_of), Connections(
+            from_roads=table[:, 0].astype(np.int32),
+            to_roads=table[:, 1].astype(np.int32),
+            from_offsets=table[:, 2],
+            to_offsets=table[:, 3],
+            from_ordinates=table[:, 4],
+            to_ordinates=table[:, 5],
+        ))
+
+    @property
+    def road_count(self) -> int:
+        return self._road_count
+
+    @property
+    def connections(self) -> Connections:
+        return self._connections
+
+    @property
+    def outgoing_offsets(self) -> np.ndarray:
+        return self._outgoing_offsets
+
+    @property
+    def incoming_offsets(self) -> np.ndarray:
+        return self._incoming_offsets
+
+    @property
+    def incoming_connections(self) -> np.ndarray:
+        return self._incoming_connections
+
+    def outgoing(self, road: int) -> slice:
+        """
+        Returns the slice of connections leaving a road.
+        """
+        return slice(self._outgoing_offsets[road], self._outgoing_offsets[road + 1])
+
+    def incoming(self, road: int) -> np.ndarray:
+        """
+        Returns the indices of the connections entering a road, in the order they enter it.
+        """
+        return self._incoming_connections[self._incoming_offsets[road]:self._incoming_offsets[road + 1]]
+
+    def successors(self, road: int) -> np.ndarray:
+        """
+        Returns the roads that the connections leaving a road lead to.
+        """
+        return self._connections.to_roads[self.outgoing(road)]
+
+    def predecessors(self, road: int) -> np.ndarray:
+        """
+        Returns the roads that the connections entering a road come from.
+        """
+        return self._connections.from_roads[self.incoming(road)]
+
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self._outgoing_offsets)
+
+    def in_degrees(self) -> np.ndarray:
+        return np.diff(self._incoming_offsets)
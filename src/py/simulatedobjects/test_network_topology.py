@@ -0,0 +1,100 @@
+import os
+import unittest
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.road_network import NetworkConstants, RoadConstants, RoadNetwork, process_file
+from test_support.xml_fixtures import create_road_node
+from simulatedobjects.network_topology import NetworkTopologyGraph, NetworkTopologyLink
+
+
+def connection(road_id: str, this_offset: float, connecting_offset: float, this_ordinate: float = 0.0,
+               connecting_ordinate: float = 0.0) -> NetworkTopologyLink._ConnectionPoint:
+    return NetworkTopologyLink._ConnectionPoint(
+        connecting_road_id=road_id, this_road_offset=this_offset, connecting_road_offset=connecting_offset,
+        this_road_ordinate=this_ordinate, connecting_road_ordinate=connecting_ordinate)
+
+
+class TestsForNetworkTopologyGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        self._road_index_of = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+        # a leaves for c at 100 and for b at 40; b enters c at 20, given on both links; d is isolated
+        self._links = {
+            'a': NetworkTopologyLink(length=100.0, outgoing_connections=[connection('c', 100.0, 0.0),
+                                                                         connection('b', 40.0, 0.0)]),
+            'b': NetworkTopologyLink(length=50.0, outgoing_connections=[connection('c', 50.0, 20.0, 1.0, 2.0)]),
+            'c': NetworkTopologyLink(length=80.0, incoming_connections=[connection('b', 20.0, 50.0, 2.0, 1.0)]),
+        }
+
+    def test_link_connections(self):
+        self.assertEqual(self._links['a'].get_length(), 100.0)
+        self.assertEqual(len(self._links['a'].get_outgoing_connections()), 2)
+        self.assertEqual(self._links['a'].get_incoming_connections(), [])
+
+    def test_csr_arrays(self):
+        graph: NetworkTopologyGraph = NetworkTopologyGraph.from_links(self._road_index_of, self._links)
+        np.testing.assert_array_equal(graph.outgoing_offsets, [0, 2, 3, 3, 3])
+        np.testing.assert_array_equal(graph.connections.to_roads, [1, 2, 2])
+        np.testing.assert_array_equal(graph.connections.from_offsets, [40.0, 100.0, 50.0])
+        np.testing.assert_array_equal(graph.connections.to_ordinates, [0.0, 0.0, 2.0])
+        np.testing.assert_array_equal(graph.incoming_offsets, [0, 0, 1, 3, 3])
+        np.testing.assert_array_equal(graph.out_degrees(), [2, 1, 0, 0])
+        np.testing.assert_array_equal(graph.in_degrees(), [0, 1, 2, 0])
+
+    def test_neighbors(self):
+        graph: NetworkTopologyGraph = NetworkTopologyGraph.from_links(self._road_index_of, self._links)
+        np.testing.assert_array_equal(graph.successors(0), [1, 2])
+        np.testing.assert_array_equal(graph.predecessors(2), [0, 1])
+        np.testing.assert_array_equal(graph.connections.to_offsets[graph.incoming(2)], [0.0, 20.0])
+        self.assertEqual(len(graph.successors(3)), 0)
+
+    def test_connections_are_ordered_by_offset(self):
+        # a now leaves for c at 10, before it leaves for b at 40
+        self._links['a'] = NetworkTopologyLink(length=100.0, outgoing_connections=[connection('b', 40.0, 0.0),
+                                                                                 connection('c', 10.0, 0.0)])
+        graph: NetworkTopologyGraph = NetworkTopologyGraph.from_links(self._road_index_of, self._links)
+        np.testing.assert_array_equal(graph.connections.from_offsets[graph.outgoing(0)], [10.0, 40.0])
+        np.testing.assert_array_equal(graph.successors(0), [2, 1])
+        np.testing.assert_array_equal(graph.connections.from_roads, [0, 0, 1])
+
+    def test_unknown_road_is_rejected(self):
+        self._links['d'] = NetworkTopologyLink(length=10.0, outgoing_connections=[connection('e', 0.0, 0.0)])
+        self.assertRaises(KeyError, lambda: NetworkTopologyGraph.from_links(self._road_index_of, self._links))
+
+
+class TestsForLinksFromNetwork(unittest.TestCase):
+    def test_lengths_come_from_the_chains(self):
+        root: etree.ElementBase = etree.Element(NetworkConstants.ROOT_TAG, {
+            NetworkConstants.VERSION_ATTR: '1',
+            NetworkConstants.LAYOUT_UNITS_ATTR: 'feet',
+            NetworkConstants.SPEED_UNITS_ATTR: 'miles-per-hour',
+        })
+        roads: etree.ElementBase = etree.SubElement(root, RoadConstants.COLLECTION_TAG)
+        road_ids = []
+        for _ in range(2):
+            road: etree.ElementBase = create_road_node(1, str(uuid()))
+            roads.append(road)
+            road_ids.append(road.attrib[RoadConstants.UUID_ATTR])
+        # the second road is a single 30 by 40 foot segment
+        road.find(RoadConstants.CHAIN_TAG).attrib[RoadConstants.CHAIN_POINTS_ATTR] = '0,0 30,40'
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(root))
+        try:
+            network: RoadNetwork = process_file(file.name)
+        finally:
+            os.remove(file.name)
+
+        links = NetworkTopologyLink.links_from_network(
+            network, outgoing_connections={road_ids[0]: [connection(road_ids[1], 300.0, 0.0)]})
+        self.assertAlmostEqual(links[road_ids[0]].get_length(), 0.3048 * (200.0 + np.hypot(100.5, 0.5)))
+        self.assertAlmostEqual(links[road_ids[1]].get_length(), 0.3048 * 50.0)
+        self.assertEqual(len(links[road_ids[0]].get_outgoing_connections()), 1)
+        self.assertEqual(links[road_ids[1]].get_incoming_connections(), [])
+
+        graph: NetworkTopologyGraph = NetworkTopologyGraph.from_links(network.road_index_of, links)
+        np.testing.assert_array_equal(graph.successors(0), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from parameters.road_network import EntryInterval
+from simulatedobjects.vehicle_entry_schedule import VehicleEntrySchedule
+from simulatedobjects.vehicle_in_network import VehicleInNetwork
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+
+
+class TestVehicleEntrySchedule(unittest.TestCase):
+    def setUp(self) -> None:
+        VehicleInNetwork.reset()
+        self._intervals = [
+            EntryInterval(road=0, start=3600.0, end=4500.0, vehicle_type=0, count=100),
+            EntryInterval(road=1, start=3600.0, end=4500.0, vehicle_type=1, count=50,
+                          congestion_bypassing_fraction=0.0),
+            EntryInterval(road=0, start=4500.0, end=5400.0, vehicle_type=1, count=30),
+        ]
+
+    def test_schedule_is_time_ordered(self):
+        schedule: VehicleEntrySchedule = VehicleEntrySchedule.from_intervals(self._intervals,
+                                                                             np.random.default_rng(1))
+        self.assertEqual(len(schedule), 180)
+        self.assertTrue(np.all(np.diff(schedule.times) >= 0))
+        self.assertTrue(np.all(schedule.times[:150] < 4500.0))
+        self.assertEqual(np.count_nonzero(schedule.vehicle_types[150:] == 1), 30)
+        self.assertFalse(np.any(schedule.congestion_bypassing[schedule.roads == 1]))
+
+    def test_advance_returns_only_due_entries(self):
+        schedule: VehicleEntrySchedule = VehicleEntrySchedule.from_intervals(self._intervals,
+                                                                             np.random.default_rng(1))
+        self.assertEqual(schedule.advance(3599.0), slice(0, 0))
+
+        due_count: int = 0
+        for step_time in np.arange(3600.0, 5400.1, 0.1):
+            due: slice = schedule.advance(step_time)
+            self.assertTrue(np.all(schedule.times[due] <= step_time))
+            due_count += due.stop - due.start
+        self.assertEqual(due_count, 180)
+        self.assertEqual(schedule.pending_count, 0)
+        self.assertEqual(schedule.next_entry_time, np.inf)
+
+    def test_queue_due_allocates_queued_vehicles(self):
+        schedule: VehicleEntrySchedule = VehicleEntrySchedule.from_intervals(self._intervals,
+                                                                             np.random.default_rng(1))
+        store: VehicleStateStore = VehicleStateStore(capacity=8)
+        slots: np.ndarray = schedule.queue_due(4000.0, store)
+
+        self.assertEqual(store.count(SimulatedObjectStatus.QUEUED_TO_ENTER), len(slots))
+        self.assertEqual(len(slots), 180 - schedule.pending_count)
+        np.testing.assert_array_equal(store.vehicle_id[slots], schedule.vehicle_ids(slice(0, len(slots))))
+        np.testing.assert_array_equal(store.link[slots], schedule.roads[:len(slots)])
+        self.assertEqual(VehicleInNetwork().id, 180)
+
+
+if __name__ == '__main__':
+    unittest.main()
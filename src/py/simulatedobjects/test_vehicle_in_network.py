@@ -1,8 +1,13 @@
 import unittest
 from simulatedobjects.vehicle_in_network import VehicleInNetwork
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
 
 
 class TestVehicleInNetwork(unittest.TestCase):
+    def setUp(self) -> None:
+        VehicleInNetwork.reset()
+
     def test_that_ids_are_as_expected(self):
         VEHICLE_COUNT = 20
 
@@ -17,6 +22,55 @@ class TestVehicleInNetwork(unittest.TestCase):
         # each value must be unique
         self.assertEqual(len(set(map(lambda veh: veh.id, vehicles))), VEHICLE_COUNT)
 
+    def test_vehicle_is_a_view_of_store_row(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=2)
+        VehicleInNetwork.set_vehicle_state_store(store)
+        vehicles: list = [VehicleInNetwork() for _ in range(3)]
+
+        vehicles[1].speed = 12.5
+        vehicles[1].lane = 2
+        vehicles[1].status = SimulatedObjectStatus.IN_NETWORK
+        self.assertEqual(store.speed[1], 12.5)
+        self.assertEqual(store.lane[1], 2)
+        self.assertEqual(store.status[1], SimulatedObjectStatus.IN_NETWORK.value)
+
+        store.position[2] = 100.0
+        self.assertEqual(vehicles[2].position, 100.0)
+        self.assertEqual(vehicles[0].status, SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER)
+
+    def test_vehicle_exiting_frees_its_row(self):
+        store: VehicleStateStore = VehicleStateStore()
+        VehicleInNetwork.set_vehicle_state_store(store)
+        first: VehicleInNetwork = VehicleInNetwork(SimulatedObjectStatus.IN_NETWORK)
+        second: VehicleInNetwork = VehicleInNetwork(SimulatedObjectStatus.IN_NETWORK)
+        second.speed = 20.0
+
+        first.exit_network()
+        self.assertEqual(first.status, SimulatedObjectStatus.EXITED_NETWORK)
+        self.assertRaises(KeyError, lambda: first.speed)
+
+        third: VehicleInNetwork = VehicleInNetwork()
+        self.assertEqual(store.size, 2)
+        self.assertNotEqual(third.id, first.id)
+
+        store.compact()
+        self.assertEqual(second.speed, 20.0)
+
+    def test_vehicle_row_is_freed_by_exited_status(self):
+        store: VehicleStateStore = VehicleStateStore()
+        VehicleInNetwork.set_vehicle_state_store(store)
+        vehicle: VehicleInNetwork = VehicleInNetwork(SimulatedObjectStatus.IN_NETWORK)
+
+        vehicle.status = SimulatedObjectStatus.EXITED_NETWORK
+        self.assertEqual(vehicle.status, SimulatedObjectStatus.EXITED_NETWORK)
+        self.assertNotIn(vehicle.id, store)
+        self.assertEqual(store.free_slot_count, 1)
+        # exiting again is harmless
+        vehicle.status = SimulatedObjectStatus.EXITED_NETWORK
+
+    def test_vehicle_has_no_instance_dictionary(self):
+        self.assertFalse(hasattr(VehicleInNetwork(), '__dict__'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import numpy as np
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+
+
+class TestVehicleStateStore(unittest.TestCase):
+    def test_rows_are_allocated_sequentially(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=4)
+        self.assertListEqual([store.allocate(vid) for vid in range(4)], [0, 1, 2, 3])
+        self.assertEqual(store.size, 4)
+
+    def test_store_grows_and_keeps_data(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=2)
+        for vid in range(2):
+            store.allocate(vid, SimulatedObjectStatus.IN_NETWORK)
+        store.speed[:] = [3.0, 4.0]
+        store.allocate(2)
+
+        self.assertGreaterEqual(store.capacity, 3)
+        self.assertEqual(store.size, 3)
+        np.testing.assert_array_equal(store.speed, [3.0, 4.0, 0.0])
+        self.assertEqual(store.lane[2], VehicleStateStore.NO_LANE)
+        self.assertEqual(store.link[2], VehicleStateStore.NO_LINK)
+        self.assertEqual(store.get_status(1), SimulatedObjectStatus.IN_NETWORK)
+        self.assertEqual(store.get_status(2), SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER)
+
+    def test_columns_are_contiguous(self):
+        store: VehicleStateStore = VehicleStateStore()
+        for vid in range(10):
+            store.allocate(vid)
+        for column in (store.position, store.speed, store.acceleration, store.lane, store.link, store.status):
+            self.assertEqual(len(column), 10)
+            self.assertTrue(column.flags['C_CONTIGUOUS'])
+
+    def test_released_slots_are_reused(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=4)
+        for vid in range(4):
+            store.allocate(vid)
+        store.release(2)
+        store.release(0)
+
+        self.assertNotIn(2, store)
+        self.assertEqual(store.vehicle_count, 2)
+        self.assertEqual(store.free_slot_count, 2)
+        self.assertEqual(store.status[2], VehicleStateStore.NO_STATUS)
+        self.assertEqual(store.allocate(10), 0)
+        self.assertEqual(store.allocate(11), 2)
+        self.assertEqual(store.size, 4)
+        self.assertEqual(store.capacity, 4)
+        self.assertEqual(store.slot_of(11), 2)
+        self.assertRaises(KeyError, lambda: store.slot_of(2))
+
+    def test_compaction_keeps_ids_and_order(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=2)
+        for vid in range(100):
+            store.allocate(vid)
+        store.position[:] = np.arange(100, dtype=np.float64)
+        for vid in range(100):
+            if vid % 10 != 0:
+                store.release(vid)
+
+        old_slots: np.ndarray = store.compact()
+        np.testing.assert_array_equal(old_slots, np.arange(0, 100, 10))
+        self.assertEqual(store.size, 10)
+        self.assertEqual(store.free_slot_count, 0)
+        self.assertLess(store.capacity, 128)
+        np.testing.assert_array_equal(store.vehicle_id, np.arange(0, 100, 10))
+        np.testing.assert_array_equal(store.position, np.arange(0, 100, 10))
+        self.assertEqual(store.slot_of(30), 3)
+
+    def test_compaction_threshold(self):
+        store: VehicleStateStore = VehicleStateStore(compaction_threshold=0.5)
+        for vid in range(10):
+            store.allocate(vid)
+        for vid in range(5):
+            store.release(vid)
+        self.assertIsNone(store.compact_if_fragmented())
+        store.release(5)
+        self.assertIsNotNone(store.compact_if_fragmented())
+        self.assertEqual(store.size, 4)
+
+        self.assertIsNone(VehicleStateStore().compact_if_fragmented())
+
+    def test_status_partitions(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=2)
+        for vid in range(6):
+            store.allocate(vid)
+        store.set_statuses(np.array([1, 3, 4]), SimulatedObjectStatus.IN_NETWORK)
+        store.set_status(store.slot_of(5), SimulatedObjectStatus.QUEUED_TO_ENTER)
+
+        self.assertEqual(store.count(SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER), 2)
+        self.assertEqual(store.count(SimulatedObjectStatus.QUEUED_TO_ENTER), 1)
+        self.assertEqual(store.count(SimulatedObjectStatus.IN_NETWORK), 3)
+        self.assertSetEqual(set(store.indices(SimulatedObjectStatus.IN_NETWORK)), {1, 3, 4})
+
+        store.set_status(3, SimulatedObjectStatus.EXITED_NETWORK)
+        store.release(4)
+        self.assertSetEqual(set(store.indices(SimulatedObjectStatus.IN_NETWORK)), {1})
+        self.assertEqual(store.count(SimulatedObjectStatus.EXITED_NETWORK), 1)
+        self.assertEqual(store.exited_count, 2)
+
+        store.release(3)
+        self.assertEqual(store.count(SimulatedObjectStatus.EXITED_NETWORK), 0)
+        self.assertEqual(store.exited_count, 2)
+        store.compact()
+        self.assertEqual(store.exited_count, 2)
+        for status in SimulatedObjectStatus:
+            np.testing.assert_array_equal(np.sort(store.indices(status)),
+                                          np.flatnonzero(store.status == status.value))
+
+    def test_allocate_batch(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=4)
+        for vid in range(4):
+            store.allocate(vid)
+        store.release(2)
+        store.release(0)
+
+        slots: np.ndarray = store.allocate_batch(np.arange(10, 15), SimulatedObjectStatus.QUEUED_TO_ENTER)
+        np.testing.assert_array_equal(slots, [0, 2, 4, 5, 6])
+        self.assertGreaterEqual(store.capacity, 7)
+        self.assertEqual(store.free_slot_count, 0)
+        np.testing.assert_array_equal(store.vehicle_id[slots], np.arange(10, 15))
+        self.assertEqual(store.slot_of(12), 4)
+        self.assertSetEqual(set(store.indices(SimulatedObjectStatus.QUEUED_TO_ENTER)), set(slots.tolist()))
+
+        store.set_status(5, SimulatedObjectStatus.IN_NETWORK)
+        store.release(10)
+        self.assertSetEqual(set(store.indices(SimulatedObjectStatus.QUEUED_TO_ENTER)), {2, 4, 6})
+        np.testing.assert_array_equal(store.allocate_batch(np.array([20]), SimulatedObjectStatus.IN_NETWORK), [0])
+        self.assertEqual(len(store.allocate_batch(np.zeros(0, dtype=np.int64))), 0)
+
+    def test_allocating_a_held_vehicle_is_rejected(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=4)
+        store.allocate(7, SimulatedObjectStatus.IN_NETWORK)
+        self.assertRaises(ValueError, lambda: store.allocate(7))
+        self.assertRaises(ValueError, lambda: store.allocate_batch(np.array([8, 7])))
+        self.assertRaises(ValueError, lambda: store.allocate_batch(np.array([8, 9, 8])))
+        # nothing was allocated by the rejected calls
+        self.assertEqual(store.size, 1)
+        self.assertRaises(KeyError, lambda: store.slot_of(8))
+        np.testing.assert_array_equal(store.indices(SimulatedObjectStatus.IN_NETWORK), [0])
+
+        store.release(7)
+        self.assertEqual(store.allocate(7), 0)
+
+    def test_bad_capacity(self):
+        self.assertRaises(ValueError, lambda: VehicleStateStore(capacity=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
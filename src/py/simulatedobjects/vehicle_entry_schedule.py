@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Iterable
+from parameters.road_network import EntryInterval
+from parameters.xml_times import SECONDS_PER_DAY
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_in_network import VehicleInNetwork
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+
+
+class VehicleEntrySchedule:
+    """
+    Time-ordered schedule of every vehicle entry in the simulation.
+
+    The schedule is generated once, before the simulation starts, and stored as parallel arrays sorted by entry
+    time. A cursor marks the first entry that has not yet come due, so each time step only touches the entries
+    that are due in that step, regardless of the number of entry roads or intervals.
+
+    Entries after the cursor are the vehicles awaiting the command to enter. They are not held in the vehicle state
+    store until they come due, at which point they are allocated as QUEUED_TO_ENTER. Each entry has a stable
+    vehicle id, reserved as a consecutive block when the schedule is created.
+    """
+    def __init__(self, times: np.ndarray, roads: np.ndarray, vehicle_types: np.ndarray,
+                 congestion_bypassing: np.ndarray):
+        """
+        Creates a schedule from parallel arrays of entries, which need not be sorted.
+        Args:
+            times: Entry time of each vehicle, in seconds after midnight.
+            roads: Index of the road each vehicle enters on.
+            vehicle_types: Vehicle type index of each vehicle.
+            congestion_bypassing: Whether each vehicle bypasses congestion at the entry point.
+        """
+        order: np.ndarray = np.argsort(times, kind='stable')
+        self._times: np.ndarray = np.asarray(times, dtype=np.float64)[order]
+        self._roads: np.ndarray = np.asarray(roads, dtype=np.int32)[order]
+        self._vehicle_types: np.ndarray = np.asarray(vehicle_types, dtype=np.int32)[order]
+        self._congestion_bypassing: np.ndarray = np.asarray(congestion_bypassing, dtype=np.bool_)[order]
+        self._first_vehicle_id: int = VehicleInNetwork.reserve_ids(len(self._times))
+        self._cursor: int = 0
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[EntryInterval], rng: np.random.Generator):
+        """
+        Generates the schedule for a set of entry intervals, such as RoadNetwork.entry_intervals(). Vehicles of
+        each interval enter at uniformly distributed random times within the interval.
+        Args:
+            intervals: The entry intervals.
+            rng: The random number generator used for entry times and congestion bypassing.
+
+        Returns:
+            The schedule.
+        """
+        interval_list = list(intervals)
+        counts: np.ndarray = np.array([interval.count for interval in interval_list], dtype=np.int64)
+        starts: np.ndarray = np.array([interval.start for interval in interval_list], dtype=np.float64)
+        ends: np.ndarray = np.array([interval.end for interval in interval_list], dtype=np.float64)
+        # intervals that end before they start cross midnight
+        ends = np.where(ends < starts, ends + SECONDS_PER_DAY, ends)
+
+        total: int = int(counts.sum())
+        times: np.ndarray = np.repeat(starts, counts) + rng.random(total) * np.repeat(ends - starts, counts)
+        roads: np.ndarray = np.repeat([interval.road for interval in interval_list], counts)
+        vehicle_types: np.ndarray = np.repeat([interval.vehicle_type for interval in interval_list], counts)
+        fractions: np.ndarray = np.repeat(
+            [interval.congestion_bypassing_fraction for interval in interval_list], counts)
+        congestion_bypassing: np.ndarray = rng.random(total) < fractions
+
+        return cls(times, roads, vehicle_types, congestion_bypassing)
+
+    def advance(self, until_time: float) -> slice:
+        """
+        Moves the cursor past all entries due at or before a time.
+        Args:
+            until_time: The current simulation time, in seconds after midnight.
+
+        Returns:
+            A slice selecting the entries that came due, for use with the schedule's arrays.
+        """
+        start: int = self._cursor
+        self._cursor = max(start, int(np.searchsorted(self._times, until_time, side='right')))
+
+        return slice(start, self._cursor)
+
+    def queue_due(self, until_time: float, store: VehicleStateStore) -> np.ndarray:
+        """
+        Allocates every entry due at or before a time in the vehicle state store as QUEUED_TO_ENTER, with its road,
+        vehicle type and congestion bypassing recorded.
+        Args:
+            until_time: The current simulation time, in seconds after midnight.
+            store: The vehicle state store.
+
+        Returns:
+            The slots allocated to the queued vehicles.
+        """
+        due: slice = self.advance(until_time)
+        slots: np.ndarray = store.allocate_batch(self.vehicle_ids(due), SimulatedObjectStatus.QUEUED_TO_ENTER)
+        store.link[slots] = self._roads[due]
+        store.vehicle_type[slots] = self._vehicle_types[due]
+        store.congestion_bypassing[slots] = self._congestion_bypassing[due]
+
+        return slots
+
+    def vehicle_ids(self, entries: slice) -> np.ndarray:
+        """
+        Returns the vehicle ids of a range of entries.
+        """
+        return np.arange(self._first_vehicle_id + entries.start, self._first_vehicle_id + entries.stop)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Returns the number of entries that have not yet come due.
+        """
+        return len(self._times) - self._cursor
+
+    @property
+    def next_entry_time(self) -> float:
+        """
+        Returns the time of the next entry to come due, or infinity if there are none left.
+        """
+        return float(self._times[self._cursor]) if self._cursor < len(self._times) else np.inf
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times
+
+    @property
+    def roads(self) -> np.ndarray:
+        return self._roads
+
+    @property
+    def vehicle_types(self) -> np.ndarray:
+        return self._vehicle_types
+
+    @property
+    def congestion_bypassing(self) -> np.ndarray:
+        return self._congestion_bypassing
+
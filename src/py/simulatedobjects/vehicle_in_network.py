@@ -1,16 +1,33 @@
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+
+
 class VehicleInNetwork:
     """
     Representation of a vehicle in the network during simulation.
 
-    Vehicles are views of numpy/cupy arrays. Each vehicle is assigned a vehicle id,
-    which is in turn generated by a unique id generator.
+    Vehicles are views of one row of a VehicleStateStore. Each vehicle is assigned a vehicle id,
+    which is in turn generated by a unique id generator. The row is looked up from the id on every access, since
+    the store may move vehicles between rows when it is compacted.
     """
+    __slots__ = ('_id',)
+
     _next_unique_id_value: int = 0
-    _simulation_state_dictionary: dict = None
+    _vehicle_state_store: VehicleStateStore = None
 
     @classmethod
-    def set_simulation_state_dictionary(cls, ssd: dict) -> None:
-        cls._simulation_state_dictionary = ssd
+    def set_vehicle_state_store(cls, store: VehicleStateStore) -> None:
+        cls._vehicle_state_store = store
+
+    @classmethod
+    def vehicle_state_store(cls) -> VehicleStateStore:
+        """
+        Returns the store backing all vehicles, creating an empty one if none has been assigned.
+        """
+        if cls._vehicle_state_store is None:
+            cls._vehicle_state_store = VehicleStateStore()
+
+        return cls._vehicle_state_store
 
     @classmethod
     def _generate_unique_id(cls) -> int:
@@ -19,8 +36,36 @@ class VehicleInNetwork:
 
         return ret
 
-    def __init__(self):
+    @classmethod
+    def reserve_ids(cls, count: int) -> int:
+        """
+        Reserves a block of consecutive vehicle ids for vehicles that will be added to the store directly rather
+        than through this class.
+        Args:
+            count: The number of ids to reserve.
+
+        Returns:
+            The first id of the block.
+        """
+        ret = cls._next_unique_id_value
+        cls._next_unique_id_value = cls._next_unique_id_value + count
+
+        return ret
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Restarts id generation and detaches the vehicle state store. Generally intended for testing purposes.
+
+        Returns:
+            nothing
+        """
+        cls._next_unique_id_value = 0
+        cls._vehicle_state_store = None
+
+    def __init__(self, status: SimulatedObjectStatus = SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER):
         self._id: int = VehicleInNetwork._generate_unique_id()
+        VehicleInNetwork.vehicle_state_store().allocate(self._id, status)
 
     @property
     def id(self) -> int:
@@ -28,3 +73,71 @@ class VehicleInNetwork:
         Returns the vehicle's id.
         """
         return self._id
+
+    @property
+    def _row(self) -> int:
+        return VehicleInNetwork._vehicle_state_store.slot_of(self._id)
+
+    def exit_network(self) -> None:
+        """
+        Marks the vehicle as having exited the network. Its row in the store is freed for reuse, and its state
+        other than its status is no longer available.
+        """
+        VehicleInNetwork._vehicle_state_store.release(self._id)
+
+    @property
+    def position(self) -> float:
+        return float(VehicleInNetwork._vehicle_state_store.position[self._row])
+
+    @position.setter
+    def position(self, value: float) -> None:
+        VehicleInNetwork._vehicle_state_store.position[self._row] = value
+
+    @property
+    def speed(self) -> float:
+        return float(VehicleInNetwork._vehicle_state_store.speed[self._row])
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        VehicleInNetwork._vehicle_state_store.speed[self._row] = value
+
+    @property
+    def acceleration(self) -> float:
+        return float(VehicleInNetwork._vehicle_state_store.acceleration[self._row])
+
+    @acceleration.setter
+    def acceleration(self, value: float) -> None:
+        VehicleInNetwork._vehicle_state_store.acceleration[self._row] = value
+
+    @property
+    def lane(self) -> int:
+        return int(VehicleInNetwork._vehicle_state_store.lane[self._row])
+
+    @lane.setter
+    def lane(self, value: int) -> None:
+        VehicleInNetwork._vehicle_state_store.lane[self._row] = value
+
+    @property
+    def link(self) -> int:
+        return int(VehicleInNetwork._vehicle_state_store.link[self._row])
+
+    @link.setter
+    def link(self, value: int) -> None:
+        VehicleInNetwork._vehicle_state_store.link[self._row] = value
+
+    @property
+    def status(self) -> SimulatedObjectStatus:
+        if self._id not in VehicleInNetwork._vehicle_state_store:
+            return SimulatedObjectStatus.EXITED_NETWORK
+
+        return VehicleInNetwork._vehicle_state_store.get_status(self._row)
+
+    @status.setter
+    def status(self, value: SimulatedObjectStatus) -> None:
+        # exiting always frees the row, however it is requested
+        if value == SimulatedObjectStatus.EXITED_NETWORK:
+            if self._id in VehicleInNetwork._vehicle_state_store:
+                self.exit_network()
+            return
+
+        VehicleInNetwork._vehicle_state_store.set_status(self._row, value)
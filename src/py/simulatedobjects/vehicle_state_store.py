@@ -0,0 +1,455 @@
+import heapq
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+class VehicleStateStore:
+    """
+    Columnar storage for the simulation state of vehicles.
+
+    Each vehicle occupies one row (slot) across a set of preallocated, contiguous numpy arrays. Kernels that operate
+    on many vehicles at once (car following, lane changing) work directly on the columns, while VehicleInNetwork
+    objects are lightweight views onto a single row.
+
+    Vehicles are identified by stable public ids, which are never reused. Slots are internal: when a vehicle is
+    released its slot goes onto a free list and is handed to the next vehicle allocated, and compaction may move
+    vehicles to different slots. Slot numbers are therefore only stable between calls to compact().
+
+    The slots of the vehicles in each status are kept in a per-status partition that is updated on every status
+    transition, so that a time step can gather, for example, only the vehicles in the network without scanning
+    the whole status column.
+    """
+    DEFAULT_CAPACITY: int = 1024
+    NO_LANE: int = -1
+    NO_LINK: int = -1
+    NO_STATUS: int = 0
+    NO_VEHICLE: int = -1
+    NO_VEHICLE_TYPE: int = -1
+    NO_DRIVING_BEHAVIOR: int = -1
+
+    # (attribute name, dtype, fill value for unused rows)
+    _COLUMNS: Tuple[Tuple[str, type, object], ...] = (
+        ('_position', np.float64, 0.0),
+        ('_speed', np.float64, 0.0),
+        ('_acceleration', np.float64, 0.0),
+        ('_length', np.float64, 0.0),
+        ('_lane', np.int32, NO_LANE),
+        ('_link', np.int32, NO_LINK),
+        ('_status', np.int8, NO_STATUS),
+        ('_vehicle_id', np.int64, NO_VEHICLE),
+        ('_vehicle_type', np.int32, NO_VEHICLE_TYPE),
+        ('_congestion_bypassing', np.bool_, False),
+        ('_driving_behavior', np.int32, NO_DRIVING_BEHAVIOR),
+        ('_desired_speed', np.float64, 0.0),
+        ('_normal_acceleration', np.float64, 0.0),
+        ('_maximum_deceleration', np.float64, 0.0),
+        ('_partition_index', np.int32, -1),
+    )
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, compaction_threshold: Optional[float] = None):
+        """
+        Creates an empty store.
+        Args:
+            capacity: The number of rows to preallocate. The store grows automatically when this is exceeded, and
+                is never shrunk below this value by compaction.
+            compaction_threshold: If provided, compact_if_fragmented() compacts the store once the fraction of
+                free slots among the used rows exceeds this value. If None, compaction only happens when compact()
+                is called.
+        """
+        if capacity < 1:
+            raise ValueError(Localization.get_message('E0003', str(capacity)))
+
+        self._minimum_capacity: int = capacity
+        self._capacity: int = capacity
+        self._size: int = 0
+        self._compaction_threshold: Optional[float] = compaction_threshold
+        self._free_slots: List[int] = []
+        self._slot_of_id: Dict[int, int] = dict()
+        self._released_count: int = 0
+        for name, dtype, fill in VehicleStateStore._COLUMNS:
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+        # slots of the vehicles in each status, densely packed at the start of each array
+        self._partition_members: Dict[int, np.ndarray] = {
+            status.value: np.zeros(capacity, dtype=np.int32) for status in SimulatedObjectStatus
+        }
+        self._partition_sizes: Dict[int, int] = {status.value: 0 for status in SimulatedObjectStatus}
+
+    def allocate(self, vehicle_id: int,
+                 status: SimulatedObjectStatus = SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER) -> int:
+        """
+        Reserves a slot for a new vehicle. Free slots are reused, lowest first, before the used rows are extended.
+        Args:
+            vehicle_id: The public id of the vehicle.
+            status: The initial status of the vehicle.
+
+        Returns:
+            The slot reserved for the vehicle.
+        Raises:
+            ValueError if the vehicle is already held in the store.
+        """
+        if vehicle_id in self._slot_of_id:
+            raise ValueError(Localization.get_message('E0019', str(vehicle_id)))
+
+        if self._free_slots:
+            slot: int = heapq.heappop(self._free_slots)
+        else:
+            if self._size == self._capacity:
+                self._resize(self._capacity * 2)
+            slot = self._size
+            self._size += 1
+
+        self._status[slot] = status.value
+        self._vehicle_id[slot] = vehicle_id
+        self._slot_of_id[vehicle_id] = slot
+        self._add_to_partition(slot, status.value)
+
+        return slot
+
+    def allocate_batch(self, vehicle_ids: np.ndarray,
+                       status: SimulatedObjectStatus = SimulatedObjectStatus.AWAITING_COMMAND_TO_ENTER) -> np.ndarray:
+        """
+        Reserves slots for several new vehicles, as allocate() does for one. The store grows at most once, and the
+        columns and the status partition are written for all the vehicles at once.
+        Args:
+            vehicle_ids: The public ids of the vehicles.
+            status: The initial status of the vehicles.
+
+        Returns:
+            The slots reserved for the vehicles, in the order of vehicle_ids.
+        Raises:
+            ValueError if any of the vehicles is already held in the store or appears twice in vehicle_ids. No
+            vehicle is allocated in that case.
+        """
+        vehicle_ids = np.asarray(vehicle_ids, dtype=np.int64)
+        id_list: List[int] = vehicle_ids.tolist()
+        held: List[int] = [vehicle_id for vehicle_id in id_list if vehicle_id in self._slot_of_id]
+        if held:
+            raise ValueError(Localization.get_message('E0019', str(held[0])))
+        if len(set(id_list)) != len(id_list):
+            unique_ids, counts = np.unique(vehicle_ids, return_counts=True)
+            raise ValueError(Localization.get_message('E0019', str(unique_ids[counts > 1][0])))
+
+        reused_count: int = min(len(vehicle_ids), len(self._free_slots))
+        if reused_count == len(self._free_slots):
+            reused: List[int] = sorted(self._free_slots)
+            self._free_slots.clear()
+        else:
+            reused = [heapq.heappop(self._free_slots) for _ in range(reused_count)]
+        new_count: int = len(vehicle_ids) - reused_count
+        if self._size + new_count > self._capacity:
+            self._resize(max(self._capacity * 2, self._size + new_count))
+        slots: np.ndarray = np.concatenate([np.array(reused, dtype=np.int64),
+                                            np.arange(self._size, self._size + new_count, dtype=np.int64)])
+        self._size += new_count
+
+        self._status[slots] = status.value
+        self._vehicle_id[slots] = vehicle_ids
+        self._slot_of_id.update(zip(id_list, slots.tolist()))
+        start: int = self._partition_sizes[status.value]
+        self._partition_members[status.value][start:start + len(slots)] = slots
+        self._partition_index[slots] = np.arange(start, start + len(slots), dtype=np.int32)
+        self._partition_sizes[status.value] = start + len(slots)
+
+        return slots
+
+    def release(self, vehicle_id: int) -> None:
+        """
+        Removes a vehicle from the store and puts its slot on the free list. Intended for vehicles that have
+        exited the network, and counted as an exit by exited_count whatever the vehicle's status was.
+        Args:
+            vehicle_id: The public id of the vehicle.
+
+        Returns:
+            nothing
+        """
+        slot: int = self.slot_of(vehicle_id)
+        del self._slot_of_id[vehicle_id]
+        self._remove_from_partition(slot, int(self._status[slot]))
+        for name, _, fill in VehicleStateStore._COLUMNS:
+            getattr(self, name)[slot] = fill
+        heapq.heappush(self._free_slots, slot)
+        self._released_count += 1
+
+    def compact(self) -> np.ndarray:
+        """
+        Moves all vehicles into the lowest slots, in their current order, and empties the free list. Capacity is
+        reduced if the store has become much larger than the number of vehicles it holds.
+
+        Returns:
+            An array whose element i is the slot that the vehicle now in slot i occupied before compaction. Callers
+            holding their own slot-indexed arrays can use it to reorder them.
+        """
+        old_slots: np.ndarray = np.flatnonzero(self._status[:self._size] != VehicleStateStore.NO_STATUS)
+        live_count: int = len(old_slots)
+        for name, _, fill in VehicleStateStore._COLUMNS:
+            column: np.ndarray = getattr(self, name)
+            column[:live_count] = column[old_slots]
+            column[live_count:self._size] = fill
+
+        self._size = live_count
+        self._free_slots.clear()
+        self._slot_of_id = dict(zip(self._vehicle_id[:live_count].tolist(), range(live_count)))
+
+        target_capacity: int = max(self._minimum_capacity, 2 * live_count)
+        if self._capacity > 2 * target_capacity:
+            self._resize(target_capacity)
+        self._rebuild_partitions()
+
+        return old_slots
+
+    def compact_if_fragmented(self) -> Optional[np.ndarray]:
+        """
+        Compacts the store if a compaction threshold was set and the fraction of free slots exceeds it. Meant to be
+        called once per time step, at a point where no kernel holds slot numbers.
+
+        Returns:
+            The result of compact() if compaction happened, otherwise None.
+        """
+        if self._compaction_threshold is None or self._size == 0:
+            return None
+        if len(self._free_slots) / self._size <= self._compaction_threshold:
+            return None
+
+        return self.compact()
+
+    def _resize(self, new_capacity: int) -> None:
+        kept_rows: int = min(self._capacity, new_capacity)
+        for name, dtype, fill in VehicleStateStore._COLUMNS:
+            old_column: np.ndarray = getattr(self, name)
+            new_column: np.ndarray = np.full(new_capacity, fill, dtype=dtype)
+            new_column[:kept_rows] = old_column[:kept_rows]
+            setattr(self, name, new_column)
+
+        for code, old_members in self._partition_members.items():
+            new_members: np.ndarray = np.zeros(new_capacity, dtype=np.int32)
+            kept_members: int = min(self._partition_sizes[code], new_capacity)
+            new_members[:kept_members] = old_members[:kept_members]
+            self._partition_members[code] = new_members
+
+        self._capacity = new_capacity
+
+    def _add_to_partition(self, slot: int, code: int) -> None:
+        index: int = self._partition_sizes[code]
+        self._partition_members[code][index] = slot
+        self._partition_index[slot] = index
+        self._partition_sizes[code] = index + 1
+
+    def _remove_from_partition(self, slot: int, code: int) -> None:
+        # swap the last member into the vacated position
+        members: np.ndarray = self._partition_members[code]
+        index: int = int(self._partition_index[slot])
+        last_index: int = self._partition_sizes[code] - 1
+        last_slot: int = int(members[last_index])
+        members[index] = last_slot
+        self._partition_index[last_slot] = index
+        self._partition_index[slot] = -1
+        self._partition_sizes[code] = last_index
+
+    def _rebuild_partitions(self) -> None:
+        statuses: np.ndarray = self._status[:self._size]
+        for code, members in self._partition_members.items():
+            slots: np.ndarray = np.flatnonzero(statuses == code).astype(np.int32)
+            members[:len(slots)] = slots
+            self._partition_index[slots] = np.arange(len(slots), dtype=np.int32)
+            self._partition_sizes[code] = len(slots)
+
+    def slot_of(self, vehicle_id: int) -> int:
+        """
+        Returns the slot currently occupied by a vehicle.
+        Args:
+            vehicle_id: The public id of the vehicle.
+
+        Returns:
+            The vehicle's slot.
+        Raises:
+            KeyError if the vehicle is not held in this store.
+        """
+        if vehicle_id not in self._slot_of_id:
+            raise KeyError(Localization.get_message('E0004', str(vehicle_id)))
+
+        return self._slot_of_id[vehicle_id]
+
+    def __contains__(self, vehicle_id: int) -> bool:
+        return vehicle_id in self._slot_of_id
+
+    def get_status(self, slot: int) -> SimulatedObjectStatus:
+        return SimulatedObjectStatus(int(self._status[slot]))
+
+    def set_status(self, slot: int, status: SimulatedObjectStatus) -> None:
+        old_code: int = int(self._status[slot])
+        if old_code == status.value:
+            return
+
+        self._remove_from_partition(slot, old_code)
+        self._status[slot] = status.value
+        self._add_to_partition(slot, status.value)
+
+    def set_statuses(self, slots: np.ndarray, status: SimulatedObjectStatus) -> None:
+        """
+        Moves several vehicles to the same status. The cost is proportional to the number of slots provided.
+        Args:
+            slots: The slots of the vehicles to move.
+            status: The new status.
+
+        Returns:
+            nothing
+        """
+        for slot in np.asarray(slots).tolist():
+            self.set_status(slot, status)
+
+    def count(self, status: SimulatedObjectStatus) -> int:
+        """
+        Returns the number of vehicles held in the store in a status. Released vehicles are in no status, so for
+        EXITED_NETWORK this only counts vehicles marked as exited but not yet released; see exited_count.
+        """
+        return self._partition_sizes[status.value]
+
+    def indices(self, status: SimulatedObjectStatus) -> np.ndarray:
+        """
+        Returns the slots of all vehicles in a status, as a contiguous array in no particular order. The array is a
+        view that is invalidated by the next status change, release, allocation or compaction; copy it if it must
+        outlive those.
+        Args:
+            status: The status of interest.
+
+        Returns:
+            The slots of the vehicles in that status.
+        """
+        return self._partition_members[status.value][:self._partition_sizes[status.value]]
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of rows in use, including free slots below the highest occupied slot.
+        """
+        return self._size
+
+    @property
+    def vehicle_count(self) -> int:
+        """
+        Returns the number of vehicles held in the store.
+        """
+        return len(self._slot_of_id)
+
+    @property
+    def exited_count(self) -> int:
+        """
+        Returns the number of vehicles that have exited the network: those released from the store, and those
+        still held with the EXITED_NETWORK status.
+        """
+        return self._released_count + self._partition_sizes[SimulatedObjectStatus.EXITED_NETWORK.value]
+
+    @property
+    def free_slot_count(self) -> int:
+        return len(self._free_slots)
+
+    @property
+    def capacity(self) -> int:
+        """
+        Returns the number of rows that can be used before the store must grow.
+        """
+        return self._capacity
+
+    @property
+    def position(self) -> np.ndarray:
+        """
+        Returns a view of the longitudinal position column, in meters from the start of the link.
+        """
+        return self._position[:self._size]
+
+    @property
+    def speed(self) -> np.ndarray:
+        """
+        Returns a view of the speed column, in meters per second.
+        """
+        return self._speed[:self._size]
+
+    @property
+    def acceleration(self) -> np.ndarray:
+        """
+        Returns a view of the acceleration column, in meters per second squared.
+        """
+        return self._acceleration[:self._size]
+
+    @property
+    def length(self) -> np.ndarray:
+        """
+        Returns a view of the vehicle length column, in meters. Positions are those of the vehicles' fronts, so a
+        vehicle occupies [position - length, position].
+        """
+        return self._length[:self._size]
+
+    @property
+    def lane(self) -> np.ndarray:
+        """
+        Returns a view of the lane column. Rows not assigned to a lane hold NO_LANE.
+        """
+        return self._lane[:self._size]
+
+    @property
+    def link(self) -> np.ndarray:
+        """
+        Returns a view of the link column. Rows not assigned to a link hold NO_LINK.
+        """
+        return self._link[:self._size]
+
+    @property
+    def status(self) -> np.ndarray:
+        """
+        Returns a view of the status column, holding SimulatedObjectStatus values. Free slots hold NO_STATUS.
+        """
+        return self._status[:self._size]
+
+    @property
+    def vehicle_id(self) -> np.ndarray:
+        """
+        Returns a view of the public vehicle id column. Free slots hold NO_VEHICLE.
+        """
+        return self._vehicle_id[:self._size]
+
+    @property
+    def vehicle_type(self) -> np.ndarray:
+        """
+        Returns a view of the vehicle type column, holding indices of vehicle types. Rows without a vehicle type
+        hold NO_VEHICLE_TYPE.
+        """
+        return self._vehicle_type[:self._size]
+
+    @property
+    def congestion_bypassing(self) -> np.ndarray:
+        """
+        Returns a view of the column flagging vehicles that bypass congestion when entering the network.
+        """
+        return self._congestion_bypassing[:self._size]
+
+    @property
+    def driving_behavior(self) -> np.ndarray:
+        """
+        Returns a view of the driving behavior column, holding indices of driving behaviors. Rows without a driving
+        behavior hold NO_DRIVING_BEHAVIOR.
+        """
+        return self._driving_behavior[:self._size]
+
+    @property
+    def desired_speed(self) -> np.ndarray:
+        """
+        Returns a view of the desired speed column, in meters per second.
+        """
+        return self._desired_speed[:self._size]
+
+    @property
+    def normal_acceleration(self) -> np.ndarray:
+        """
+        Returns a view of the column of accelerations used when accelerating freely, in meters per second squared.
+        """
+        return self._normal_acceleration[:self._size]
+
+    @property
+    def maximum_deceleration(self) -> np.ndarray:
+        """
+        Returns a view of the maximum deceleration column, as positive values in meters per second squared.
+        """
+        return self._maximum_deceleration[:self._size]
@@ -0,0 +1,152 @@
+import numpy as np
+from enum import IntEnum
+from typing import Tuple
+from parameters.behaviors import Behaviors, FritzscheParameters
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+
+
+class FollowingRegime(IntEnum):
+    """
+    Regimes of the Fritzsche car following model.
+    """
+    FREE_DRIVING = 0
+    '''No leader within reach; the vehicle accelerates toward its desired speed.'''
+    FOLLOWING_I = 1
+    '''Close behind the leader at a similar speed; no conscious action.'''
+    FOLLOWING_II = 2
+    '''Closing on the leader, but still too far away for any action to be necessary.'''
+    CLOSING_IN = 3
+    '''Closing on the leader; decelerating to match its speed at the risky distance.'''
+    DANGER = 4
+    '''Closer than the risky distance; braking as hard as possible.'''
+
+
+def fritzsche_accelerations(parameters: FritzscheParameters, models: np.ndarray, gaps: np.ndarray,
+                            speeds: np.ndarray, leader_speeds: np.ndarray, previous_accelerations: np.ndarray,
+                            desired_speeds: np.ndarray, normal_accelerations: np.ndarray,
+                            maximum_decelerations: np.ndarray, time_step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates the Fritzsche car following model for a batch of vehicles. All arrays hold one element per vehicle.
+
+    A vehicle perceptibly closing on its leader is closing in when its gap is below the larger of its desired
+    distance and its braking distance, the risky distance plus dv² / (2 b) for closing speed dv and maximum
+    deceleration b. The model itself uses the braking distance alone.
+    Args:
+        parameters: The car following parameter table.
+        models: Index of each vehicle's model in the parameter table.
+        gaps: Distance from each vehicle's front to its leader's rear, in meters. Infinite for vehicles without a
+            leader.
+        speeds: Speed of each vehicle, in meters per second.
+        leader_speeds: Speed of each vehicle's leader, in meters per second. Ignored for vehicles without a leader.
+        previous_accelerations: Acceleration of each vehicle in the previous time step, which decides whether
+            vehicles drifting in the following regimes speed up or slow down.
+        desired_speeds: Desired speed of each vehicle, in meters per second.
+        normal_accelerations: Acceleration of each vehicle when driving freely, in meters per second squared.
+        maximum_decelerations: Maximum deceleration of each vehicle, as positive values in meters per second
+            squared.
+        time_step: Length of the time step, in seconds.
+
+    Returns:
+        The FollowingRegime value and the new acceleration of each vehicle.
+    """
+    standstill_distance: np.ndarray = parameters.standstill_distance[models]
+    b_null: np.ndarray = parameters.b_null[models]
+    closing_speeds: np.ndarray = speeds - leader_speeds
+    squared_gaps: np.ndarray = gaps * gaps
+
+    # perception thresholds for closing (PTN) and opening (PTP) speed differences grow with distance
+    ptn: np.ndarray = parameters.f_x[models] + parameters.k_ptn[models] * squared_gaps
+    ptp: np.ndarray = -(parameters.f_x[models] + parameters.k_ptp[models] * squared_gaps)
+
+    desired_distance: np.ndarray = standstill_distance + parameters.desired_time_gap[models] * speeds
+    safe_distance: np.ndarray = standstill_distance + parameters.safe_time_gap[models] * speeds
+    risky_distance: np.ndarray = standstill_distance + parameters.risky_time_gap[models] * leader_speeds
+    # distance at which braking at the maximum deceleration matches the leader's speed at the risky distance;
+    # vehicles that cannot brake must react to any closing they perceive
+    with np.errstate(divide='ignore', invalid='ignore'):
+        braking_distance: np.ndarray = risky_distance + np.where(
+            maximum_decelerations > 0.0,
+            np.maximum(closing_speeds, 0.0) ** 2 / (2.0 * np.maximum(maximum_decelerations, 0.0)), np.inf)
+
+    danger: np.ndarray = gaps < risky_distance
+    perceived_closing: np.ndarray = ~danger & (closing_speeds > ptn)
+    # Fritzsche's closing-in region ends at the braking distance; here it extends to the desired distance when
+    # that is larger, so that drivers start matching the leader's speed gently rather than only once they would
+    # need their maximum deceleration
+    closing_in: np.ndarray = perceived_closing & (gaps < np.maximum(braking_distance, desired_distance))
+    following_ii: np.ndarray = perceived_closing & ~closing_in
+    free_driving: np.ndarray = ~danger & ~perceived_closing & (
+        (gaps >= desired_distance) | ((closing_speeds < ptp) & (gaps >= safe_distance)))
+    regimes: np.ndarray = np.select(
+        [danger, closing_in, following_ii, free_driving],
+        [FollowingRegime.DANGER, FollowingRegime.CLOSING_IN, FollowingRegime.FOLLOWING_II,
+         FollowingRegime.FREE_DRIVING],
+        FollowingRegime.FOLLOWING_I).astype(np.int8)
+
+    # following: drift at b_null, keeping the direction the vehicle had when it entered the regime
+    drifting_up: np.ndarray = np.where(previous_accelerations == 0.0, closing_speeds <= 0.0,
+                                       previous_accelerations > 0.0)
+    accelerations: np.ndarray = np.where(drifting_up, b_null, -b_null)
+
+    # free driving: accelerate to the desired speed, then drift around it
+    speed_shortfalls: np.ndarray = desired_speeds - speeds
+    free_accelerations: np.ndarray = np.where(
+        speed_shortfalls > 0.0,
+        np.minimum(normal_accelerations, speed_shortfalls / time_step),
+        -np.clip(-speed_shortfalls / time_step, b_null, np.maximum(b_null, normal_accelerations)))
+    accelerations = np.where(free_driving, free_accelerations, accelerations)
+
+    # closing in: match the leader's speed by the time the gap has shrunk to the risky distance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        constraint_distance: np.ndarray = gaps - risky_distance - closing_speeds * time_step
+        closing_accelerations: np.ndarray = np.where(
+            constraint_distance > 0.0, -closing_speeds ** 2 / (2.0 * constraint_distance), -maximum_decelerations)
+    accelerations = np.where(closing_in, np.maximum(closing_accelerations, -maximum_decelerations), accelerations)
+
+    accelerations = np.where(danger, -maximum_decelerations, accelerations)
+
+    # vehicles stop rather than reverse
+    return regimes, np.maximum(accelerations, -speeds / time_step)
+
+
+class CarFollowingEngine:
+    """
+    Computes the car following acceleration of every vehicle in the network in one batch per time step. Model
+    parameters are gathered per vehicle from the parameter table through the vehicle's driving behavior.
+    """
+    def __init__(self, behaviors: Behaviors, time_step: float):
+        """
+        Creates an engine.
+        Args:
+            behaviors: The behaviors, whose car following models are used.
+            time_step: Length of the time step, in seconds.
+        """
+        self._parameters: FritzscheParameters = behaviors.car_following
+        self._following_model: np.ndarray = behaviors.following_model
+        self._time_step: float = time_step
+
+    @property
+    def time_step(self) -> float:
+        return self._time_step
+
+    def step(self, store: VehicleStateStore, gaps: np.ndarray, leader_speeds: np.ndarray) -> np.ndarray:
+        """
+        Updates the acceleration of every IN_NETWORK vehicle in the store.
+        Args:
+            store: The vehicle state store.
+            gaps: Gap of each IN_NETWORK vehicle to its leader, in the order of store.indices(IN_NETWORK), in meters.
+                Infinite for vehicles without a leader.
+            leader_speeds: Speed of each IN_NETWORK vehicle's leader, in the same order.
+
+        Returns:
+            The FollowingRegime value of each IN_NETWORK vehicle, in the same order.
+        """
+        slots: np.ndarray = store.indices(SimulatedObjectStatus.IN_NETWORK)
+        regimes, accelerations = fritzsche_accelerations(
+            self._parameters, self._following_model[store.driving_behavior[slots]], gaps, store.speed[slots],
+            leader_speeds, store.acceleration[slots], store.desired_speed[slots], store.normal_acceleration[slots],
+            store.maximum_deceleration[slots], self._time_step)
+        store.acceleration[slots] = accelerations
+
+        return regimes
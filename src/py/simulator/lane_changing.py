@@ -0,0 +1,187 @@
+import numpy as np
+from enum import IntEnum
+from typing import NamedTuple
+from parameters.behaviors import Behaviors, HidasParameters
+from parameters.road_network import RoadNetwork
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulator.lane_index import LanePositionIndex
+
+
+class LaneChangeDirection(IntEnum):
+    RIGHT = -1
+    LEFT = 1
+
+
+class LaneChangeDecisions(NamedTuple):
+    """
+    Outcome of evaluating a batch of lane change candidates, one element per candidate.
+    """
+    target_lanes: np.ndarray
+    '''Lane each candidate would move to, or RoadNetwork.NO_LANE if moving in that direction is not permitted.'''
+    accepted: np.ndarray
+    '''Whether each candidate changes lanes in this step.'''
+    forced: np.ndarray
+    '''Whether each candidate is within the forced lane change window.'''
+    braking_followers: np.ndarray
+    '''Slot of the target lane follower asked to brake for each candidate, or LanePositionIndex.NO_VEHICLE.'''
+    braking_decelerations: np.ndarray
+    '''Deceleration of each braking follower, as positive values in meters per second squared.'''
+
+
+class LaneChangeEngine:
+    """
+    Evaluates Hidas gap acceptance for every lane change candidate of a time step in one batch.
+
+    A candidate accepts the gap in the target lane if the gap to the new leader is at least
+    g_min + c_l * max(0, v - v_leader) * Dt and the gap to the new follower is at least
+    g_min + c_f * max(0, v_follower - v) * Dt, that is, if neither vehicle closes the gap to less than g_min during
+    the lane change. Mandatory lane changes enter the forced window t_fm seconds before the candidate's last chance
+    to change lanes, at the larger of its speed and its desired speed, so that a vehicle queued near its last
+    chance is forced as well. A forced candidate that only lacks the follower gap asks the follower to brake at
+    f_braking times its maximum deceleration, and changes lanes at once if that braking opens the gap within Dt.
+
+    When several candidates aim for the same gap, only the one furthest ahead changes lanes or asks the follower to
+    brake.
+    """
+    def __init__(self, behaviors: Behaviors, left_lanes: np.ndarray, right_lanes: np.ndarray,
+                 may_move_left: np.ndarray, may_move_right: np.ndarray):
+        """
+        Creates an engine.
+        Args:
+            behaviors: The behaviors, whose lane change models are used.
+            left_lanes: Global index of the lane to the left of each lane, or RoadNetwork.NO_LANE.
+            right_lanes: Global index of the lane to the right of each lane, or RoadNetwork.NO_LANE.
+            may_move_left: Whether vehicles may leave each lane to the left.
+            may_move_right: Whether vehicles may leave each lane to the right.
+        """
+        self._parameters: HidasParameters = behaviors.lane_change
+        self._lane_change_model: np.ndarray = behaviors.lane_change_model
+        self._left_lanes: np.ndarray = left_lanes
+        self._right_lanes: np.ndarray = right_lanes
+        self._may_move_left: np.ndarray = may_move_left
+        self._may_move_right: np.ndarray = may_move_right
+
+    @classmethod
+    def from_network(cls, behaviors: Behaviors, network: RoadNetwork):
+        left_lanes, right_lanes = network.adjacent_lanes()
+        return cls(behaviors, left_lanes, right_lanes, network.lanes.may_move_left, network.lanes.may_move_right)
+
+    def evaluate(self, store: VehicleStateStore, index: LanePositionIndex, slots: np.ndarray,
+                 directions: np.ndarray, mandatory: np.ndarray,
+                 distances_to_last_chance: np.ndarray) -> LaneChangeDecisions:
+        """
+        Evaluates lane change candidates.
+        Args:
+            store: The vehicle state store.
+            index: The lane position index, up to date with the store.
+            slots: Slot of each candidate.
+            directions: LaneChangeDirection value of each candidate.
+            mandatory: Whether each candidate must change lanes to follow its route.
+            distances_to_last_chance: Distance from each candidate to the last point at which it can change lanes,
+                in meters. Ignored for discretionary lane changes.
+
+        Returns:
+            The decisions.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        model: np.ndarray = self._lane_change_model[store.driving_behavior[slots]]
+        minimum_gap: np.ndarray = self._parameters.minimum_gap[model]
+        lane_change_time: np.ndarray = self._parameters.lane_change_time[model]
+
+        # target lane, where the lane's markings allow leaving it in the desired direction
+        lanes: np.ndarray = store.lane[slots]
+        to_left: np.ndarray = np.asarray(directions) == LaneChangeDirection.LEFT
+        target_lanes: np.ndarray = np.where(to_left, self._left_lanes[lanes], self._right_lanes[lanes])
+        permitted: np.ndarray = (target_lanes != RoadNetwork.NO_LANE) & \
+            np.where(to_left, self._may_move_left[lanes], self._may_move_right[lanes])
+        target_lanes = np.where(permitted, target_lanes, RoadNetwork.NO_LANE)
+
+        positions: np.ndarray = store.position[slots]
+        speeds: np.ndarray = store.speed[slots]
+        leaders, followers = index.neighbors_at(np.where(permitted, target_lanes, 0), positions)
+        has_leader: np.ndarray = permitted & (leaders != LanePositionIndex.NO_VEHICLE)
+        has_follower: np.ndarray = permitted & (followers != LanePositionIndex.NO_VEHICLE)
+        leaders = np.where(has_leader, leaders, LanePositionIndex.NO_VEHICLE)
+        followers = np.where(has_follower, followers, LanePositionIndex.NO_VEHICLE)
+        leader_slots: np.ndarray = np.where(has_leader, leaders, 0)
+        follower_slots: np.ndarray = np.where(has_follower, followers, 0)
+
+        lead_gaps: np.ndarray = np.where(
+            has_leader, store.position[leader_slots] - store.length[leader_slots] - positions, np.inf)
+        follow_gaps: np.ndarray = np.where(
+            has_follower, positions - store.length[slots] - store.position[follower_slots], np.inf)
+        required_lead_gaps: np.ndarray = minimum_gap + self._parameters.c_l[model] * lane_change_time * \
+            np.maximum(speeds - np.where(has_leader, store.speed[leader_slots], 0.0), 0.0)
+        required_follow_gaps: np.ndarray = minimum_gap + self._parameters.c_f[model] * lane_change_time * \
+            np.maximum(np.where(has_follower, store.speed[follower_slots], 0.0) - speeds, 0.0)
+        lead_acceptable: np.ndarray = lead_gaps >= required_lead_gaps
+        follow_acceptable: np.ndarray = follow_gaps >= required_follow_gaps
+
+        # a stopped or crawling vehicle would otherwise not be forced until it reached its last chance
+        window_speeds: np.ndarray = np.maximum(speeds, store.desired_speed[slots])
+        forced: np.ndarray = np.asarray(mandatory, dtype=np.bool_) & \
+            (np.asarray(distances_to_last_chance) <= self._parameters.forced_window[model] * window_speeds)
+
+        # cooperative braking by the target lane follower, at its own driver's braking fraction
+        follower_model: np.ndarray = self._lane_change_model[store.driving_behavior[follower_slots]]
+        braking_decelerations: np.ndarray = np.where(
+            has_follower,
+            self._parameters.braking_fraction[follower_model] * store.maximum_deceleration[follower_slots], 0.0)
+        braking_requested: np.ndarray = forced & permitted & has_follower & ~follow_acceptable & \
+            (follow_gaps >= minimum_gap)
+        braking_opens_gap: np.ndarray = \
+            follow_gaps + 0.5 * braking_decelerations * lane_change_time ** 2 >= required_follow_gaps
+
+        # only the candidate that gets the gap may take it or ask its follower to brake, and only if the leader gap
+        # is acceptable
+        gap_owners: np.ndarray = _one_candidate_per_gap(
+            permitted & lead_acceptable & (follow_acceptable | braking_requested), target_lanes, leaders, positions)
+        braking_requested &= gap_owners
+        accepted: np.ndarray = gap_owners & (follow_acceptable | braking_opens_gap)
+
+        return LaneChangeDecisions(
+            target_lanes=target_lanes,
+            accepted=accepted,
+            forced=forced,
+            braking_followers=np.where(braking_requested, followers, LanePositionIndex.NO_VEHICLE),
+            braking_decelerations=np.where(braking_requested, braking_decelerations, 0.0),
+        )
+
+    @staticmethod
+    def apply(store: VehicleStateStore, slots: np.ndarray, decisions: LaneChangeDecisions) -> None:
+        """
+        Moves accepted candidates to their target lanes and makes followers asked to brake do so, unless they are
+        already braking harder.
+        Args:
+            store: The vehicle state store.
+            slots: Slot of each candidate, as passed to evaluate().
+            decisions: The decisions returned by evaluate().
+
+        Returns:
+            nothing
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        store.lane[slots[decisions.accepted]] = decisions.target_lanes[decisions.accepted]
+
+        braking: np.ndarray = decisions.braking_followers != LanePositionIndex.NO_VEHICLE
+        followers: np.ndarray = decisions.braking_followers[braking]
+        # a follower asked by several candidates brakes at the strongest requested rate
+        np.minimum.at(store.acceleration, followers, -decisions.braking_decelerations[braking])
+
+
+def _one_candidate_per_gap(accepted: np.ndarray, target_lanes: np.ndarray, leaders: np.ndarray,
+                           positions: np.ndarray) -> np.ndarray:
+    candidates: np.ndarray = np.flatnonzero(accepted)
+    if len(candidates) < 2:
+        return accepted
+
+    # a gap is identified by its lane and its leader; the candidate furthest ahead comes first in each gap
+    ordered: np.ndarray = candidates[np.lexsort((-positions[candidates], leaders[candidates],
+                                                 target_lanes[candidates]))]
+    first_in_gap: np.ndarray = np.ones(len(ordered), dtype=np.bool_)
+    first_in_gap[1:] = (target_lanes[ordered[1:]] != target_lanes[ordered[:-1]]) | \
+        (leaders[ordered[1:]] != leaders[ordered[:-1]])
+    result: np.ndarray = accepted.copy()
+    result[ordered[~first_in_gap]] = False
+
+    return result
@@ -0,0 +1,221 @@
+import numpy as np
+from typing import Optional, Tuple
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+
+
+class LanePositionIndex:
+    """
+    Index of the vehicles in the network, grouped by lane and sorted by position within each lane.
+
+    The index holds the slots of all IN_NETWORK vehicles in one array ordered by (lane, position), with the range
+    of each lane given by lane offsets. Lanes are identified by their global lane index, as held in the store's
+    lane column. Because vehicles rarely pass each other within a step, the order from the previous step is kept
+    and repaired by insertion; only when many vehicles are out of order is the index sorted again from scratch.
+
+    Neighbor queries are answered with vectorized binary searches on the sorted positions rather than by scanning.
+    Slots are those of the store at the last update, so update() must be called again after the store is
+    compacted.
+    """
+    NO_VEHICLE: int = -1
+    DEFAULT_REPAIR_LIMIT: int = 64
+
+    def __init__(self, lane_count: int, repair_limit: int = DEFAULT_REPAIR_LIMIT):
+        """
+        Creates an empty index.
+        Args:
+            lane_count: The number of lanes in the network.
+            repair_limit: The largest number of out-of-order vehicles that are repaired by insertion. Beyond this,
+                the index is sorted from scratch.
+        """
+        self._lane_count: int = lane_count
+        self._repair_limit: int = repair_limit
+        self._order: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._lanes: np.ndarray = np.zeros(0, dtype=np.int32)
+        self._positions: np.ndarray = np.zeros(0, dtype=np.float64)
+        self._lane_offsets: np.ndarray = np.zeros(lane_count + 1, dtype=np.int64)
+        self._rank_of_slot: np.ndarray = np.zeros(0, dtype=np.int64)
+
+    def update(self, store: VehicleStateStore) -> None:
+        """
+        Brings the index up to date with the store: vehicles that have left the network are dropped, vehicles that
+        have entered are added, and the order is repaired for changes of position and lane.
+        Args:
+            store: The vehicle state store.
+
+        Returns:
+            nothing
+        """
+        slots: np.ndarray = store.indices(SimulatedObjectStatus.IN_NETWORK).astype(np.int64)
+        in_network: np.ndarray = np.zeros(store.size, dtype=np.bool_)
+        in_network[slots] = True
+        still_in: np.ndarray = self._order < store.size
+        still_in[still_in] = in_network[self._order[still_in]]
+        kept: np.ndarray = self._order[still_in]
+
+        # vehicles not already in the index go at the end; they and the vehicles that changed lanes are the ones
+        # known to be out of place
+        in_network[kept] = False
+        order: np.ndarray = np.concatenate([kept, slots[in_network[slots]]])
+        lanes: np.ndarray = store.lane[order]
+        positions: np.ndarray = store.position[order]
+        moved: np.ndarray = np.ones(len(order), dtype=np.bool_)
+        moved[:len(kept)] = lanes[:len(kept)] != self._lanes[still_in]
+
+        repaired = _repair(order, lanes, positions, moved, self._lane_count, self._repair_limit)
+        if repaired is None:
+            resorted: np.ndarray = np.lexsort((positions, lanes))
+            order, lanes, positions = order[resorted], lanes[resorted], positions[resorted]
+        else:
+            order, lanes, positions = repaired
+
+        self._order = order
+        self._lanes = lanes
+        self._positions = positions
+        self._lane_offsets = np.searchsorted(lanes, np.arange(self._lane_count + 1), side='left')
+        self._rank_of_slot = np.full(store.size, LanePositionIndex.NO_VEHICLE, dtype=np.int64)
+        self._rank_of_slot[order] = np.arange(len(order))
+
+    @property
+    def order(self) -> np.ndarray:
+        """
+        Returns the slots of all indexed vehicles, ordered by lane and then by position.
+        """
+        return self._order
+
+    @property
+    def lane_offsets(self) -> np.ndarray:
+        """
+        Returns the offsets of each lane's vehicles in order; lane i holds order[lane_offsets[i]:lane_offsets[i + 1]].
+        """
+        return self._lane_offsets
+
+    def vehicles_in_lane(self, lane: int) -> np.ndarray:
+        """
+        Returns the slots of the vehicles in a lane, from the upstream end.
+        """
+        return self._order[self._lane_offsets[lane]:self._lane_offsets[lane + 1]]
+
+    def own_lane_neighbors(self, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the vehicles directly ahead of and behind indexed vehicles in their own lanes.
+        Args:
+            slots: Slots of indexed vehicles.
+
+        Returns:
+            The slots of the leaders and of the followers, holding NO_VEHICLE where there is none.
+        """
+        ranks: np.ndarray = self._rank_of_slot[slots]
+        lane_starts: np.ndarray = self._lane_offsets[self._lanes[ranks]]
+        lane_ends: np.ndarray = self._lane_offsets[self._lanes[ranks] + 1]
+
+        return self._slots_at(ranks + 1, lane_starts, lane_ends), self._slots_at(ranks - 1, lane_starts, lane_ends)
+
+    def neighbors_at(self, lanes: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the vehicles that would be directly ahead of and behind points in lanes, such as the points beside
+        lane change candidates in their target lanes. A vehicle at exactly a point's position is its follower.
+        Args:
+            lanes: Lane of each point.
+            positions: Position of each point, in meters.
+
+        Returns:
+            The slots of the leaders and of the followers, holding NO_VEHICLE where there is none.
+        """
+        lanes = np.asarray(lanes, dtype=np.int64)
+        lane_starts: np.ndarray = self._lane_offsets[lanes]
+        lane_ends: np.ndarray = self._lane_offsets[lanes + 1]
+        # within each lane, positions are sorted; search the lane's segment of the position array
+        leader_ranks: np.ndarray = lane_starts + _segmented_search(self._positions, lane_starts, lane_ends, positions)
+
+        return (self._slots_at(leader_ranks, lane_starts, lane_ends),
+                self._slots_at(leader_ranks - 1, lane_starts, lane_ends))
+
+    def leader_gaps(self, store: VehicleStateStore, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the gaps to, and the speeds of, the leaders of indexed vehicles in their own lanes, as needed by
+        the car following engine.
+        Args:
+            store: The vehicle state store.
+            slots: Slots of indexed vehicles, such as store.indices(IN_NETWORK).
+
+        Returns:
+            The distance from each vehicle's front to its leader's rear, infinite where there is no leader, and the
+            speed of each leader, zero where there is none.
+        """
+        leaders, _ = self.own_lane_neighbors(slots)
+        has_leader: np.ndarray = leaders != LanePositionIndex.NO_VEHICLE
+        leader_slots: np.ndarray = np.where(has_leader, leaders, 0)
+        gaps: np.ndarray = np.where(
+            has_leader, store.position[leader_slots] - store.length[leader_slots] - store.position[slots], np.inf)
+        leader_speeds: np.ndarray = np.where(has_leader, store.speed[leader_slots], 0.0)
+
+        return gaps, leader_speeds
+
+    def _slots_at(self, ranks: np.ndarray, lane_starts: np.ndarray, lane_ends: np.ndarray) -> np.ndarray:
+        inside: np.ndarray = (ranks >= lane_starts) & (ranks < lane_ends)
+        return np.where(inside, self._order[np.where(inside, ranks, 0)] if len(self._order) else 0,
+                        LanePositionIndex.NO_VEHICLE)
+
+
+def _descending(lanes: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    # True where an element is greater, in (lane, position) order, than the element after it
+    return (lanes[:-1] > lanes[1:]) | ((lanes[:-1] == lanes[1:]) & (positions[:-1] > positions[1:]))
+
+
+def _repair(order: np.ndarray, lanes: np.ndarray, positions: np.ndarray, moved: np.ndarray, lane_count: int,
+            limit: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Sorts nearly sorted entries by insertion. The entries flagged as moved are taken out, the rest still being in
+    lane order; then, within lanes, both entries on either side of every break in position order are taken out
+    until the rest is sorted, and all entries taken out are put back in place. Returns None if more than limit
+    entries would have to be moved.
+    """
+    kept: np.ndarray = ~moved
+    while len(order) - np.count_nonzero(kept) <= limit:
+        kept_indices: np.ndarray = np.flatnonzero(kept)
+        breaks: np.ndarray = np.flatnonzero(_descending(lanes[kept_indices], positions[kept_indices]))
+        if len(breaks) == 0:
+            break
+        kept[kept_indices[breaks]] = False
+        kept[kept_indices[breaks + 1]] = False
+    else:
+        return None
+
+    if kept.all():
+        return order, lanes, positions
+
+    moved: np.ndarray = np.flatnonzero(~kept)
+    moved = moved[np.lexsort((positions[moved], lanes[moved]))]
+    kept_lanes: np.ndarray = lanes[kept]
+    kept_positions: np.ndarray = positions[kept]
+    kept_offsets: np.ndarray = np.searchsorted(kept_lanes, np.arange(lane_count + 1), side='left')
+    starts: np.ndarray = kept_offsets[lanes[moved]]
+    targets: np.ndarray = starts + _segmented_search(
+        kept_positions, starts, kept_offsets[lanes[moved] + 1], positions[moved])
+
+    return (np.insert(order[kept], targets, order[moved]), np.insert(kept_lanes, targets, lanes[moved]),
+            np.insert(kept_positions, targets, positions[moved]))
+
+
+def _segmented_search(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Vectorized binary search of each target in its own sorted segment values[start:end], giving the number of
+    values in the segment that are not greater than the target (searchsorted with side='right').
+    """
+    low: np.ndarray = starts.copy()
+    high: np.ndarray = ends.copy()
+    targets = np.asarray(targets, dtype=np.float64)
+    if len(values) == 0:
+        return np.zeros(len(targets), dtype=np.int64)
+
+    while True:
+        active: np.ndarray = low < high
+        if not active.any():
+            break
+        middle: np.ndarray = (low + high) // 2
+        not_greater: np.ndarray = values[np.minimum(middle, len(values) - 1)] <= targets
+        low = np.where(active & not_greater, middle + 1, low)
+        high = np.where(active & ~not_greater, middle, high)
+
+    return low - starts
@@ -0,0 +1,111 @@
+import numpy as np
+from parameters.lane_usage import LaneUsage
+from parameters.road_network import Lanes, RoadNetwork
+from parameters.vehicle_types import VehicleTypes
+from parameters.xml_times import SECONDS_PER_DAY
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+_BITS_PER_WORD: int = 64
+
+
+class LanePermissionIndex:
+    """
+    Index of the vehicle types allowed in each lane, as bitmasks of vehicle type indices.
+
+    Each policy is compiled once into a bitmask with bit (t % 64) of word (t // 64) set when vehicle type t is
+    allowed. Lane policy exceptions only change at their start and end times, so the day is split into segments at
+    those times and the lane masks are rebuilt only when the time of day moves into another segment. Between
+    boundaries, checking whether vehicles may use lanes is one gather and one bitwise AND per vehicle.
+
+    Where several exceptions of a lane are in effect at once, the first one in file order applies. Exceptions
+    whose end time is before their start time run past midnight.
+    """
+    def __init__(self, network: RoadNetwork, lane_usage: LaneUsage, vehicle_types: VehicleTypes):
+        """
+        Creates an index.
+        Args:
+            network: The road network, whose lanes refer to lane usage policies.
+            lane_usage: The lane usage policies.
+            vehicle_types: The vehicle types, which the policies' group exceptions are resolved against.
+        """
+        for policy_uuid in network.policy_uuids:
+            if policy_uuid not in lane_usage.index_of:
+                raise KeyError(Localization.get_message('E0017', policy_uuid))
+        # network policy indices are those of network.policy_uuids; translate the masks to match
+        self._policy_masks: np.ndarray = _pack(lane_usage.allowed_types(vehicle_types))[
+            [lane_usage.index_of[policy_uuid] for policy_uuid in network.policy_uuids]]
+        self._lanes: Lanes = network.lanes
+        self._exception_lanes: np.ndarray = np.repeat(
+            np.arange(len(self._lanes.policies)), np.diff(self._lanes.exception_offsets))
+        self._boundaries: np.ndarray = np.unique(np.concatenate([
+            [0.0, SECONDS_PER_DAY], self._lanes.exception_starts % SECONDS_PER_DAY,
+            self._lanes.exception_ends % SECONDS_PER_DAY]))
+        self._segment: int = -1
+        self._lane_masks: np.ndarray = np.zeros((len(self._lanes.policies), self._policy_masks.shape[1]),
+                                                dtype=np.uint64)
+
+    @property
+    def boundaries(self) -> np.ndarray:
+        """
+        Returns the times of day, in seconds after midnight, at which lane policies may change, from 0 to
+        SECONDS_PER_DAY.
+        """
+        return self._boundaries
+
+    def lane_masks(self, time_of_day: float) -> np.ndarray:
+        """
+        Returns the bitmask of the vehicle types allowed in each lane at a time of day, with one row per lane and
+        one column per 64 vehicle types. The masks are only rebuilt when the time crosses a policy boundary.
+        Args:
+            time_of_day: The time, in seconds after midnight. Times past the end of the day wrap around.
+        """
+        time_of_day %= SECONDS_PER_DAY
+        segment: int = int(np.searchsorted(self._boundaries, time_of_day, side='right')) - 1
+        if segment != self._segment:
+            self._lane_masks = self._policy_masks[self._policies_at(self._boundaries[segment])]
+            self._segment = segment
+
+        return self._lane_masks
+
+    def allows(self, time_of_day: float, lanes: np.ndarray, vehicle_types: np.ndarray) -> np.ndarray:
+        """
+        Checks whether vehicles may use lanes.
+        Args:
+            time_of_day: The time, in seconds after midnight.
+            lanes: Global index of the lane of each check.
+            vehicle_types: Vehicle type index of each check.
+
+        Returns:
+            Whether each vehicle type is allowed in its lane.
+        """
+        vehicle_types = np.asarray(vehicle_types, dtype=np.int64)
+        words: np.ndarray = self.lane_masks(time_of_day)[lanes, vehicle_types // _BITS_PER_WORD]
+        bits: np.ndarray = np.left_shift(np.uint64(1), (vehicle_types % _BITS_PER_WORD).astype(np.uint64))
+
+        return (words & bits) != 0
+
+    def _policies_at(self, time_of_day: float) -> np.ndarray:
+        starts: np.ndarray = self._lanes.exception_starts % SECONDS_PER_DAY
+        ends: np.ndarray = self._lanes.exception_ends % SECONDS_PER_DAY
+        in_effect: np.ndarray = np.where(starts <= ends, (starts <= time_of_day) & (time_of_day < ends),
+                                         (starts <= time_of_day) | (time_of_day < ends))
+        exceptions: np.ndarray = np.flatnonzero(in_effect)
+        # exceptions are grouped by lane in file order, so the first one of each lane is the one that applies
+        lanes, first = np.unique(self._exception_lanes[exceptions], return_index=True)
+        policies: np.ndarray = self._lanes.policies.copy()
+        policies[lanes] = self._lanes.exception_policies[exceptions[first]]
+
+        return policies
+
+
+def _pack(allowed: np.ndarray) -> np.ndarray:
+    """
+    Packs rows of booleans into rows of 64-bit words, bit i of word w holding element 64 * w + i.
+    """
+    word_count: int = max(1, -(-allowed.shape[1] // _BITS_PER_WORD))
+    padded: np.ndarray = np.zeros((allowed.shape[0], word_count * _BITS_PER_WORD), dtype=np.uint64)
+    padded[:, :allowed.shape[1]] = allowed
+    shifted: np.ndarray = np.left_shift(padded.reshape(allowed.shape[0], word_count, _BITS_PER_WORD),
+                                        np.arange(_BITS_PER_WORD, dtype=np.uint64))
+
+    return np.bitwise_or.reduce(shifted, axis=2)
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+from typing import Any, Callable, List, Optional, Tuple
+from parameters.simulation_settings import SimulationSettings
+
+# (scenario, run index, seed) -> result of the run; runs should draw from RandomStreams(seed)
+SimulationFunction = Callable[[Any, int, int], Any]
+
+# state of a worker process, set before the workers are started (fork) or by the pool initializer (spawn)
+_worker_scenario: Any = None
+_worker_simulate: Optional[SimulationFunction] = None
+
+
+def _initialize_worker(scenario: Any, simulate: SimulationFunction) -> None:
+    global _worker_scenario, _worker_simulate
+    _worker_scenario = scenario
+    _worker_simulate = simulate
+
+
+def _run_in_worker(run: Tuple[int, int]) -> Any:
+    run_index, seed = run
+    return _worker_simulate(_worker_scenario, run_index, seed)
+
+
+class MultiRunExecutor:
+    """
+    Runs every replication of a scenario, one seed per run, spreading the runs over worker processes.
+
+    The scenario is loaded once by the caller and is treated as read-only by the runs. Where the platform can fork,
+    workers inherit it from the parent process, so its arrays are shared copy-on-write rather than copied into each
+    worker; arrays memory-mapped from the scenario cache are shared through the page cache either way. Elsewhere
+    the scenario is sent to each worker once when the worker starts.
+
+    Results are returned in run order regardless of the order in which the runs finish, so the output of a set of
+    runs does not depend on the number of workers.
+    """
+    def __init__(self, settings: SimulationSettings, worker_count: Optional[int] = None):
+        """
+        Creates an executor.
+        Args:
+            settings: The simulation settings, which supply the number of runs and the seed of each run.
+            worker_count: The number of worker processes. Defaults to the number of processors, and is never more
+                than the number of runs. With one worker, runs are made in this process.
+        """
+        self._settings: SimulationSettings = settings
+        requested: int = worker_count if worker_count is not None else (os.cpu_count() or 1)
+        self._worker_count: int = max(1, min(requested, settings.run_count))
+
+    @property
+    def worker_count(self) -> int:
+        return self._worker_count
+
+    def run(self, scenario: Any, simulate: SimulationFunction) -> List[Any]:
+        """
+        Makes every run of the scenario.
+        Args:
+            scenario: The loaded scenario, passed unchanged to every run.
+            simulate: Function making one run, called with the scenario, the run index and the run's seed. It must
+                be defined at module level so that it can be sent to worker processes.
+
+        Returns:
+            The result of each run, in run order.
+        """
+        runs: List[Tuple[int, int]] = list(enumerate(self._settings.seeds))
+        if self._worker_count == 1:
+            return [simulate(scenario, run_index, seed) for run_index, seed in runs]
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # set the worker state before forking so that workers inherit it instead of receiving a copy
+            _initialize_worker(scenario, simulate)
+            try:
+                with multiprocessing.get_context('fork').Pool(self._worker_count) as pool:
+                    return pool.map(_run_in_worker, runs, chunksize=1)
+            finally:
+                _initialize_worker(None, None)
+
+        with multiprocessing.get_context().Pool(self._worker_count, initializer=_initialize_worker,
+                                                initargs=(scenario, simulate)) as pool:
+            return pool.map(_run_in_worker, runs, chunksize=1)
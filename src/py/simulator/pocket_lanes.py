@@ -0,0 +1,188 @@
+import numpy as np
+from enum import IntEnum
+from typing import Tuple
+from parameters.road_network import PocketSide, Pockets, RoadNetwork
+
+
+class TaperState(IntEnum):
+    """
+    The state of the pocket lanes on one side of a road over a station interval.
+    """
+    NONE = 0
+    OPENING = 1
+    CLOSING = 2
+
+
+class PocketLaneIndex:
+    """
+    Piecewise table of the lanes of every road by station, compiled from the roads' lanes and pockets.
+
+    The through lanes of a road, ordinals 0 to n - 1, exist over its whole length. A pocket adds lane-count lanes
+    from its start ordinate to its end ordinate: left pockets above the through lanes, from ordinal n upward, and
+    right pockets below them, from ordinal -1 downward, so that the ordinals of the through lanes do not change as
+    vehicles pass a pocket. Tapers lie within the pocket: its lanes are opening over the start-taper meters after
+    its start and closing over the end-taper meters before its end, and the closing taper wins where they overlap.
+    Overlapping pockets on the same side stack.
+
+    Each road is split into intervals at every pocket and taper boundary, and the intervals of all roads are held in
+    one table, road by road, with each road's stations shifted by the total length of the roads before it. The
+    interval of every position is then found with a single searchsorted call. The intervals of road i are
+    [interval_offsets[i], interval_offsets[i + 1]); the first starts at station 0 and the last runs past the end
+    of the road.
+    """
+    def __init__(self, through_lane_counts: np.ndarray, pockets: Pockets, road_lengths: np.ndarray):
+        """
+        Compiles the table.
+        Args:
+            through_lane_counts: The number of lanes of each road, as in Lanes.
+            pockets: The pockets of all roads.
+            road_lengths: The length of each road, in meters, which ordinates at end 'b' are resolved to.
+        """
+        road_count: int = len(road_lengths)
+        road_lengths = np.asarray(road_lengths, dtype=np.float64)
+        self._through_lane_counts: np.ndarray = np.asarray(through_lane_counts, dtype=np.int32)
+        self._road_starts: np.ndarray = np.concatenate([[0.0], np.cumsum(road_lengths)[:-1]])
+
+        pocket_roads: np.ndarray = np.repeat(np.arange(road_count), np.diff(pockets.road_offsets))
+        lengths: np.ndarray = road_lengths[pocket_roads]
+        starts: np.ndarray = np.clip(pockets.start_ordinates, 0.0, lengths)
+        ends: np.ndarray = np.clip(pockets.end_ordinates, 0.0, lengths)
+        closing_starts: np.ndarray = np.maximum(ends - np.nan_to_num(pockets.end_tapers), starts)
+        opening_ends: np.ndarray = np.minimum(starts + np.nan_to_num(pockets.start_tapers), closing_starts)
+        present: np.ndarray = ends > starts
+        pocket_roads, lengths = pocket_roads[present], lengths[present]
+        starts, ends = starts[present], ends[present]
+        closing_starts, opening_ends = closing_starts[present], opening_ends[present]
+        on_left: np.ndarray = pockets.sides[present] == PocketSide.LEFT
+        lane_counts: np.ndarray = pockets.lane_counts[present]
+
+        # intervals start at station 0 of every road and at every boundary inside a road
+        event_roads: np.ndarray = np.tile(pocket_roads, 4)
+        event_stations: np.ndarray = np.concatenate([starts, opening_ends, closing_starts, ends])
+        inside: np.ndarray = event_stations < np.tile(lengths, 4)
+        interval_roads: np.ndarray = np.concatenate([np.arange(road_count), event_roads[inside]])
+        interval_starts: np.ndarray = np.concatenate([np.zeros(road_count), event_stations[inside]])
+        ordered: np.ndarray = np.lexsort((interval_starts, interval_roads))
+        interval_roads, interval_starts = interval_roads[ordered], interval_starts[ordered]
+        distinct: np.ndarray = np.ones(len(interval_roads), dtype=np.bool_)
+        distinct[1:] = (np.diff(interval_roads) != 0) | (np.diff(interval_starts) != 0)
+        interval_roads, interval_starts = interval_roads[distinct], interval_starts[distinct]
+        self._interval_offsets: np.ndarray = np.searchsorted(interval_roads, np.arange(road_count + 1), side='left')
+        self._starts: np.ndarray = interval_starts
+        self._shifted_starts: np.ndarray = interval_starts + self._road_starts[interval_roads]
+
+        # each boundary changes the lanes and tapers from its interval on; boundaries at the road end change nothing
+        intervals: np.ndarray = self._intervals_at(event_roads[inside], event_stations[inside])
+        sides: np.ndarray = np.tile(np.where(on_left, 0, 1), 4)[inside]
+        counts: np.ndarray = np.tile(lane_counts, 4)[inside]
+        # changes of the lane count, opening tapers and closing tapers at starts, opening ends, closing starts, ends
+        steps: np.ndarray = np.repeat(np.array([[1, 0, 0, -1], [1, -1, 0, 0], [0, 0, 1, -1]]), len(starts), axis=1)
+        changes: np.ndarray = np.zeros((len(interval_starts), 2, 3), dtype=np.int64)
+        np.add.at(changes, (intervals, sides, 0), counts * steps[0, inside])
+        np.add.at(changes, (intervals, sides, 1), steps[1, inside])
+        np.add.at(changes, (intervals, sides, 2), steps[2, inside])
+        totals: np.ndarray = np.cumsum(changes, axis=0)
+        # restart the running totals at the first interval of every road
+        before_road: np.ndarray = (totals - changes)[self._interval_offsets[:-1]]
+        totals -= np.repeat(before_road, np.diff(self._interval_offsets), axis=0)
+
+        interval_through_counts: np.ndarray = self._through_lane_counts[interval_roads]
+        self._lowest_ordinals: np.ndarray = (-totals[:, 1, 0]).astype(np.int32)
+        self._lane_counts: np.ndarray = (interval_through_counts + totals[:, 0, 0] + totals[:, 1, 0]).astype(np.int32)
+        self._left_tapers: np.ndarray = _taper_states(totals[:, 0])
+        self._right_tapers: np.ndarray = _taper_states(totals[:, 1])
+
+    @classmethod
+    def from_network(cls, network: RoadNetwork):
+        return cls(np.diff(network.lanes.road_offsets), network.pockets, network.chain_geometry.road_lengths)
+
+    @property
+    def interval_offsets(self) -> np.ndarray:
+        return self._interval_offsets
+
+    @property
+    def starts(self) -> np.ndarray:
+        """
+        Returns the station at which each interval starts, in meters.
+        """
+        return self._starts
+
+    @property
+    def lane_counts(self) -> np.ndarray:
+        """
+        Returns the number of lanes over each interval, through lanes and pocket lanes.
+        """
+        return self._lane_counts
+
+    @property
+    def lowest_ordinals(self) -> np.ndarray:
+        """
+        Returns the ordinal of the rightmost lane over each interval. The lanes of interval i are the ordinals from
+        lowest_ordinals[i] to lowest_ordinals[i] + lane_counts[i] - 1.
+        """
+        return self._lowest_ordinals
+
+    @property
+    def left_tapers(self) -> np.ndarray:
+        """
+        Returns the TaperState value of the left pocket lanes over each interval.
+        """
+        return self._left_tapers
+
+    @property
+    def right_tapers(self) -> np.ndarray:
+        """
+        Returns the TaperState value of the right pocket lanes over each interval.
+        """
+        return self._right_tapers
+
+    def intervals_at(self, roads: np.ndarray, stations: np.ndarray) -> np.ndarray:
+        """
+        Finds the interval of each of a batch of positions.
+        Args:
+            roads: Road index of each position.
+            stations: Station of each position, in meters. Stations before the start of a road are in its first
+                interval, and stations beyond its end in its last.
+
+        Returns:
+            The index of each position's interval.
+        """
+        return self._intervals_at(np.asarray(roads, dtype=np.int64), np.asarray(stations, dtype=np.float64))
+
+    def lane_ranges(self, roads: np.ndarray, stations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the lowest and one past the highest lane ordinal at each of a batch of positions.
+        """
+        intervals: np.ndarray = self.intervals_at(roads, stations)
+        lowest: np.ndarray = self._lowest_ordinals[intervals]
+
+        return lowest, lowest + self._lane_counts[intervals]
+
+    def lane_exists(self, roads: np.ndarray, stations: np.ndarray, ordinals: np.ndarray) -> np.ndarray:
+        """
+        Checks whether lanes exist at a batch of positions.
+        Args:
+            roads: Road index of each check.
+            stations: Station of each check, in meters.
+            ordinals: Lane ordinal of each check.
+
+        Returns:
+            Whether each lane exists at its position.
+        """
+        lowest, highest = self.lane_ranges(roads, stations)
+
+        return (ordinals >= lowest) & (ordinals < highest)
+
+    def _intervals_at(self, roads: np.ndarray, stations: np.ndarray) -> np.ndarray:
+        intervals: np.ndarray = np.searchsorted(self._shifted_starts, self._road_starts[roads] + stations,
+                                                side='right') - 1
+        return np.clip(intervals, self._interval_offsets[roads], self._interval_offsets[roads + 1] - 1)
+
+
+def _taper_states(totals: np.ndarray) -> np.ndarray:
+    """
+    Returns the taper state of one side of each interval, from its running totals of lanes, opening tapers and
+    closing tapers.
+    """
+    return np.select([totals[:, 2] > 0, totals[:, 1] > 0], [TaperState.CLOSING, TaperState.OPENING],
+                     TaperState.NONE).astype(np.int8)
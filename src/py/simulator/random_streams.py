@@ -0,0 +1,76 @@
+import numpy as np
+from enum import Enum, unique
+from typing import Dict, List
+
+
+@unique
+class RandomSubsystem(Enum):
+    """
+    The stochastic parts of a run, each of which draws from its own random stream.
+    """
+    VEHICLE_ENTRY = 0
+    '''Vehicle entry times and congestion bypassing.'''
+    DISTRIBUTION_DRAWS = 1
+    '''Draws from parameter distributions, such as vehicle and driver characteristics.'''
+    LANE_SELECTION = 2
+    '''Choice of lanes on entry and during lane changing.'''
+
+
+class RandomStreams:
+    """
+    The random streams of one run.
+
+    Each run's seed, as given by the simulation settings, is turned into a numpy SeedSequence, and each subsystem
+    draws from a generator seeded by a child of that sequence identified by the subsystem. Streams therefore depend
+    only on the run's seed and the subsystem, never on which process makes the run or how many runs came before it,
+    and a subsystem drawing more or fewer numbers does not shift the numbers any other subsystem sees.
+    """
+    def __init__(self, seed: int):
+        """
+        Creates the streams of a run.
+        Args:
+            seed: The seed of the run. Negative seeds, which a negative seed increment can produce, are accepted.
+        """
+        self._seed: int = seed
+        # SeedSequence only takes non-negative entropy; use the two's complement so negative seeds stay distinct
+        self._seed_sequence: np.random.SeedSequence = np.random.SeedSequence(seed & 0xFFFF_FFFF_FFFF_FFFF)
+        self._generators: Dict[RandomSubsystem, np.random.Generator] = dict()
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    def _subsystem_sequence(self, subsystem: RandomSubsystem) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self._seed_sequence.entropy, spawn_key=(subsystem.value,))
+
+    def generator(self, subsystem: RandomSubsystem) -> np.random.Generator:
+        """
+        Returns the generator of a subsystem. The same generator is returned on every call, so draws continue
+        where the previous caller left off.
+        Args:
+            subsystem: The subsystem.
+
+        Returns:
+            The subsystem's generator.
+        """
+        if subsystem not in self._generators:
+            self._generators[subsystem] = np.random.Generator(np.random.PCG64(self._subsystem_sequence(subsystem)))
+
+        return self._generators[subsystem]
+
+    def spawn(self, subsystem: RandomSubsystem, count: int) -> List[np.random.Generator]:
+        """
+        Creates independent generators within a subsystem, for work that is split into parts whose draws must not
+        depend on the order in which the parts are processed. The same parts are created on every call.
+        Args:
+            subsystem: The subsystem.
+            count: The number of generators.
+
+        Returns:
+            The generators, one per part.
+        """
+        subsystem_sequence: np.random.SeedSequence = self._subsystem_sequence(subsystem)
+
+        return [np.random.Generator(np.random.PCG64(np.random.SeedSequence(
+                    subsystem_sequence.entropy, spawn_key=subsystem_sequence.spawn_key + (part,))))
+                for part in range(count)]
@@ -0,0 +1,205 @@
+import heapq
+import multiprocessing
+import os
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+from simulatedobjects.network_topology import NetworkTopologyGraph
+from simulator.scenario_cache import ScenarioCache
+from simulator.SimulatorLoggerWrapper import SimulatorLoggerWrapper
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+# graph state of a worker process, set before the workers are started (fork) or by the pool initializer (spawn)
+_worker_graph: Optional[NetworkTopologyGraph] = None
+_worker_zone_masks: Optional[np.ndarray] = None
+
+
+def _initialize_worker(graph: Optional[NetworkTopologyGraph], zone_masks: Optional[np.ndarray]) -> None:
+    global _worker_graph, _worker_zone_masks
+    _worker_graph = graph
+    _worker_zone_masks = zone_masks
+
+
+def _route_in_worker(zone: int) -> Tuple[np.ndarray, np.ndarray]:
+    return _shortest_paths_to(_worker_graph, _worker_zone_masks[zone])
+
+
+class RoutingTables:
+    """
+    Next-hop tables from every place a vehicle can be in the network to every destination zone.
+
+    A vehicle's place is identified by how it came onto its road: by the connection it entered through, or, for
+    vehicles that start on a road, by the road itself. The table rows are the connections of the topology graph
+    followed by one row per road for the start of the road. Vehicles only move forward along a road, so from a
+    connection that enters a road at some offset, only the connections leaving that road further downstream can be
+    taken. A zone is reached on entering any of its roads.
+
+    Each zone is routed with a backward Dijkstra search over the connections, zones being spread over worker
+    processes for large graphs. Vehicles then find their next connection with a table lookup.
+    """
+    NO_CONNECTION: int = -1
+    FORMAT_VERSION: int = 1
+    PARALLEL_THRESHOLD: int = 1 << 16
+    '''Smallest number of table cells (rows times zones) for which zones are routed in worker processes.'''
+
+    def __init__(self, next_connections: np.ndarray, distances: np.ndarray, connection_count: int):
+        self._next_connections: np.ndarray = next_connections
+        self._distances: np.ndarray = distances
+        self._connection_count: int = connection_count
+
+    @classmethod
+    def compute(cls, graph: NetworkTopologyGraph, zone_roads: Sequence[Sequence[int]],
+                worker_count: Optional[int] = None):
+        """
+        Routes every zone.
+        Args:
+            graph: The network topology.
+            zone_roads: The roads of each destination zone.
+            worker_count: The number of worker processes. Defaults to the number of processors for graphs of at
+                least PARALLEL_THRESHOLD table cells, and to one, meaning this process, below that.
+
+        Returns:
+            The tables.
+        """
+        zone_masks: np.ndarray = _zone_masks(graph.road_count, zone_roads)
+        cells: int = (len(graph.connections.to_roads) + graph.road_count) * len(zone_masks)
+        if worker_count is None:
+            worker_count = (os.cpu_count() or 1) if cells >= RoutingTables.PARALLEL_THRESHOLD else 1
+        worker_count = max(1, min(worker_count, len(zone_masks)))
+
+        zones: List[int] = list(range(len(zone_masks)))
+        if worker_count == 1:
+            results = [_shortest_paths_to(graph, zone_mask) for zone_mask in zone_masks]
+        elif 'fork' in multiprocessing.get_all_start_methods():
+            # set the worker state before forking so that workers inherit the graph instead of receiving a copy
+            _initialize_worker(graph, zone_masks)
+            try:
+                with multiprocessing.get_context('fork').Pool(worker_count) as pool:
+                    results = pool.map(_route_in_worker, zones)
+            finally:
+                _initialize_worker(None, None)
+        else:
+            with multiprocessing.get_context().Pool(worker_count, initializer=_initialize_worker,
+                                                    initargs=(graph, zone_masks)) as pool:
+                results = pool.map(_route_in_worker, zones)
+
+        row_count: int = len(graph.connections.to_roads) + graph.road_count
+        next_connections: np.ndarray = np.empty((row_count, len(zone_masks)), dtype=np.int32)
+        distances: np.ndarray = np.empty((row_count, len(zone_masks)), dtype=np.float64)
+        for zone, (zone_next_connections, zone_distances) in enumerate(results):
+            next_connections[:, zone] = zone_next_connections
+            distances[:, zone] = zone_distances
+
+        return cls(next_connections, distances, len(graph.connections.to_roads))
+
+    @classmethod
+    def load_or_compute(cls, cache: ScenarioCache, graph: NetworkTopologyGraph, zone_roads: Sequence[Sequence[int]],
+                        worker_count: Optional[int] = None):
+        """
+        Reads the tables from the cache if an entry exists for this graph and these zones, otherwise computes them
+        and stores them in the cache. Any change to the graph or the zones changes the key, so stale entries are
+        never read.
+        Args:
+            cache: The scenario cache.
+            graph: The network topology.
+            zone_roads: The roads of each destination zone.
+            worker_count: The number of worker processes, as for compute().
+
+        Returns:
+            The tables. Tables loaded from the cache are read-only.
+        """
+        connections = graph.connections
+        key: str = ScenarioCache.array_key(
+            [np.array([RoutingTables.FORMAT_VERSION, graph.road_count])] + list(connections) +
+            [_zone_masks(graph.road_count, zone_roads)])
+        entry = cache.load(key)
+        if entry is not None:
+            arrays, metadata = entry
+            return cls(arrays['next_connections'], arrays['distances'], metadata['connection_count'])
+
+        tables = cls.compute(graph, zone_roads, worker_count)
+        try:
+            cache.store(key, {'next_connections': tables._next_connections, 'distances': tables._distances},
+                        {'connection_count': tables._connection_count})
+        except OSError as error:
+            # the cache only saves time, so failing to write it must not stop the run
+            SimulatorLoggerWrapper.logger().warning(Localization.get_message('W0003', cache.directory, str(error)))
+
+        return tables
+
+    @property
+    def next_connections(self) -> np.ndarray:
+        """
+        Returns the connection to take next from each row toward each zone, with one column per zone. Holds
+        NO_CONNECTION where the row is already in the zone or the zone cannot be reached.
+        """
+        return self._next_connections
+
+    @property
+    def distances(self) -> np.ndarray:
+        """
+        Returns the distance along roads from each row to each zone, infinite where the zone cannot be reached.
+        """
+        return self._distances
+
+    def after_connections(self, connections: np.ndarray, zones: np.ndarray) -> np.ndarray:
+        """
+        Returns the next connection toward each zone of vehicles that entered their roads through connections.
+        """
+        return self._next_connections[connections, zones]
+
+    def from_road_starts(self, roads: np.ndarray, zones: np.ndarray) -> np.ndarray:
+        """
+        Returns the next connection toward each zone of vehicles starting at the upstream ends of roads.
+        """
+        return self._next_connections[self._connection_count + np.asarray(roads), zones]
+
+
+def _zone_masks(road_count: int, zone_roads: Sequence[Sequence[int]]) -> np.ndarray:
+    masks: np.ndarray = np.zeros((len(zone_roads), road_count), dtype=np.bool_)
+    for zone, roads in enumerate(zone_roads):
+        masks[zone, np.asarray(roads, dtype=np.int64)] = True
+
+    return masks
+
+
+def _shortest_paths_to(graph: NetworkTopologyGraph, zone_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Backward Dijkstra search from a zone. Rows are the graph's connections followed by the starts of the roads,
+    which behave as connections entering their roads at offset zero.
+    """
+    connections = graph.connections
+    connection_count: int = len(connections.to_roads)
+    entered_roads: np.ndarray = np.concatenate([connections.to_roads, np.arange(graph.road_count)])
+    entry_offsets: np.ndarray = np.concatenate([connections.to_offsets, np.zeros(graph.road_count)])
+
+    distances: np.ndarray = np.full(len(entered_roads), np.inf)
+    next_connections: np.ndarray = np.full(len(entered_roads), RoutingTables.NO_CONNECTION, dtype=np.int32)
+    arrived: np.ndarray = zone_mask[entered_roads]
+    distances[arrived] = 0.0
+    heap: List[Tuple[float, int]] = [(0.0, int(row)) for row in np.flatnonzero(arrived)]
+    heapq.heapify(heap)
+    settled: np.ndarray = np.zeros(len(entered_roads), dtype=np.bool_)
+
+    while heap:
+        distance, row = heapq.heappop(heap)
+        if settled[row]:
+            continue
+        settled[row] = True
+        if row >= connection_count:
+            # road starts cannot be reached from anywhere else
+            continue
+
+        # rows entering the road this connection leaves, upstream of where it leaves
+        from_road: int = int(connections.from_roads[row])
+        from_offset: float = float(connections.from_offsets[row])
+        incoming: np.ndarray = graph.incoming(from_road)
+        upstream: int = int(np.searchsorted(connections.to_offsets[incoming], from_offset, side='right'))
+        candidates: np.ndarray = np.concatenate([[connection_count + from_road], incoming[:upstream]])
+        new_distances: np.ndarray = distance + from_offset - entry_offsets[candidates]
+        improved: np.ndarray = (new_distances < distances[candidates]) & ~arrived[candidates]
+        for candidate, new_distance in zip(candidates[improved], new_distances[improved]):
+            distances[candidate] = new_distance
+            next_connections[candidate] = row
+            heapq.heappush(heap, (float(new_distance), int(candidate)))
+
+    return next_connections, distances
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from parameters import behaviors, lane_usage, road_network, vehicle_types
+from parameters.behaviors import Behaviors, FritzscheParameters, HidasParameters
+from parameters.lane_usage import LaneUsage
+from parameters.road_network import Lanes, Pockets, RoadNetwork, Roads, VehicleEntries
+from parameters.vehicle_types import VehicleTypes
+from simulator.SimulatorLoggerWrapper import SimulatorLoggerWrapper
+from simulator.xml_validation import XmlValidation
+from i18n_l10n.temporary_i18n_bridge import Localization
+
+
+class ScenarioCache:
+    """
+    On-disk cache of fully loaded scenario data, so that repeated runs of an unchanged scenario skip XML parsing
+    and validation.
+
+    Entries are keyed by a hash of the contents of the input files and of the schemas they are validated against.
+    Each entry is a directory holding one .npy file per array and a JSON metadata header for everything else.
+    Arrays are memory-mapped read-only when an entry is loaded, so loading costs little more than opening the files
+    and pages are shared between processes running the same scenario.
+
+    Network, behavior, vehicle types and lane usage files are cached, being the ones loaded into arrays. The other
+    scenario files are small and are parsed directly.
+    """
+    FORMAT_VERSION: int = 1
+    METADATA_FILE: str = 'metadata.json'
+
+    def __init__(self, directory: str):
+        """
+        Creates a cache in a directory, which is created if it does not exist.
+        Args:
+            directory: The cache directory.
+        """
+        self._directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def content_key(paths: Iterable[str], loader_version: int = 0) -> str:
+        """
+        Computes the cache key for a set of input files. The key changes if any file's contents change, if the
+        cache format changes, or if the version of the loader that reads the files changes.
+        Args:
+            paths: The input files, in a fixed order.
+            loader_version: The version of the loader, such as road_network.LOADER_VERSION.
+
+        Returns:
+            The key, as a hexadecimal string.
+        """
+        digest = hashlib.sha256(f'{ScenarioCache.FORMAT_VERSION}.{loader_version}'.encode())
+        for path in paths:
+            with open(path, 'rb') as file:
+                for block in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(block)
+            # separate files so that moving bytes from one file to the next changes the key
+            digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def array_key(arrays: Iterable[np.ndarray]) -> str:
+        """
+        Computes the cache key for data derived from arrays rather than read from files, such as tables computed
+        from a loaded network.
+        Args:
+            arrays: The arrays the data is derived from, in a fixed order.
+
+        Returns:
+            The key, as a hexadecimal string.
+        """
+        digest = hashlib.sha256(str(ScenarioCache.FORMAT_VERSION).encode())
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            # the type and shape are part of the key, so that the same bytes read differently do not collide
+            digest.update(f'{array.dtype.str}{array.shape}'.encode())
+            digest.update(array.tobytes())
+
+        return digest.hexdigest()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray], metadata: Dict) -> None:
+        """
+        Writes an entry. The entry is written to a temporary directory and renamed into place, so concurrent
+        readers see either the whole entry or none of it.
+        Args:
+            key: The entry's key.
+            arrays: The arrays of the entry, by name.
+            metadata: JSON-serializable data stored alongside the arrays.
+
+        Returns:
+            nothing
+        """
+        staging: str = tempfile.mkdtemp(dir=self._directory)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, name + '.npy'), np.ascontiguousarray(array), allow_pickle=False)
+            with open(os.path.join(staging, ScenarioCache.METADATA_FILE), 'w') as file:
+                json.dump({'format-version': ScenarioCache.FORMAT_VERSION, 'arrays': sorted(arrays),
+                           'metadata': metadata}, file)
+            os.replace(staging, self._entry_path(key))
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(self._entry_path(key)):
+                raise
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict]]:
+        """
+        Reads an entry.
+        Args:
+            key: The entry's key.
+
+        Returns:
+            The memory-mapped arrays and the metadata of the entry, or None if there is no usable entry for the key.
+        """
+        entry_path: str = self._entry_path(key)
+        try:
+            with open(os.path.join(entry_path, ScenarioCache.METADATA_FILE)) as file:
+                header: Dict = json.load(file)
+            if header['format-version'] != ScenarioCache.FORMAT_VERSION:
+                return None
+            arrays: Dict[str, np.ndarray] = {
+                name: np.load(os.path.join(entry_path, name + '.npy'), mmap_mode='r', allow_pickle=False)
+                for name in header['arrays']
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        return arrays, header['metadata']
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._directory, key)
+
+    def load_network(self, filename: str) -> RoadNetwork:
+        """
+        Loads a network file, from the cache if an entry exists for its contents, otherwise by parsing it and
+        storing the result in the cache.
+        Args:
+            filename: The network file.
+
+        Returns:
+            The network. Arrays of a network loaded from the cache are read-only.
+        """
+        return self._load_file(filename, XmlValidation.NETWORK_XSD, road_network.LOADER_VERSION,
+                               road_network.process_file, _network_to_entry, _network_from_entry)
+
+    def load_behaviors(self, filename: str) -> Behaviors:
+        """
+        Loads a behavior file through the cache, as load_network() does for network files.
+        """
+        return self._load_file(filename, XmlValidation.BEHAVIOR_XSD, behaviors.LOADER_VERSION,
+                               behaviors.process_file, _behaviors_to_entry, _behaviors_from_entry)
+
+    def load_vehicle_types(self, filename: str) -> VehicleTypes:
+        """
+        Loads a vehicle types file through the cache, as load_network() does for network files.
+        """
+        return self._load_file(filename, XmlValidation.VEHICLE_TYPES_XSD, vehicle_types.LOADER_VERSION,
+                               vehicle_types.process_file, _vehicle_types_to_entry, _vehicle_types_from_entry)
+
+    def load_lane_usage(self, filename: str) -> LaneUsage:
+        """
+        Loads a lane usage file through the cache, as load_network() does for network files.
+        """
+        return self._load_file(filename, XmlValidation.LANE_USAGE_XSD, lane_usage.LOADER_VERSION,
+                               lane_usage.process_file, _lane_usage_to_entry, _lane_usage_from_entry)
+
+    def _load_file(self, filename: str, schema: str, loader_version: int, process_file: Callable,
+                   to_entry: Callable, from_entry: Callable):
+        key: str = ScenarioCache.content_key([filename, schema], loader_version)
+        entry = self.load(key)
+        if entry is not None:
+            try:
+                return from_entry(*entry)
+            except (TypeError, KeyError, ValueError):
+                # written with other fields than this version reads; replace it
+                shutil.rmtree(self._entry_path(key), ignore_errors=True)
+
+        loaded = process_file(filename)
+        try:
+            self.store(key, *to_entry(loaded))
+        except OSError as error:
+            # the cache only saves time, so failing to write it must not stop the run
+            SimulatorLoggerWrapper.logger().warning(Localization.get_message('W0003', self._directory, str(error)))
+
+        return loaded
+
+
+_NETWORK_RECORDS: Tuple[Tuple[str, type], ...] = (
+    ('roads', Roads),
+    ('lanes', Lanes),
+    ('pockets', Pockets),
+    ('entries', VehicleEntries),
+)
+_NETWORK_UUID_LISTS: Tuple[str, ...] = ('behavior_uuids', 'policy_uuids', 'vehicle_type_uuids')
+
+
+def _network_to_entry(network: RoadNetwork) -> Tuple[Dict[str, np.ndarray], Dict]:
+    arrays: Dict[str, np.ndarray] = dict()
+    metadata: Dict = dict()
+    for record_name, _ in _NETWORK_RECORDS:
+        _record_to_entry(record_name, getattr(network, record_name), arrays, metadata)
+    for list_name in _NETWORK_UUID_LISTS:
+        metadata[list_name] = getattr(network, list_name)
+
+    return arrays, metadata
+
+
+def _network_from_entry(arrays: Dict[str, np.ndarray], metadata: Dict) -> RoadNetwork:
+    records = [_record_from_entry(record_name, record_type, arrays, metadata)
+               for record_name, record_type in _NETWORK_RECORDS]
+
+    return RoadNetwork(*records, *[metadata[list_name] for list_name in _NETWORK_UUID_LISTS])
+
+
+def _behaviors_to_entry(loaded: Behaviors) -> Tuple[Dict[str, np.ndarray], Dict]:
+    arrays: Dict[str, np.ndarray] = {
+        'following_model': loaded.following_model,
+        'lane_change_model': loaded.lane_change_model,
+        'default_driving_behavior': loaded.default_driving_behavior,
+    }
+    metadata: Dict = {
+        'driving_behavior_uuids': loaded.driving_behavior_uuids,
+        'road_behavior_uuids': loaded.road_behavior_uuids,
+        'road_behavior_exceptions': loaded.road_behavior_exceptions,
+    }
+    _record_to_entry('car_following', loaded.car_following, arrays, metadata)
+    _record_to_entry('lane_change', loaded.lane_change, arrays, metadata)
+
+    return arrays, metadata
+
+
+def _behaviors_from_entry(arrays: Dict[str, np.ndarray], metadata: Dict) -> Behaviors:
+    return Behaviors(
+        _record_from_entry('car_following', FritzscheParameters, arrays, metadata),
+        _record_from_entry('lane_change', HidasParameters, arrays, metadata),
+        metadata['driving_behavior_uuids'], arrays['following_model'], arrays['lane_change_model'],
+        metadata['road_behavior_uuids'], arrays['default_driving_behavior'],
+        # JSON turns the exception tuples into lists
+        [(int(road_index), int(driving_index), list(group_uuids))
+         for road_index, driving_index, group_uuids in metadata['road_behavior_exceptions']])
+
+
+def _vehicle_types_to_entry(loaded: VehicleTypes) -> Tuple[Dict[str, np.ndarray], Dict]:
+    # group uuids are kept in a list of their own, since the arrays come back in no particular order
+    group_uuids: List[str] = list(loaded.group_members)
+    arrays: Dict[str, np.ndarray] = {
+        'group_members.' + str(index): loaded.group_members[group_uuid] for index, group_uuid in enumerate(group_uuids)}
+
+    return arrays, {'uuids': loaded.uuids, 'names': loaded.names, 'sharing': loaded.sharing,
+                    'group_uuids': group_uuids}
+
+
+def _vehicle_types_from_entry(arrays: Dict[str, np.ndarray], metadata: Dict) -> VehicleTypes:
+    return VehicleTypes(metadata['uuids'], metadata['names'], metadata['sharing'], {
+        group_uuid: arrays['group_members.' + str(index)] for index, group_uuid in enumerate(metadata['group_uuids'])})
+
+
+def _lane_usage_to_entry(loaded: LaneUsage) -> Tuple[Dict[str, np.ndarray], Dict]:
+    return {'starts_all_allowed': loaded.starts_all_allowed}, \
+        {'uuids': loaded.uuids, 'names': loaded.names, 'exception_groups': loaded.exception_groups}
+
+
+def _lane_usage_from_entry(arrays: Dict[str, np.ndarray], metadata: Dict) -> LaneUsage:
+    return LaneUsage(metadata['uuids'], metadata['names'], arrays['starts_all_allowed'],
+                     metadata['exception_groups'])
+
+
+def _record_to_entry(record_name: str, record: NamedTuple, arrays: Dict[str, np.ndarray], metadata: Dict) -> None:
+    # record fields holding arrays become cache arrays; the lists of strings go into the metadata
+    for field, value in zip(record._fields, record):
+        if isinstance(value, np.ndarray):
+            arrays[record_name + '.' + field] = value
+        else:
+            metadata[record_name + '.' + field] = value
+
+
+def _record_from_entry(record_name: str, record_type: type, arrays: Dict[str, np.ndarray],
+                       metadata: Dict) -> NamedTuple:
+    prefix: str = record_name + '.'
+    fields: Dict = {name[len(prefix):]: value for name, value in list(arrays.items()) + list(metadata.items())
+                    if name.startswith(prefix)}
+    if set(fields) != set(record_type._fields):
+        # written for a record with other fields
+        raise KeyError(record_type.__name__)
+
+    return record_type(**fields)
@@ -0,0 +1,209 @@
+import numpy as np
+from typing import Optional, Tuple
+
+
+class SegmentGrid:
+    """
+    Uniform grid index over the segments of all road chains, for finding the segments near points and within
+    boxes without scanning every segment.
+
+    Each segment is listed in every cell its bounding box overlaps, and the lists of all cells are packed into one
+    array with cell offsets, so the index is built with a handful of sorts regardless of the number of segments.
+    Queries gather the lists of the cells they touch in one batch and test the candidates exactly. Nearest segment
+    queries search rings of cells outward from each point, until no unsearched cell can hold a nearer segment.
+    """
+    NO_SEGMENT: int = -1
+    MAXIMUM_CELLS_PER_SEGMENT: int = 4
+
+    def __init__(self, chain_offsets: np.ndarray, chain_points: np.ndarray, cell_size: Optional[float] = None):
+        """
+        Builds the index.
+        Args:
+            chain_offsets: Offsets of each chain's points in chain_points, as in Roads.
+            chain_points: Points of all chains, as an (n, 2) array of x, y.
+            cell_size: Width and height of the cells, in the units of the points. Defaults to the mean size of the
+                segments' bounding boxes. The cells are enlarged if there would be more than
+                MAXIMUM_CELLS_PER_SEGMENT cells per segment.
+        """
+        chain_offsets = np.asarray(chain_offsets, dtype=np.int64)
+        # segments are numbered as in ChainGeometry: road by road, in chain order
+        is_chain_start: np.ndarray = np.zeros(len(chain_points), dtype=np.bool_)
+        is_chain_start[chain_offsets[:-1][np.diff(chain_offsets) > 0]] = True
+        segment_ends: np.ndarray = np.flatnonzero(~is_chain_start)
+        self._starts: np.ndarray = chain_points[segment_ends - 1]
+        self._ends: np.ndarray = chain_points[segment_ends]
+        self._segment_roads: np.ndarray = np.repeat(
+            np.arange(len(chain_offsets) - 1), np.maximum(np.diff(chain_offsets) - 1, 0))
+        self._lower: np.ndarray = np.minimum(self._starts, self._ends)
+        self._upper: np.ndarray = np.maximum(self._starts, self._ends)
+
+        segment_count: int = len(segment_ends)
+        self._origin: np.ndarray = self._lower.min(axis=0) if segment_count else np.zeros(2)
+        extent: np.ndarray = (self._upper.max(axis=0) if segment_count else np.zeros(2)) - self._origin
+        if cell_size is None:
+            cell_size = float(np.mean(np.max(self._upper - self._lower, axis=1))) if segment_count else 1.0
+        smallest_cell: float = float(np.sqrt(
+            (extent[0] + 1.0) * (extent[1] + 1.0) / max(1, segment_count * SegmentGrid.MAXIMUM_CELLS_PER_SEGMENT)))
+        self._cell_size: float = max(cell_size, smallest_cell, np.finfo(np.float64).tiny)
+        self._shape: np.ndarray = (extent // self._cell_size).astype(np.int64) + 1
+
+        # (cell, segment) pairs for every cell of every segment's bounding box
+        lower_cells: np.ndarray = self._cells_of(self._lower)
+        upper_cells: np.ndarray = self._cells_of(self._upper)
+        spans: np.ndarray = upper_cells - lower_cells + 1
+        pair_segments: np.ndarray = np.repeat(np.arange(segment_count), spans[:, 0] * spans[:, 1])
+        within: np.ndarray = np.arange(len(pair_segments)) - np.repeat(
+            np.cumsum(spans[:, 0] * spans[:, 1]) - spans[:, 0] * spans[:, 1], spans[:, 0] * spans[:, 1])
+        pair_x: np.ndarray = lower_cells[pair_segments, 0] + within % spans[pair_segments, 0]
+        pair_y: np.ndarray = lower_cells[pair_segments, 1] + within // spans[pair_segments, 0]
+        pair_cells: np.ndarray = pair_y * self._shape[0] + pair_x
+        by_cell: np.ndarray = np.argsort(pair_cells, kind='stable')
+        self._cell_segments: np.ndarray = pair_segments[by_cell]
+        self._cell_offsets: np.ndarray = np.searchsorted(
+            pair_cells[by_cell], np.arange(self._shape[0] * self._shape[1] + 1), side='left')
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._starts)
+
+    @property
+    def segment_roads(self) -> np.ndarray:
+        """
+        Returns the road index of each segment.
+        """
+        return self._segment_roads
+
+    def nearest_segments(self, points: np.ndarray,
+                         maximum_distance: float = np.inf) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the segment nearest to each of a batch of points.
+        Args:
+            points: The points, as an (n, 2) array of x, y.
+            maximum_distance: Distance beyond which segments are not searched for.
+
+        Returns:
+            The index of each point's nearest segment, or NO_SEGMENT if there is none within maximum_distance; the
+            distance to it, infinite where there is none; and the fraction of the segment's length from its start
+            to the point on it nearest to the query point.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        best_segments: np.ndarray = np.full(len(points), SegmentGrid.NO_SEGMENT, dtype=np.int64)
+        best_distances: np.ndarray = np.full(len(points), np.inf)
+        best_fractions: np.ndarray = np.zeros(len(points))
+        if self.segment_count == 0:
+            return best_segments, best_distances, best_fractions
+
+        # centers are clamped into the grid; the distance bound below holds for points outside it as well
+        centers: np.ndarray = np.clip(self._cells_of(points), 0, self._shape - 1)
+        active: np.ndarray = np.arange(len(points))
+        ring: int = 0
+        while len(active) and ring <= self._shape.max():
+            offsets: np.ndarray = _ring_offsets(ring)
+            queries: np.ndarray = np.repeat(active, len(offsets))
+            cells: np.ndarray = centers[queries] + np.tile(offsets, (len(active), 1))
+            queries, segments = self._gather(queries, cells)
+            distances, fractions = self._distances(points[queries], segments)
+
+            # nearest candidate of each query in this ring
+            ordered: np.ndarray = np.lexsort((distances, queries))
+            first: np.ndarray = ordered[np.unique(queries[ordered], return_index=True)[1]]
+            better: np.ndarray = distances[first] < best_distances[queries[first]]
+            improved: np.ndarray = queries[first][better]
+            best_segments[improved] = segments[first][better]
+            best_distances[improved] = distances[first][better]
+            best_fractions[improved] = fractions[first][better]
+
+            # segments in unsearched cells are at least ring cells away
+            reach: float = ring * self._cell_size
+            active = active[(best_distances[active] > reach) & (reach < maximum_distance)]
+            ring += 1
+
+        beyond: np.ndarray = best_distances > maximum_distance
+        best_segments[beyond] = SegmentGrid.NO_SEGMENT
+        best_distances[beyond] = np.inf
+        best_fractions[beyond] = 0.0
+
+        return best_segments, best_distances, best_fractions
+
+    def segments_in_boxes(self, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the segments whose bounding boxes overlap each of a batch of boxes.
+        Args:
+            boxes: The boxes, as an (n, 4) array of minimum x, minimum y, maximum x, maximum y.
+
+        Returns:
+            Offsets and segment indices: the segments of box i are segments[offsets[i]:offsets[i + 1]], in
+            ascending order.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        if self.segment_count == 0:
+            return np.zeros(len(boxes) + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        lower_cells: np.ndarray = np.clip(self._cells_of(boxes[:, :2]), 0, self._shape - 1)
+        upper_cells: np.ndarray = np.clip(self._cells_of(boxes[:, 2:]), 0, self._shape - 1)
+        spans: np.ndarray = np.where(np.all(boxes[:, 2:] >= boxes[:, :2], axis=1)[:, np.newaxis],
+                                     upper_cells - lower_cells + 1, 0)
+        cell_counts: np.ndarray = spans[:, 0] * spans[:, 1]
+        queries: np.ndarray = np.repeat(np.arange(len(boxes)), cell_counts)
+        within: np.ndarray = np.arange(len(queries)) - np.repeat(np.cumsum(cell_counts) - cell_counts, cell_counts)
+        cells: np.ndarray = lower_cells[queries] + np.stack(
+            [within % np.maximum(spans[queries, 0], 1), within // np.maximum(spans[queries, 0], 1)], axis=1)
+        queries, segments = self._gather(queries, cells)
+
+        overlapping: np.ndarray = np.all((self._lower[segments] <= boxes[queries, 2:]) &
+                                         (self._upper[segments] >= boxes[queries, :2]), axis=1)
+        pairs: np.ndarray = np.unique(
+            queries[overlapping] * self.segment_count + segments[overlapping])
+        box_of_pair: np.ndarray = pairs // self.segment_count
+
+        return (np.searchsorted(box_of_pair, np.arange(len(boxes) + 1), side='left'),
+                pairs % self.segment_count)
+
+    def _cells_of(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self._origin) / self._cell_size).astype(np.int64)
+
+    def _gather(self, queries: np.ndarray, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Expands (query, cell) pairs into (query, segment) pairs for the segments listed in each cell. Cells outside
+        the grid hold no segments.
+        """
+        inside: np.ndarray = np.all((cells >= 0) & (cells < self._shape), axis=1)
+        queries, cells = queries[inside], cells[inside]
+        cell_ids: np.ndarray = cells[:, 1] * self._shape[0] + cells[:, 0]
+        starts: np.ndarray = self._cell_offsets[cell_ids]
+        counts: np.ndarray = self._cell_offsets[cell_ids + 1] - starts
+        positions: np.ndarray = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+        return np.repeat(queries, counts), self._cell_segments[positions]
+
+    def _distances(self, points: np.ndarray, segments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        starts: np.ndarray = self._starts[segments]
+        directions: np.ndarray = self._ends[segments] - starts
+        squared_lengths: np.ndarray = np.einsum('ij,ij->i', directions, directions)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fractions: np.ndarray = np.where(
+                squared_lengths > 0.0,
+                np.clip(np.einsum('ij,ij->i', points - starts, directions) / squared_lengths, 0.0, 1.0), 0.0)
+        nearest: np.ndarray = starts + fractions[:, np.newaxis] * directions
+
+        return np.hypot(*(points - nearest).T), fractions
+
+
+def _ring_offsets(ring: int) -> np.ndarray:
+    """
+    Returns the (x, y) offsets of the cells at Chebyshev distance ring from a cell.
+    """
+    if ring == 0:
+        return np.zeros((1, 2), dtype=np.int64)
+    side: np.ndarray = np.arange(-ring, ring + 1)
+    inner: np.ndarray = np.arange(-ring + 1, ring)
+
+    return np.concatenate([
+        np.stack([side, np.full_like(side, -ring)], axis=1),
+        np.stack([side, np.full_like(side, ring)], axis=1),
+        np.stack([np.full_like(inner, -ring), inner], axis=1),
+        np.stack([np.full_like(inner, ring), inner], axis=1),
+    ])
@@ -0,0 +1,73 @@
+import numpy as np
+from typing import Optional, Tuple
+from parameters.chain_geometry import ChainGeometry
+from parameters.road_network import RoadNetwork
+
+
+class StationProjector:
+    """
+    Converts batches of road-local positions (road, station, lateral offset) to world x, y and heading.
+
+    The segments of all roads are held in one flat table, road by road, with each road's stations shifted by the
+    total length of the roads before it. The shifted stations increase through the whole table, so the segment of
+    every position is found with a single searchsorted call, and the projection itself is plain arithmetic on
+    gathered segment columns.
+
+    Lateral offsets are positive to the left of the direction of travel. Stations before the start or beyond the
+    end of a road are extrapolated along its first or last segment.
+    """
+    def __init__(self, chain_offsets: np.ndarray, chain_points: np.ndarray,
+                 geometry: Optional[ChainGeometry] = None):
+        """
+        Creates a projector.
+        Args:
+            chain_offsets: Offsets of each chain's points in chain_points, as in Roads.
+            chain_points: Points of all chains, as an (n, 2) array of x, y.
+            geometry: The geometry of the chains, if already computed.
+        """
+        if geometry is None:
+            geometry = ChainGeometry.from_chains(chain_offsets, chain_points)
+        self._segment_offsets: np.ndarray = geometry.segment_offsets
+        segment_roads: np.ndarray = np.repeat(np.arange(len(self._segment_offsets) - 1),
+                                              np.diff(self._segment_offsets))
+        self._road_starts: np.ndarray = np.concatenate([[0.0], np.cumsum(geometry.road_lengths)[:-1]])
+        self._shifted_ends: np.ndarray = geometry.end_stations + self._road_starts[segment_roads]
+        self._start_stations: np.ndarray = geometry.start_stations
+        # segment j of road r starts at chain point j + r
+        self._start_points: np.ndarray = np.asarray(chain_points)[np.arange(len(segment_roads)) + segment_roads]
+        self._cosines: np.ndarray = np.cos(geometry.headings)
+        self._sines: np.ndarray = np.sin(geometry.headings)
+        self._headings: np.ndarray = geometry.headings
+
+    @classmethod
+    def from_network(cls, network: RoadNetwork):
+        return cls(network.roads.chain_offsets, network.roads.chain_points, network.chain_geometry)
+
+    def project(self, roads: np.ndarray, stations: np.ndarray,
+                lateral_offsets: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Projects road-local positions to world coordinates.
+        Args:
+            roads: Road index of each position.
+            stations: Station of each position, in the units of the chain points.
+            lateral_offsets: Distance of each position to the left of the chain, in the same units. Defaults to
+                positions on the chain.
+
+        Returns:
+            The x, y and heading, in radians anticlockwise from east, of each position.
+        """
+        roads = np.asarray(roads, dtype=np.int64)
+        stations = np.asarray(stations, dtype=np.float64)
+        segments: np.ndarray = np.searchsorted(self._shifted_ends, self._road_starts[roads] + stations, side='right')
+        segments = np.clip(segments, self._segment_offsets[roads], self._segment_offsets[roads + 1] - 1)
+
+        along: np.ndarray = stations - self._start_stations[segments]
+        cosines: np.ndarray = self._cosines[segments]
+        sines: np.ndarray = self._sines[segments]
+        x: np.ndarray = self._start_points[segments, 0] + along * cosines
+        y: np.ndarray = self._start_points[segments, 1] + along * sines
+        if lateral_offsets is not None:
+            x -= lateral_offsets * sines
+            y += lateral_offsets * cosines
+
+        return x, y, self._headings[segments]
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from parameters.behaviors import Behaviors
+from test_support.xml_fixtures import create_behaviors_document
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulator.car_following import CarFollowingEngine, FollowingRegime, fritzsche_accelerations
+
+TIME_STEP = 0.1
+
+
+class TestsForCarFollowing(unittest.TestCase):
+    def setUp(self) -> None:
+        self._behaviors: Behaviors = Behaviors.from_xml(create_behaviors_document())
+
+    def _evaluate(self, gap: float, speed: float, leader_speed: float, previous_acceleration: float = 0.0,
+                  desired_speed: float = 25.0, maximum_deceleration: float = 7.0):
+        regimes, accelerations = fritzsche_accelerations(
+            self._behaviors.car_following, np.array([0]), np.array([gap]), np.array([speed]),
+            np.array([leader_speed]), np.array([previous_acceleration]), np.array([desired_speed]),
+            np.array([2.0]), np.array([maximum_deceleration]), TIME_STEP)
+        return FollowingRegime(regimes[0]), float(accelerations[0])
+
+    def test_free_driving(self):
+        self.assertEqual(self._evaluate(np.inf, 10.0, 0.0), (FollowingRegime.FREE_DRIVING, 2.0))
+        regime, acceleration = self._evaluate(np.inf, 24.95, 0.0)
+        self.assertEqual(regime, FollowingRegime.FREE_DRIVING)
+        self.assertAlmostEqual(acceleration, 0.5)
+        self.assertEqual(self._evaluate(np.inf, 25.0, 0.0)[1], -0.2)
+
+    def test_danger(self):
+        # risky distance is 1.5 m + 0.5 s * 10 m/s
+        self.assertEqual(self._evaluate(5.0, 10.0, 10.0), (FollowingRegime.DANGER, -7.0))
+
+    def test_closing_in(self):
+        regime, acceleration = self._evaluate(30.0, 20.0, 10.0)
+        self.assertEqual(regime, FollowingRegime.CLOSING_IN)
+        self.assertAlmostEqual(acceleration, -100.0 / (2.0 * (30.0 - 6.5 - 1.0)))
+
+    def test_following_ii(self):
+        self.assertEqual(self._evaluate(60.0, 20.0, 10.0)[0], FollowingRegime.FOLLOWING_II)
+
+    def test_closing_in_boundary(self):
+        # desired distance is 1.5 m + 2.2 s * 20 m/s, more than the braking distance 6.5 m + 10² / (2 * 7) m
+        self.assertEqual(self._evaluate(45.4, 20.0, 10.0)[0], FollowingRegime.CLOSING_IN)
+        self.assertEqual(self._evaluate(45.6, 20.0, 10.0)[0], FollowingRegime.FOLLOWING_II)
+        # braking at 1 m/s², the braking distance 6.5 m + 10² / (2 * 1) m is the larger
+        self.assertEqual(self._evaluate(56.4, 20.0, 10.0, maximum_deceleration=1.0)[0], FollowingRegime.CLOSING_IN)
+        self.assertEqual(self._evaluate(56.6, 20.0, 10.0, maximum_deceleration=1.0)[0],
+                         FollowingRegime.FOLLOWING_II)
+
+    def test_vehicles_that_cannot_brake(self):
+        with np.errstate(all='raise'):
+            regime, acceleration = self._evaluate(60.0, 20.0, 10.0, maximum_deceleration=0.0)
+        self.assertEqual(regime, FollowingRegime.CLOSING_IN)
+        self.assertEqual(acceleration, 0.0)
+
+    def test_following_i_keeps_drift_direction(self):
+        # between risky (6.5 m) and desired (23.5 m) distances at the leader's speed
+        self.assertEqual(self._evaluate(10.0, 10.0, 10.0, -0.4), (FollowingRegime.FOLLOWING_I, -0.2))
+        self.assertEqual(self._evaluate(10.0, 10.0, 10.0, 0.4), (FollowingRegime.FOLLOWING_I, 0.2))
+
+    def test_vehicles_do_not_reverse(self):
+        self.assertAlmostEqual(self._evaluate(0.1, 0.3, 0.0)[1], -3.0)
+
+    def test_engine_updates_in_network_vehicles(self):
+        store: VehicleStateStore = VehicleStateStore(capacity=4)
+        for vehicle_id in range(3):
+            slot: int = store.allocate(vehicle_id, SimulatedObjectStatus.IN_NETWORK)
+            store.driving_behavior[slot] = 0
+            store.speed[slot] = 10.0
+            store.desired_speed[slot] = 25.0
+            store.normal_acceleration[slot] = 2.0
+            store.maximum_deceleration[slot] = 7.0
+        store.set_status(1, SimulatedObjectStatus.QUEUED_TO_ENTER)
+        slots: np.ndarray = store.indices(SimulatedObjectStatus.IN_NETWORK).copy()
+
+        regimes: np.ndarray = CarFollowingEngine(self._behaviors, TIME_STEP).step(
+            store, np.array([np.inf, 5.0]), np.array([0.0, 10.0]))
+        np.testing.assert_array_equal(regimes, [FollowingRegime.FREE_DRIVING, FollowingRegime.DANGER])
+        np.testing.assert_array_equal(store.acceleration[slots], [2.0, -7.0])
+        self.assertEqual(store.acceleration[1], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import numpy as np
+from parameters.behaviors import Behaviors, HidasDefaults
+from parameters.road_network import RoadNetwork
+from test_support.xml_fixtures import create_behaviors_document
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulator.lane_changing import LaneChangeDecisions, LaneChangeDirection, LaneChangeEngine
+from simulator.lane_index import LanePositionIndex
+
+NO_LANE = RoadNetwork.NO_LANE
+LEFT = LaneChangeDirection.LEFT
+RIGHT = LaneChangeDirection.RIGHT
+
+
+class TestsForLaneChanging(unittest.TestCase):
+    def setUp(self) -> None:
+        # one road with three lanes, lane 0 on the right
+        self._may_move_left: np.ndarray = np.array([True, True, True])
+        self._engine: LaneChangeEngine = LaneChangeEngine(
+            Behaviors.from_xml(create_behaviors_document()), np.array([1, 2, NO_LANE]), np.array([NO_LANE, 0, 1]),
+            self._may_move_left, np.array([True, True, True]))
+        self._store: VehicleStateStore = VehicleStateStore(capacity=8)
+        self._vehicle_count: int = 0
+        # candidate in lane 0, with a leader and a follower in lane 1
+        for lane, position, speed in [(0, 100.0, 20.0), (1, 130.0, 20.0), (1, 80.0, 20.0)]:
+            self._add_vehicle(lane, position, speed)
+
+    def _add_vehicle(self, lane: int, position: float, speed: float) -> int:
+        slot: int = self._store.allocate(self._vehicle_count, SimulatedObjectStatus.IN_NETWORK)
+        self._vehicle_count += 1
+        self._store.driving_behavior[slot] = 0
+        self._store.lane[slot] = lane
+        self._store.position[slot] = position
+        self._store.speed[slot] = speed
+        self._store.length[slot] = 5.0
+        self._store.maximum_deceleration[slot] = 7.0
+        return slot
+
+    def _evaluate(self, slots, directions, mandatory=None, distances=None) -> LaneChangeDecisions:
+        index: LanePositionIndex = LanePositionIndex(lane_count=3)
+        index.update(self._store)
+        count: int = len(slots)
+        return self._engine.evaluate(
+            self._store, index, np.array(slots), np.array(directions),
+            np.zeros(count, dtype=np.bool_) if mandatory is None else np.array(mandatory),
+            np.full(count, np.inf) if distances is None else np.array(distances))
+
+    def test_acceptable_gap(self):
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT])
+        np.testing.assert_array_equal(decisions.target_lanes, [1])
+        np.testing.assert_array_equal(decisions.accepted, [True])
+        np.testing.assert_array_equal(decisions.braking_followers, [LanePositionIndex.NO_VEHICLE])
+
+    def test_lane_change_must_be_permitted(self):
+        self._may_move_left[1] = False
+        decisions: LaneChangeDecisions = self._evaluate([0, 1, 2], [RIGHT, LEFT, RIGHT])
+        np.testing.assert_array_equal(decisions.target_lanes, [NO_LANE, NO_LANE, 0])
+        np.testing.assert_array_equal(decisions.accepted, [False, False, True])
+
+    def test_fast_follower_rejects_discretionary_change(self):
+        # the follower needs 2 m + 0.9 * 5 m/s * 5 s, but has 15 m
+        self._store.speed[2] = 25.0
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT])
+        np.testing.assert_array_equal(decisions.accepted, [False])
+        np.testing.assert_array_equal(decisions.forced, [False])
+
+    def test_forced_change_with_cooperative_braking(self):
+        self._store.speed[2] = 25.0
+        # 10 s from the last chance at 20 m/s is 200 m
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT], [True], [150.0])
+        braking: float = HidasDefaults.F_BRAKING * 7.0
+        np.testing.assert_array_equal(decisions.forced, [True])
+        np.testing.assert_array_equal(decisions.accepted, [True])
+        np.testing.assert_array_equal(decisions.braking_followers, [2])
+        self.assertAlmostEqual(decisions.braking_decelerations[0], braking)
+
+        self._store.acceleration[2] = 0.5
+        LaneChangeEngine.apply(self._store, np.array([0]), decisions)
+        self.assertEqual(self._store.lane[0], 1)
+        self.assertAlmostEqual(self._store.acceleration[2], -braking)
+
+    def test_stopped_vehicle_is_forced(self):
+        # queued at a standstill, 150 m from the last chance, with a desired speed of 20 m/s
+        self._store.speed[0] = 0.0
+        self._store.desired_speed[0] = 20.0
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT], [True], [150.0])
+        np.testing.assert_array_equal(decisions.forced, [True])
+        np.testing.assert_array_equal(decisions.braking_followers, [2])
+
+    def test_no_braking_without_leader_gap(self):
+        self._store.speed[2] = 25.0
+        self._store.position[1] = 104.0
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT], [True], [150.0])
+        np.testing.assert_array_equal(decisions.forced, [True])
+        np.testing.assert_array_equal(decisions.accepted, [False])
+        np.testing.assert_array_equal(decisions.braking_followers, [LanePositionIndex.NO_VEHICLE])
+
+        self._store.acceleration[2] = 0.5
+        LaneChangeEngine.apply(self._store, np.array([0]), decisions)
+        self.assertEqual(self._store.lane[0], 0)
+        self.assertEqual(self._store.acceleration[2], 0.5)
+
+    def test_only_the_gap_owner_asks_for_braking(self):
+        # a second forced candidate from lane 2 aims for the same gap, behind the first
+        self._store.speed[2] = 25.0
+        self._add_vehicle(2, 95.0, 20.0)
+        decisions: LaneChangeDecisions = self._evaluate([0, 3], [LEFT, RIGHT], [True, True], [150.0, 150.0])
+        np.testing.assert_array_equal(decisions.accepted, [True, False])
+        np.testing.assert_array_equal(decisions.braking_followers, [2, LanePositionIndex.NO_VEHICLE])
+
+    def test_not_yet_forced(self):
+        self._store.speed[2] = 25.0
+        decisions: LaneChangeDecisions = self._evaluate([0], [LEFT], [True], [250.0])
+        np.testing.assert_array_equal(decisions.forced, [False])
+        np.testing.assert_array_equal(decisions.accepted, [False])
+
+    def test_one_candidate_per_gap(self):
+        # a second candidate from lane 2 aims for the same gap, further ahead
+        self._add_vehicle(2, 105.0, 20.0)
+        decisions: LaneChangeDecisions = self._evaluate([0, 3], [LEFT, RIGHT])
+        np.testing.assert_array_equal(decisions.target_lanes, [1, 1])
+        np.testing.assert_array_equal(decisions.accepted, [False, True])
+
+        LaneChangeEngine.apply(self._store, np.array([0, 3]), decisions)
+        np.testing.assert_array_equal(self._store.lane[:4], [0, 1, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
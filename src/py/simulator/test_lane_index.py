@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+from simulatedobjects.simluated_object_status import SimulatedObjectStatus
+from simulatedobjects.vehicle_state_store import VehicleStateStore
+from simulator.lane_index import LanePositionIndex, _repair
+
+NO = LanePositionIndex.NO_VEHICLE
+
+
+class TestsForLanePositionIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._store: VehicleStateStore = VehicleStateStore(capacity=16)
+        # (lane, position) of each vehicle, allocated into slots 0..5
+        for vehicle_id, (lane, position) in enumerate([(1, 50.0), (0, 10.0), (1, 20.0), (0, 80.0), (2, 5.0),
+                                                      (0, 40.0)]):
+            slot: int = self._store.allocate(vehicle_id, SimulatedObjectStatus.IN_NETWORK)
+            self._store.lane[slot] = lane
+            self._store.position[slot] = position
+            self._store.length[slot] = 5.0
+            self._store.speed[slot] = float(vehicle_id)
+        self._index: LanePositionIndex = LanePositionIndex(lane_count=4)
+        self._index.update(self._store)
+
+    def test_order_by_lane_then_position(self):
+        np.testing.assert_array_equal(self._index.order, [1, 5, 3, 2, 0, 4])
+        np.testing.assert_array_equal(self._index.lane_offsets, [0, 3, 5, 6, 6])
+        np.testing.assert_array_equal(self._index.vehicles_in_lane(1), [2, 0])
+        self.assertEqual(len(self._index.vehicles_in_lane(3)), 0)
+
+    def test_own_lane_neighbors(self):
+        leaders, followers = self._index.own_lane_neighbors(np.array([1, 5, 3, 4]))
+        np.testing.assert_array_equal(leaders, [5, 3, NO, NO])
+        np.testing.assert_array_equal(followers, [NO, 1, 5, NO])
+
+    def test_neighbors_at_points_in_other_lanes(self):
+        leaders, followers = self._index.neighbors_at(np.array([0, 1, 1, 3]), np.array([40.0, 0.0, 60.0, 10.0]))
+        np.testing.assert_array_equal(leaders, [3, 2, NO, NO])
+        np.testing.assert_array_equal(followers, [5, NO, 0, NO])
+
+    def test_leader_gaps(self):
+        gaps, leader_speeds = self._index.leader_gaps(self._store, np.array([1, 3]))
+        np.testing.assert_array_equal(gaps, [25.0, np.inf])
+        np.testing.assert_array_equal(leader_speeds, [5.0, 0.0])
+
+    def test_update_tracks_overtaking_entry_and_exit(self):
+        self._store.position[1] = 60.0
+        self._store.set_status(3, SimulatedObjectStatus.EXITED_NETWORK)
+        slot: int = self._store.allocate(6, SimulatedObjectStatus.IN_NETWORK)
+        self._store.lane[slot] = 0
+        self._store.position[slot] = 0.0
+        self._index.update(self._store)
+        np.testing.assert_array_equal(self._index.vehicles_in_lane(0), [6, 5, 1])
+
+    def test_repair_matches_full_sort(self):
+        rng: np.random.Generator = np.random.default_rng(6)
+        store: VehicleStateStore = VehicleStateStore(capacity=512)
+        for vehicle_id in range(500):
+            store.allocate(vehicle_id, SimulatedObjectStatus.IN_NETWORK)
+        store.lane[:] = rng.integers(0, 5, 500)
+        store.position[:] = rng.random(500) * 1000.0
+        for repair_limit in [0, 10, 1000]:
+            index: LanePositionIndex = LanePositionIndex(5, repair_limit=repair_limit)
+            index.update(store)
+            for _ in range(5):
+                store.position[:] += rng.random(500) * 5.0
+                changing: np.ndarray = rng.random(500) < 0.01
+                store.lane[changing] = np.minimum(store.lane[changing] + 1, 4)
+                index.update(store)
+                np.testing.assert_array_equal(
+                    index.order, np.lexsort((store.position, store.lane)))
+
+    def test_lane_change_is_repaired_without_sorting(self):
+        # 1000 vehicles in 4 lanes, in order; the first vehicle of lane 0 moves to lane 3
+        lanes: np.ndarray = np.repeat(np.arange(4), 250)
+        positions: np.ndarray = np.tile(np.arange(250.0), 4)
+        lanes[0], positions[0] = 3, 100.5
+        moved: np.ndarray = np.zeros(1000, dtype=np.bool_)
+        moved[0] = True
+        repaired = _repair(np.arange(1000), lanes, positions, moved, 4, 1)
+        self.assertIsNotNone(repaired)
+        order, _, _ = repaired
+        np.testing.assert_array_equal(order, np.lexsort((positions, lanes)))
+
+    def test_overtaking_is_repaired_without_sorting(self):
+        # a vehicle passes two others in its lane, and another is passed by two
+        positions: np.ndarray = np.array([1.0, 2.0, 10.0, 4.0, 5.0, 11.0, 12.0, 6.0, 13.0])
+        lanes: np.ndarray = np.zeros(9, dtype=np.int32)
+        repaired = _repair(np.arange(9), lanes, positions, np.zeros(9, dtype=np.bool_), 1, 4)
+        self.assertIsNotNone(repaired)
+        np.testing.assert_array_equal(repaired[0], np.argsort(positions))
+
+
+if __name__ == '__main__':
+    unittest.main()
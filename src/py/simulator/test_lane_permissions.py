@@ -0,0 +1,87 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.lane_usage import LaneUsage, LaneUsageConstants
+from parameters.road_network import NetworkConstants, RoadConstants, RoadNetwork, process_file
+from parameters.vehicle_types import VehicleTypes
+from test_support.xml_fixtures import create_lane_usage_document, create_road_node, create_vehicle_types_document
+from simulator.lane_permissions import LanePermissionIndex
+
+
+class TestsForLanePermissionIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._open, self._trucks_only, self._no_trucks = str(uuid()), str(uuid()), str(uuid())
+        # 70 vehicle types, so that the masks take two words; types 1 and 65 are trucks
+        trucks: str = str(uuid())
+        self._vehicle_types: VehicleTypes = VehicleTypes.from_xml(create_vehicle_types_document(70, {trucks: [1, 65]}))
+        self._lane_usage: LaneUsage = LaneUsage.from_xml(create_lane_usage_document([
+            (self._open, LaneUsageConstants.POLICY_ALL_ALLOWED, []),
+            (self._trucks_only, LaneUsageConstants.POLICY_NONE_ALLOWED, [trucks]),
+            (self._no_trucks, LaneUsageConstants.POLICY_ALL_ALLOWED, [trucks]),
+        ]))
+
+        root: etree.ElementBase = etree.Element(NetworkConstants.ROOT_TAG, {
+            NetworkConstants.VERSION_ATTR: '1',
+            NetworkConstants.LAYOUT_UNITS_ATTR: 'meters',
+            NetworkConstants.SPEED_UNITS_ATTR: 'kilometers-per-hour',
+        })
+        road: etree.ElementBase = create_road_node(2, self._open)
+        etree.SubElement(root, RoadConstants.COLLECTION_TAG).append(road)
+        lanes: etree.ElementBase = road.find(RoadConstants.LANES_COLLECTION_TAG)
+        # lane 0 is for trucks in the morning peak; lane 1 bans trucks overnight, and for the whole peak
+        self._add_exception(lanes[0], self._trucks_only, '07:00:00', '09:00:00')
+        self._add_exception(lanes[1], self._no_trucks, '22:00:00', '06:00:00')
+        self._add_exception(lanes[1], self._no_trucks, '06:30:00', '09:30:00')
+        self._add_exception(lanes[1], self._trucks_only, '07:00:00', '08:00:00')
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(root))
+        try:
+            self._network: RoadNetwork = process_file(file.name)
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def _add_exception(lane: etree.ElementBase, policy: str, start: str, end: str) -> None:
+        etree.SubElement(lane.find(RoadConstants.LANE_POLICY_TAG), RoadConstants.LANE_POLICY_EXCEPT_TAG, {
+            RoadConstants.LANE_POLICY_EXCEPT_POLICY_ATTR: policy,
+            RoadConstants.LANE_POLICY_EXCEPT_START_ATTR: start,
+            RoadConstants.LANE_POLICY_EXCEPT_END_ATTR: end,
+        })
+
+    def _allows(self, index: LanePermissionIndex, hour: float) -> np.ndarray:
+        # (lane, vehicle type) of each check: car and trucks in lane 0, then in lane 1
+        lanes: np.ndarray = np.array([0, 0, 0, 1, 1, 1])
+        vehicle_types: np.ndarray = np.array([0, 1, 65, 0, 1, 65])
+        return index.allows(hour * 3600.0, lanes, vehicle_types)
+
+    def test_boundaries(self):
+        index: LanePermissionIndex = LanePermissionIndex(self._network, self._lane_usage, self._vehicle_types)
+        np.testing.assert_array_equal(index.boundaries / 3600.0, [0, 6, 6.5, 7, 8, 9, 9.5, 22, 24])
+
+    def test_permissions_through_the_day(self):
+        index: LanePermissionIndex = LanePermissionIndex(self._network, self._lane_usage, self._vehicle_types)
+        np.testing.assert_array_equal(self._allows(index, 12), [True] * 6)
+        np.testing.assert_array_equal(self._allows(index, 23), [True, True, True, True, False, False])
+        np.testing.assert_array_equal(self._allows(index, 24 + 5), [True, True, True, True, False, False])
+        np.testing.assert_array_equal(self._allows(index, 6.75), [True, True, True, True, False, False])
+        # the first exception in effect applies
+        np.testing.assert_array_equal(self._allows(index, 7.5), [False, True, True, True, False, False])
+        np.testing.assert_array_equal(self._allows(index, 9), [True, True, True, True, False, False])
+        self.assertEqual(index.lane_masks(9 * 3600.0).shape, (2, 2))
+
+    def test_masks_are_rebuilt_only_at_boundaries(self):
+        index: LanePermissionIndex = LanePermissionIndex(self._network, self._lane_usage, self._vehicle_types)
+        masks: np.ndarray = index.lane_masks(12 * 3600.0)
+        self.assertIs(index.lane_masks(21 * 3600.0), masks)
+        self.assertIsNot(index.lane_masks(22 * 3600.0), masks)
+
+    def test_unknown_policy_is_rejected(self):
+        self.assertRaises(KeyError, lambda: LanePermissionIndex(
+            self._network, LaneUsage.from_xml(create_lane_usage_document([])), self._vehicle_types))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from parameters.simulation_settings import SimulationSettings, SimulationSettingsConstants
+from simulator.multi_run import MultiRunExecutor
+from simulator.random_streams import RandomStreams, RandomSubsystem
+
+
+def simulate(scenario: np.ndarray, run_index: int, seed: int):
+    draw: float = RandomStreams(seed).generator(RandomSubsystem.VEHICLE_ENTRY).random()
+    return run_index, seed, os.getpid(), float(scenario.sum() + draw)
+
+
+def create_settings(run_count: int) -> SimulationSettings:
+    root: etree.ElementBase = etree.Element(SimulationSettingsConstants.ROOT_TAG, {
+        SimulationSettingsConstants.VERSION_ATTR: '1',
+        SimulationSettingsConstants.RUN_COUNT_ATTR: str(run_count),
+    })
+    etree.SubElement(root, SimulationSettingsConstants.FILES_TAG)
+    etree.SubElement(root, SimulationSettingsConstants.SIM_TIMES_TAG, {
+        SimulationSettingsConstants.SIM_START_ATTR: '07:00:00',
+        SimulationSettingsConstants.SIM_EVALUATION_LENGTH_ATTR: 'PT1H',
+        SimulationSettingsConstants.SIM_SEED_LENGTH_ATTR: 'PT15M',
+    })
+    etree.SubElement(root, SimulationSettingsConstants.SEEDING_TAG)
+
+    return SimulationSettings(root)
+
+
+class TestsForMultiRun(unittest.TestCase):
+    def setUp(self) -> None:
+        self._scenario: np.ndarray = np.arange(10.0)
+
+    def test_worker_count_is_limited_by_run_count(self):
+        self.assertEqual(MultiRunExecutor(create_settings(3), worker_count=8).worker_count, 3)
+        self.assertEqual(MultiRunExecutor(create_settings(3), worker_count=0).worker_count, 1)
+
+    def test_serial_runs_use_settings_seeds(self):
+        results = MultiRunExecutor(create_settings(3), worker_count=1).run(self._scenario, simulate)
+        self.assertEqual([result[1] for result in results], [73110, 73120, 73130])
+        self.assertTrue(all(result[2] == os.getpid() for result in results))
+
+    def test_parallel_results_match_serial_results_in_run_order(self):
+        settings: SimulationSettings = create_settings(6)
+        serial = MultiRunExecutor(settings, worker_count=1).run(self._scenario, simulate)
+        parallel = MultiRunExecutor(settings, worker_count=3).run(self._scenario, simulate)
+        self.assertEqual([result[:2] for result in parallel], [result[:2] for result in serial])
+        self.assertEqual([result[3] for result in parallel], [result[3] for result in serial])
+        self.assertTrue(all(result[2] != os.getpid() for result in parallel))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import NamedTemporaryFile
+from parameters.road_network import NetworkConstants, RoadConstants, PocketSide, Pockets, RoadNetwork, process_file
+from test_support.xml_fixtures import create_road_node
+from simulator.pocket_lanes import PocketLaneIndex, TaperState
+
+NONE, OPENING, CLOSING = TaperState.NONE, TaperState.OPENING, TaperState.CLOSING
+
+
+class TestsForPocketLaneIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        # road 0 has a left pocket lane from 50 to 150, opening over 20 meters, and two right pocket lanes from 100
+        # to the end, opening over 30 and closing over 10; road 1 has none; road 2 has a left pocket lane up to 40
+        pockets: Pockets = Pockets(
+            road_offsets=np.array([0, 2, 2, 3]),
+            sides=np.array([PocketSide.LEFT, PocketSide.RIGHT, PocketSide.LEFT], dtype=np.int8),
+            start_ordinates=np.array([50.0, 100.0, 0.0]),
+            end_ordinates=np.array([150.0, np.inf, 40.0]),
+            start_tapers=np.array([20.0, 30.0, np.nan]),
+            end_tapers=np.array([np.nan, 10.0, np.nan]),
+            lane_counts=np.array([1, 2, 1], dtype=np.int32))
+        self._index: PocketLaneIndex = PocketLaneIndex(np.array([2, 1, 1]), pockets, np.array([200.0, 100.0, 50.0]))
+
+    def test_intervals(self):
+        np.testing.assert_array_equal(self._index.interval_offsets, [0, 7, 8, 10])
+        np.testing.assert_array_equal(self._index.starts, [0, 50, 70, 100, 130, 150, 190, 0, 0, 40])
+        np.testing.assert_array_equal(self._index.lane_counts, [2, 3, 3, 5, 5, 4, 4, 1, 2, 1])
+        np.testing.assert_array_equal(self._index.lowest_ordinals, [0, 0, 0, -2, -2, -2, -2, 0, 0, 0])
+        np.testing.assert_array_equal(self._index.left_tapers,
+                                      [NONE, OPENING, NONE, NONE, NONE, NONE, NONE, NONE, NONE, NONE])
+        np.testing.assert_array_equal(self._index.right_tapers,
+                                      [NONE, NONE, NONE, OPENING, NONE, NONE, CLOSING, NONE, NONE, NONE])
+
+    def test_intervals_at_positions(self):
+        roads: np.ndarray = np.array([0, 0, 0, 0, 0, 1, 2, 2])
+        stations: np.ndarray = np.array([-5.0, 50.0, 149.9, 150.0, 250.0, 50.0, 39.9, 40.0])
+        np.testing.assert_array_equal(self._index.intervals_at(roads, stations), [0, 1, 4, 5, 6, 7, 8, 9])
+
+    def test_lane_exists(self):
+        roads: np.ndarray = np.array([0, 0, 0, 0, 0, 0, 1, 2, 2])
+        stations: np.ndarray = np.array([60.0, 40.0, 120.0, 250.0, -5.0, -5.0, 50.0, 39.9, 40.0])
+        ordinals: np.ndarray = np.array([2, 2, -2, -1, 0, -1, 1, 1, 1])
+        np.testing.assert_array_equal(self._index.lane_exists(roads, stations, ordinals),
+                                      [True, False, True, True, True, False, False, True, False])
+        lowest, highest = self._index.lane_ranges(np.array([0]), np.array([120.0]))
+        np.testing.assert_array_equal(lowest, [-2])
+        np.testing.assert_array_equal(highest, [3])
+
+    def test_from_network(self):
+        root: etree.ElementBase = etree.Element(NetworkConstants.ROOT_TAG, {
+            NetworkConstants.VERSION_ATTR: '1',
+            NetworkConstants.LAYOUT_UNITS_ATTR: 'meters',
+            NetworkConstants.SPEED_UNITS_ATTR: 'kilometers-per-hour',
+        })
+        road: etree.ElementBase = create_road_node(2, str(uuid()))
+        etree.SubElement(root, RoadConstants.COLLECTION_TAG).append(road)
+        etree.SubElement(road.find(RoadConstants.POCKETS_COLLECTION_TAG), RoadConstants.POCKET_TAG, {
+            RoadConstants.POCKET_SIDE_ATTR: 'right',
+            RoadConstants.POCKET_START_ORD_ATTR: '100',
+            RoadConstants.POCKET_END_ORD_ATTR: 'b',
+            RoadConstants.POCKET_END_TAPER_ATTR: '20',
+        })
+        with NamedTemporaryFile(suffix='.xml', delete=False) as file:
+            file.write(etree.tostring(root))
+        try:
+            network: RoadNetwork = process_file(file.name)
+        finally:
+            os.remove(file.name)
+
+        index: PocketLaneIndex = PocketLaneIndex.from_network(network)
+        # the end of the road resolves to its length along the chain
+        length: float = float(network.chain_geometry.road_lengths[0])
+        np.testing.assert_allclose(index.starts, [0.0, 100.0, length - 20.0])
+        np.testing.assert_array_equal(index.lane_counts, [2, 3, 3])
+        np.testing.assert_array_equal(index.right_tapers, [NONE, NONE, CLOSING])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+from simulator.random_streams import RandomStreams, RandomSubsystem
+
+
+class TestsForRandomStreams(unittest.TestCase):
+    def test_streams_are_reproducible(self):
+        first: np.ndarray = RandomStreams(73110).generator(RandomSubsystem.VEHICLE_ENTRY).random(5)
+        second: np.ndarray = RandomStreams(73110).generator(RandomSubsystem.VEHICLE_ENTRY).random(5)
+        np.testing.assert_array_equal(first, second)
+
+    def test_subsystems_do_not_affect_each_other(self):
+        streams: RandomStreams = RandomStreams(73110)
+        streams.generator(RandomSubsystem.DISTRIBUTION_DRAWS).random(1000)
+        np.testing.assert_array_equal(streams.generator(RandomSubsystem.LANE_SELECTION).random(5),
+                                      RandomStreams(73110).generator(RandomSubsystem.LANE_SELECTION).random(5))
+
+    def test_streams_differ_between_runs_and_subsystems(self):
+        streams: RandomStreams = RandomStreams(73110)
+        entry: np.ndarray = streams.generator(RandomSubsystem.VEHICLE_ENTRY).random(5)
+        self.assertFalse(np.array_equal(entry, streams.generator(RandomSubsystem.LANE_SELECTION).random(5)))
+        self.assertFalse(np.array_equal(entry, RandomStreams(73120).generator(RandomSubsystem.VEHICLE_ENTRY).random(5)))
+        self.assertFalse(np.array_equal(RandomStreams(-10).generator(RandomSubsystem.VEHICLE_ENTRY).random(5),
+                                        RandomStreams(10).generator(RandomSubsystem.VEHICLE_ENTRY).random(5)))
+
+    def test_spawned_parts_are_independent_of_order(self):
+        parts = RandomStreams(66).spawn(RandomSubsystem.DISTRIBUTION_DRAWS, 3)
+        reversed_draws = [part.random(4) for part in reversed(RandomStreams(66).spawn(
+            RandomSubsystem.DISTRIBUTION_DRAWS, 3))]
+        np.testing.assert_array_equal(parts[0].random(4), reversed_draws[2])
+        self.assertFalse(np.array_equal(parts[1].random(4), reversed_draws[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+import numpy as np
+from tempfile import TemporaryDirectory
+from simulatedobjects.network_topology import Connections, NetworkTopologyGraph
+from simulator.routing import RoutingTables
+from simulator.scenario_cache import ScenarioCache
+
+NO = RoutingTables.NO_CONNECTION
+
+
+def create_graph() -> NetworkTopologyGraph:
+    # 0 leaves for 1 at 30 and for 2 at its end, 1 enters 2 at 60, and 2 loops back into 0 at 50; 3 is isolated
+    return NetworkTopologyGraph(4, Connections(
+        from_roads=np.array([0, 0, 1, 2]),
+        to_roads=np.array([1, 2, 2, 0]),
+        from_offsets=np.array([30.0, 100.0, 50.0, 20.0]),
+        to_offsets=np.array([0.0, 0.0, 60.0, 50.0]),
+        from_ordinates=np.zeros(4),
+        to_ordinates=np.zeros(4)))
+
+
+class TestsForRoutingTables(unittest.TestCase):
+    def setUp(self) -> None:
+        self._graph: NetworkTopologyGraph = create_graph()
+        self._zone_roads = [[2], [1], [3]]
+
+    def test_next_connections_and_distances(self):
+        tables: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads)
+        # rows: connections 0 to 3, then the starts of roads 0 to 3
+        np.testing.assert_array_equal(tables.next_connections[:, 0], [2, NO, NO, 1, 0, 2, NO, NO])
+        np.testing.assert_array_equal(tables.distances[:, 0], [50.0, 0.0, 0.0, 50.0, 80.0, 50.0, 0.0, np.inf])
+
+    def test_only_downstream_connections_are_taken(self):
+        tables: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads)
+        # entering road 0 at 50 is past the connection to road 1 at 30, and the loop back enters at 50 again
+        np.testing.assert_array_equal(tables.next_connections[:, 1], [NO, NO, NO, NO, 0, NO, NO, NO])
+        np.testing.assert_array_equal(tables.distances[:, 1],
+                                      [0.0, np.inf, np.inf, np.inf, 30.0, 0.0, np.inf, np.inf])
+
+    def test_unreachable_zone(self):
+        tables: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads)
+        np.testing.assert_array_equal(tables.next_connections[:, 2], np.full(8, NO))
+        np.testing.assert_array_equal(tables.distances[:, 2], [np.inf] * 7 + [0.0])
+
+    def test_lookups(self):
+        tables: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads)
+        np.testing.assert_array_equal(tables.after_connections(np.array([0, 3]), np.array([0, 0])), [2, 1])
+        np.testing.assert_array_equal(tables.from_road_starts(np.array([0, 0, 1]), np.array([0, 1, 0])), [0, 0, 2])
+
+    def test_workers_match_single_process(self):
+        single: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads, worker_count=1)
+        parallel: RoutingTables = RoutingTables.compute(self._graph, self._zone_roads, worker_count=2)
+        np.testing.assert_array_equal(parallel.next_connections, single.next_connections)
+        np.testing.assert_array_equal(parallel.distances, single.distances)
+
+    def test_cache_round_trip(self):
+        with TemporaryDirectory() as directory:
+            cache: ScenarioCache = ScenarioCache(os.path.join(directory, 'cache'))
+            computed: RoutingTables = RoutingTables.load_or_compute(cache, self._graph, self._zone_roads)
+            loaded: RoutingTables = RoutingTables.load_or_compute(cache, self._graph, self._zone_roads)
+            self.assertIsInstance(loaded.next_connections, np.memmap)
+            np.testing.assert_array_equal(loaded.next_connections, computed.next_connections)
+            np.testing.assert_array_equal(loaded.distances, computed.distances)
+            np.testing.assert_array_equal(loaded.from_road_starts(np.array([0]), np.array([0])), [0])
+
+            # a different zone set is a different entry
+            other: RoutingTables = RoutingTables.load_or_compute(cache, self._graph, [[1]])
+            np.testing.assert_array_equal(other.next_connections[:, 0], computed.next_connections[:, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
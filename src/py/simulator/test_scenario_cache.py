@@ -0,0 +1,154 @@
+import unittest
+import os
+import shutil
+from unittest import mock
+import numpy as np
+from lxml import etree
+from uuid import uuid4 as uuid
+from tempfile import TemporaryDirectory
+from parameters import road_network
+from parameters.behaviors import BehaviorConstants, Behaviors
+from parameters.lane_usage import LaneUsage, LaneUsageConstants
+from parameters.road_network import NetworkConstants, RoadConstants, RoadNetwork
+from parameters.vehicle_types import VehicleTypes
+from test_support.xml_fixtures import create_behaviors_document, create_lane_usage_document, \
+    create_vehicle_types_document
+from simulator.scenario_cache import ScenarioCache
+from simulator.xml_validation import XmlValidation
+
+
+def write_network_file(filename: str, speed_limit: str) -> None:
+    root: etree.ElementBase = etree.Element(NetworkConstants.ROOT_TAG, {
+        NetworkConstants.VERSION_ATTR: '1',
+        NetworkConstants.LAYOUT_UNITS_ATTR: 'meters',
+        NetworkConstants.SPEED_UNITS_ATTR: 'kilometers-per-hour',
+    })
+    roads: etree.ElementBase = etree.SubElement(root, RoadConstants.COLLECTION_TAG)
+    road: etree.ElementBase = etree.SubElement(roads, RoadConstants.TAG, {
+        RoadConstants.UUID_ATTR: '00000000-0000-0000-0000-000000000001',
+        RoadConstants.NAME_ATTR: 'Main Street',
+        RoadConstants.BEHAVIOR_ATTR: str(uuid()),
+        RoadConstants.SPEED_LIMIT_ATTR: speed_limit,
+    })
+    etree.SubElement(road, RoadConstants.CHAIN_TAG, {RoadConstants.CHAIN_POINTS_ATTR: '0,0 100,0 200,50'})
+    lanes: etree.ElementBase = etree.SubElement(road, RoadConstants.LANES_COLLECTION_TAG)
+    lane: etree.ElementBase = etree.SubElement(lanes, RoadConstants.LANE_TAG, {
+        RoadConstants.LANE_ORDINAL_ATTR: '0',
+        RoadConstants.LANE_WIDTH_ATTR: '3.5',
+    })
+    etree.SubElement(lane, RoadConstants.LANE_POLICY_TAG, {RoadConstants.LANE_POLICY_ID_ATTR: str(uuid())})
+    etree.SubElement(road, RoadConstants.POCKETS_COLLECTION_TAG)
+    etree.ElementTree(root).write(filename)
+
+
+class TestsForScenarioCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory: TemporaryDirectory = TemporaryDirectory()
+        self._cache: ScenarioCache = ScenarioCache(os.path.join(self._directory.name, 'cache'))
+        self._network_file: str = os.path.join(self._directory.name, 'network.xml')
+        write_network_file(self._network_file, '50')
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_warm_load_matches_parsed_network(self):
+        parsed: RoadNetwork = self._cache.load_network(self._network_file)
+        cached: RoadNetwork = self._cache.load_network(self._network_file)
+        self.assertIsInstance(cached.roads.chain_points, np.memmap)
+        np.testing.assert_array_equal(cached.roads.chain_points, parsed.roads.chain_points)
+        np.testing.assert_array_equal(cached.lanes.widths, parsed.lanes.widths)
+        np.testing.assert_array_equal(cached.pockets.road_offsets, parsed.pockets.road_offsets)
+        self.assertEqual(cached.roads.names, ['Main Street'])
+        self.assertEqual(cached.policy_uuids, parsed.policy_uuids)
+        self.assertEqual(cached.road_index_of, parsed.road_index_of)
+
+    def test_changed_file_misses_the_cache(self):
+        first_key: str = ScenarioCache.content_key([self._network_file])
+        self._cache.load_network(self._network_file)
+        write_network_file(self._network_file, '80')
+        self.assertNotEqual(ScenarioCache.content_key([self._network_file]), first_key)
+        network: RoadNetwork = self._cache.load_network(self._network_file)
+        self.assertAlmostEqual(network.roads.speed_limits[0], 80 / 3.6)
+
+    def test_missing_entry_loads_as_none(self):
+        self.assertIsNone(self._cache.load('no-such-key'))
+
+    def test_storing_an_existing_entry_is_harmless(self):
+        self._cache.store('key', {'values': np.arange(3)}, {'name': 'first'})
+        self._cache.store('key', {'values': np.arange(5)}, {'name': 'second'})
+        arrays, metadata = self._cache.load('key')
+        self.assertEqual(metadata['name'], 'first')
+        self.assertEqual(len(arrays['values']), 3)
+
+    def test_entry_with_other_record_fields_is_replaced(self):
+        # an entry written by a loader whose lane records had an extra column
+        key: str = ScenarioCache.content_key([self._network_file, XmlValidation.NETWORK_XSD],
+                                             road_network.LOADER_VERSION)
+        parsed: RoadNetwork = self._cache.load_network(self._network_file)
+        arrays, metadata = self._cache.load(key)
+        arrays = dict(arrays, **{'lanes.obsolete': np.zeros(1)})
+        shutil.rmtree(os.path.join(self._cache.directory, key))
+        self._cache.store(key, arrays, metadata)
+
+        network: RoadNetwork = self._cache.load_network(self._network_file)
+        np.testing.assert_array_equal(network.lanes.widths, parsed.lanes.widths)
+        self.assertNotIn('lanes.obsolete', self._cache.load(key)[0])
+
+    def test_changed_loader_misses_the_cache(self):
+        self._cache.load_network(self._network_file)
+        with mock.patch.object(road_network, 'LOADER_VERSION', road_network.LOADER_VERSION + 1), \
+                mock.patch.object(road_network, 'process_file', wraps=road_network.process_file) as process_file:
+            self._cache.load_network(self._network_file)
+            self._cache.load_network(self._network_file)
+        self.assertEqual(process_file.call_count, 1)
+
+    def _write(self, name: str, root: etree.ElementBase) -> str:
+        filename: str = os.path.join(self._directory.name, name)
+        etree.ElementTree(root).write(filename)
+        return filename
+
+    def test_vehicle_types_and_lane_usage(self):
+        trucks: str = str(uuid())
+        types_file: str = self._write('vehicle-types.xml', create_vehicle_types_document(3, {trucks: [1, 2]}))
+        usage_file: str = self._write('lane-usage.xml', create_lane_usage_document([
+            (str(uuid()), LaneUsageConstants.POLICY_ALL_ALLOWED, [trucks])]))
+        parsed_types: VehicleTypes = self._cache.load_vehicle_types(types_file)
+        parsed_usage: LaneUsage = self._cache.load_lane_usage(usage_file)
+        cached_types: VehicleTypes = self._cache.load_vehicle_types(types_file)
+        cached_usage: LaneUsage = self._cache.load_lane_usage(usage_file)
+
+        self.assertIsInstance(cached_types.group_members[trucks], np.memmap)
+        self.assertEqual(cached_types.uuids, parsed_types.uuids)
+        self.assertEqual(cached_types.index_of, parsed_types.index_of)
+        np.testing.assert_array_equal(cached_usage.allowed_types(cached_types),
+                                      parsed_usage.allowed_types(parsed_types))
+
+    def test_behaviors(self):
+        trucks: str = str(uuid())
+        root: etree.ElementBase = create_behaviors_document()
+        road_behavior: etree.ElementBase = root.find(BehaviorConstants.ROAD_BEHAVIORS_TAG)[0]
+        except_node: etree.ElementBase = etree.SubElement(road_behavior, BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_TAG, {
+            BehaviorConstants.ROAD_BEHAVIOR_EXCEPT_BEHAVIOR_ATTR:
+                road_behavior.attrib[BehaviorConstants.ROAD_BEHAVIOR_DEFAULT_ATTR],
+        })
+        etree.SubElement(except_node, BehaviorConstants.ROAD_BEHAVIOR_GROUP_TAG, {
+            BehaviorConstants.ROAD_BEHAVIOR_GROUP_ID_ATTR: trucks,
+        })
+        behaviors_file: str = self._write('behavior.xml', root)
+        types_file: str = self._write('vehicle-types.xml', create_vehicle_types_document(2, {trucks: [1]}))
+        vehicle_types: VehicleTypes = self._cache.load_vehicle_types(types_file)
+        parsed: Behaviors = self._cache.load_behaviors(behaviors_file)
+        cached: Behaviors = self._cache.load_behaviors(behaviors_file)
+
+        self.assertIsInstance(cached.following_model, np.memmap)
+        self.assertEqual(cached.car_following.names, parsed.car_following.names)
+        np.testing.assert_array_equal(cached.car_following.desired_time_gap, parsed.car_following.desired_time_gap)
+        np.testing.assert_array_equal(cached.lane_change.c_f, parsed.lane_change.c_f)
+        self.assertEqual(cached.road_behavior_index_of, parsed.road_behavior_index_of)
+        self.assertEqual(cached.road_behavior_exceptions, parsed.road_behavior_exceptions)
+        np.testing.assert_array_equal(cached.driving_behavior_table(vehicle_types),
+                                      parsed.driving_behavior_table(vehicle_types))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from simulator.segment_grid import SegmentGrid
+
+
+class TestsForSegmentGrid(unittest.TestCase):
+    def setUp(self) -> None:
+        # two roads: an L from (0, 0) to (10, 0) to (10, 10), and a diagonal from (20, 0) to (30, 10)
+        self._grid: SegmentGrid = SegmentGrid(
+            np.array([0, 3, 5]), np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [20.0, 0.0], [30.0, 10.0]]),
+            cell_size=2.0)
+
+    def test_segments(self):
+        self.assertEqual(self._grid.segment_count, 3)
+        np.testing.assert_array_equal(self._grid.segment_roads, [0, 0, 1])
+
+    def test_nearest_segments(self):
+        segments, distances, fractions = self._grid.nearest_segments(
+            np.array([[4.0, 1.0], [12.0, 5.0], [25.0, 5.0], [-3.0, -4.0], [14.0, 5.0]]))
+        np.testing.assert_array_equal(segments, [0, 1, 2, 0, 1])
+        np.testing.assert_allclose(distances, [1.0, 2.0, 0.0, 5.0, 4.0])
+        np.testing.assert_allclose(fractions, [0.4, 0.5, 0.5, 0.0, 0.5])
+
+    def test_maximum_distance(self):
+        segments, distances, _ = self._grid.nearest_segments(np.array([[4.0, 1.0], [17.0, 5.0]]), 3.0)
+        np.testing.assert_array_equal(segments, [0, SegmentGrid.NO_SEGMENT])
+        self.assertEqual(distances[1], np.inf)
+
+    def test_segments_in_boxes(self):
+        offsets, segments = self._grid.segments_in_boxes(np.array([
+            [9.0, 5.0, 21.0, 6.0], [-5.0, -5.0, -1.0, -1.0], [0.0, -1.0, 100.0, 100.0]]))
+        np.testing.assert_array_equal(offsets, [0, 2, 2, 5])
+        np.testing.assert_array_equal(segments, [1, 2, 0, 1, 2])
+
+    def test_matches_linear_scan(self):
+        rng: np.random.Generator = np.random.default_rng(21)
+        chain_points: np.ndarray = np.cumsum(rng.normal(0.0, 30.0, (2000, 2)), axis=0)
+        chain_offsets: np.ndarray = np.array([0, 700, 701, 2000])
+        grid: SegmentGrid = SegmentGrid(chain_offsets, chain_points)
+        queries: np.ndarray = chain_points.min(axis=0) + rng.random((300, 2)) * np.ptp(chain_points, axis=0) * 1.2
+        segments, distances, _ = grid.nearest_segments(queries)
+
+        starts: np.ndarray = np.concatenate([chain_points[0:699], chain_points[701:1999]])
+        ends: np.ndarray = np.concatenate([chain_points[1:700], chain_points[702:2000]])
+        directions: np.ndarray = ends - starts
+        fractions: np.ndarray = np.clip(np.einsum('qij,ij->qi', queries[:, np.newaxis] - starts, directions) /
+                                        np.einsum('ij,ij->i', directions, directions), 0.0, 1.0)
+        all_distances: np.ndarray = np.linalg.norm(
+            queries[:, np.newaxis] - (starts + fractions[..., np.newaxis] * directions), axis=2)
+        np.testing.assert_allclose(distances, all_distances.min(axis=1))
+        # consecutive segments tie where the nearest point is the vertex they share
+        np.testing.assert_allclose(all_distances[np.arange(len(queries)), segments], distances)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+from simulator.station_projection import StationProjector
+
+
+class TestsForStationProjector(unittest.TestCase):
+    def setUp(self) -> None:
+        # an L from (0, 0) east to (10, 0) then north to (10, 10), and a road from (50, 50) north-east to (53, 54)
+        self._projector: StationProjector = StationProjector(
+            np.array([0, 3, 5]), np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [50.0, 50.0], [53.0, 54.0]]))
+
+    def test_positions_on_chains(self):
+        x, y, headings = self._projector.project(np.array([0, 0, 0, 1, 1]), np.array([4.0, 10.0, 13.0, 0.0, 2.5]))
+        np.testing.assert_allclose(x, [4.0, 10.0, 10.0, 50.0, 51.5])
+        np.testing.assert_allclose(y, [0.0, 0.0, 3.0, 50.0, 52.0])
+        np.testing.assert_allclose(headings, [0.0, 0.5 * np.pi, 0.5 * np.pi, np.arctan2(4.0, 3.0),
+                                              np.arctan2(4.0, 3.0)])
+
+    def test_lateral_offsets_are_to_the_left(self):
+        x, y, _ = self._projector.project(np.array([0, 0]), np.array([4.0, 13.0]), np.array([2.0, -1.0]))
+        np.testing.assert_allclose(x, [4.0, 11.0])
+        np.testing.assert_allclose(y, [2.0, 3.0])
+
+    def test_stations_beyond_road_ends_are_extrapolated(self):
+        x, y, _ = self._projector.project(np.array([0, 0, 1]), np.array([-2.0, 22.0, 10.0]))
+        np.testing.assert_allclose(x, [-2.0, 10.0, 56.0])
+        np.testing.assert_allclose(y, [0.0, 12.0, 58.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from simulator.xml_validation import XmlValidation
+
+
+class TestsForXmlValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        XmlValidation.reset()
+
+    def test_schema_is_compiled_once(self):
+        first = XmlValidation.get_schema(XmlValidation.VEHICLE_MODELS_XSD)
+        self.assertIs(XmlValidation.get_schema(XmlValidation.VEHICLE_MODELS_XSD), first)
+        self.assertIsNot(XmlValidation.get_schema(XmlValidation.NETWORK_XSD), first)
+
+    def test_modified_schema_is_recompiled(self):
+        with TemporaryDirectory() as directory:
+            xsd_path: str = os.path.join(directory, 'vehicle-models.xsd')
+            shutil.copyfile(XmlValidation.VEHICLE_MODELS_XSD, xsd_path)
+            first = XmlValidation.get_schema(xsd_path)
+            modified: int = os.stat(xsd_path).st_mtime_ns
+            os.utime(xsd_path, ns=(modified + 1_000_000_000, modified + 1_000_000_000))
+            self.assertIsNot(XmlValidation.get_schema(xsd_path), first)
+
+    def test_all_schemas_compile(self):
+        for xsd_path in [XmlValidation.BEHAVIOR_XSD, XmlValidation.DISTRIBUTIONS_XSD, XmlValidation.LANE_USAGE_XSD,
+                         XmlValidation.NETWORK_XSD, XmlValidation.SIMULATION_SETTINGS_XSD,
+                         XmlValidation.VEHICLE_MODELS_XSD, XmlValidation.VEHICLE_TYPES_XSD]:
+            self.assertIsNotNone(XmlValidation.get_schema(xsd_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
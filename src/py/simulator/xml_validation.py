@@ -1,5 +1,7 @@
 import os
+from lxml import etree
 from pathlib import Path
+from typing import Dict, Tuple
 
 
 def _generateFullPath(xsd_name: str) -> str:
@@ -18,3 +20,37 @@ class XmlValidation:
     SIMULATION_SETTINGS_XSD: str = _generateFullPath('simulation-settings.xsd')
     VEHICLE_MODELS_XSD: str = _generateFullPath('vehicle-models.xsd')
     VEHICLE_TYPES_XSD: str = _generateFullPath('vehicle-types.xsd')
+
+    # compiled schemas keyed by path, with the modification time of the file they were compiled from
+    _schemas: Dict[str, Tuple[int, etree.XMLSchema]] = dict()
+
+    @classmethod
+    def get_schema(cls, xsd_path: str) -> etree.XMLSchema:
+        """
+        Returns the compiled schema for an XSD file. Schemas are compiled on first use and shared by all loaders in
+        the process; a schema is recompiled if its file has been modified since it was compiled.
+        Args:
+            xsd_path: Path to the XSD file, normally one of the path constants of this class.
+
+        Returns:
+            The compiled schema.
+        """
+        modified: int = os.stat(xsd_path).st_mtime_ns
+        cached = cls._schemas.get(xsd_path)
+        if cached is not None and cached[0] == modified:
+            return cached[1]
+
+        schema: etree.XMLSchema = etree.XMLSchema(etree.parse(xsd_path))
+        cls._schemas[xsd_path] = (modified, schema)
+
+        return schema
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Discards all compiled schemas. Generally intended for testing purposes.
+
+        Returns:
+            nothing
+        """
+        cls._schemas.clear()
@@ -0,0 +1,121 @@
+"""
+XML documents shared by the tests of the file loaders and of the simulator components built from them. Only the
+tests use this package; the simulator does not import it.
+"""
+from lxml import etree
+from uuid import uuid4 as uuid
+from parameters.behaviors import BehaviorConstants
+from parameters.lane_usage import LaneUsageConstants
+from parameters.road_network import RoadConstants
+from parameters.vehicle_types import VehicleTypeConstants
+
+
+def create_vehicle_types_document(type_count: int, groups: dict) -> etree.ElementBase:
+    """
+    Creates a vehicle types document with type_count types, and groups given as lists of member type indices by
+    group UUID.
+    """
+    root: etree.ElementBase = etree.Element(VehicleTypeConstants.ROOT_TAG, {VehicleTypeConstants.VERSION_ATTR: '1'})
+    types: etree.ElementBase = etree.SubElement(root, VehicleTypeConstants.TYPES_TAG)
+    type_uuids = [str(uuid()) for _ in range(type_count)]
+    for type_uuid in type_uuids:
+        etree.SubElement(types, VehicleTypeConstants.TYPE_TAG, {
+            VehicleTypeConstants.UUID_ATTR: type_uuid,
+            VehicleTypeConstants.TYPE_MODELS_ATTR: str(uuid()),
+            VehicleTypeConstants.TYPE_COLORS_ATTR: str(uuid()),
+            VehicleTypeConstants.TYPE_ACCELERATION_ATTR: str(uuid()),
+            VehicleTypeConstants.TYPE_DECELERATION_ATTR: str(uuid()),
+            VehicleTypeConstants.TYPE_OCCUPANCY_ATTR: str(uuid()),
+        })
+    groups_node: etree.ElementBase = etree.SubElement(root, VehicleTypeConstants.GROUPS_TAG)
+    for group_uuid, members in groups.items():
+        group_node: etree.ElementBase = etree.SubElement(groups_node, VehicleTypeConstants.GROUP_TAG, {
+            VehicleTypeConstants.UUID_ATTR: group_uuid,
+        })
+        for member in members:
+            etree.SubElement(group_node, VehicleTypeConstants.GROUP_VEHICLE_TAG, {
+                VehicleTypeConstants.GROUP_VEHICLE_TYPE_ATTR: type_uuids[member],
+            })
+
+    return root
+
+
+def create_behaviors_document() -> etree.ElementBase:
+    root: etree.ElementBase = etree.Element(BehaviorConstants.ROOT_TAG, {BehaviorConstants.VERSION_ATTR: '1'})
+    following: etree.ElementBase = etree.SubElement(root, BehaviorConstants.CAR_FOLLOWING_TAG)
+    cautious: str = str(uuid())
+    etree.SubElement(following, BehaviorConstants.FRITZSCHE_TAG, {
+        BehaviorConstants.UUID_ATTR: str(uuid()),
+        BehaviorConstants.FRITZSCHE_SSD_ATTR: '1.5',
+        BehaviorConstants.FRITZSCHE_T_DESIRED_ATTR: '2.2',
+    })
+    etree.SubElement(following, BehaviorConstants.FRITZSCHE_TAG, {
+        BehaviorConstants.NAME_ATTR: 'cautious',
+        BehaviorConstants.UUID_ATTR: cautious,
+        BehaviorConstants.FRITZSCHE_B_NULL_ATTR: '0.3',
+    })
+    lane_change: str = str(uuid())
+    etree.SubElement(etree.SubElement(root, BehaviorConstants.LANE_CHANGE_TAG), BehaviorConstants.HIDAS_TAG, {
+        BehaviorConstants.UUID_ATTR: lane_change,
+    })
+    speed: str = str(uuid())
+    etree.SubElement(etree.SubElement(root, 'speed'), 'speed-behavior', {
+        BehaviorConstants.UUID_ATTR: speed,
+        'friction-fs-reduction-factor-mean': '1.0',
+        'friction-fs-reduction-factor-stdev': '0.1',
+    })
+    driving: etree.ElementBase = etree.SubElement(root, BehaviorConstants.DRIVING_BEHAVIORS_TAG)
+    driving_uuid: str = str(uuid())
+    etree.SubElement(driving, BehaviorConstants.DRIVING_BEHAVIOR_TAG, {
+        BehaviorConstants.UUID_ATTR: driving_uuid,
+        BehaviorConstants.DRIVING_BEHAVIOR_FOLLOWING_ATTR: cautious,
+        BehaviorConstants.DRIVING_BEHAVIOR_LANE_CHANGE_ATTR: lane_change,
+        BehaviorConstants.DRIVING_BEHAVIOR_SPEED_ATTR: speed,
+    })
+    road_behaviors: etree.ElementBase = etree.SubElement(root, BehaviorConstants.ROAD_BEHAVIORS_TAG)
+    etree.SubElement(road_behaviors, BehaviorConstants.ROAD_BEHAVIOR_TAG, {
+        BehaviorConstants.UUID_ATTR: str(uuid()),
+        BehaviorConstants.ROAD_BEHAVIOR_DEFAULT_ATTR: driving_uuid,
+    })
+
+    return root
+
+
+def create_lane_usage_document(policies: list) -> etree.ElementBase:
+    """
+    Creates a lane usage document from (uuid, start-from, group UUIDs) of each policy.
+    """
+    root: etree.ElementBase = etree.Element(LaneUsageConstants.ROOT_TAG, {LaneUsageConstants.VERSION_ATTR: '1'})
+    policies_node: etree.ElementBase = etree.SubElement(root, LaneUsageConstants.POLICIES_TAG)
+    for policy_uuid, start_from, group_uuids in policies:
+        policy_node: etree.ElementBase = etree.SubElement(policies_node, LaneUsageConstants.POLICY_TAG, {
+            LaneUsageConstants.UUID_ATTR: policy_uuid,
+            LaneUsageConstants.POLICY_START_FROM_ATTR: start_from,
+        })
+        for group_uuid in group_uuids:
+            etree.SubElement(policy_node, LaneUsageConstants.POLICY_EXCEPT_TAG, {
+                LaneUsageConstants.POLICY_EXCEPT_GROUP_ATTR: group_uuid,
+            })
+
+    return root
+
+
+def create_road_node(lane_count: int, policy_id: str) -> etree.ElementBase:
+    node: etree.ElementBase = etree.Element(RoadConstants.TAG, {
+        RoadConstants.UUID_ATTR: str(uuid()),
+        RoadConstants.BEHAVIOR_ATTR: str(uuid()),
+        RoadConstants.SPEED_LIMIT_ATTR: '35',
+    })
+    etree.SubElement(node, RoadConstants.CHAIN_TAG, {
+        RoadConstants.CHAIN_POINTS_ATTR: '-50.5,-50.5 -50.5,49.5 50,50 50,-50',
+    })
+    lanes_node: etree.ElementBase = etree.SubElement(node, RoadConstants.LANES_COLLECTION_TAG)
+    for ordinal in range(lane_count):
+        lane_element: etree.ElementBase = etree.SubElement(lanes_node, RoadConstants.LANE_TAG, {
+            RoadConstants.LANE_ORDINAL_ATTR: str(ordinal),
+            RoadConstants.LANE_WIDTH_ATTR: '12',
+        })
+        etree.SubElement(lane_element, RoadConstants.LANE_POLICY_TAG, {RoadConstants.LANE_POLICY_ID_ATTR: policy_id})
+    etree.SubElement(node, RoadConstants.POCKETS_COLLECTION_TAG)
+
+    return node